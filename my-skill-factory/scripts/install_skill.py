@@ -2,7 +2,12 @@
 """Install a skill into the hideki-plugins local marketplace.
 
 Usage:
-    python install_skill.py <skill-dir> [--version VERSION]
+    python install_skill.py <skill-dir> [<skill-dir> ...] [--version VERSION] [--link-mode MODE] [--jobs N] [--gc [MAX_SIZE]]
+    python install_skill.py gc [--max-size SIZE] [--dry-run]
+    python install_skill.py stats
+    python install_skill.py <bundle.zip> [...]
+    python install_skill.py --from http://host:8765 <name> [<name> ...]
+    python install_skill.py <skill-dir> --timings --trace-out trace.json
 
 This script:
 1. Copies skill files into the marketplace plugin structure
@@ -11,16 +16,44 @@ This script:
 4. Registers in installed_plugins.json
 5. Enables in settings.json
 
+Several skills can be installed at once: their plugin trees are built in
+parallel and each shared JSON file is read and rewritten once per run.
+Each rewrite holds a lock on the file and merges into its current content,
+so installs from several worktrees or terminals can run at the same time.
+
+`gc` evicts cached plugin versions that installed_plugins.json no longer
+references, least recently used first, until the cache fits MAX_SIZE
+(default 0: evict every unreferenced version). With --link-mode store,
+cached files are hardlinks into a content-addressed store under
+<cache>/.objects, so identical files across skills and versions are stored
+once; `stats` reports logical vs physical cache bytes.
+
+A plugin bundle built by `sync_marketplace.py --bundle` can be given in
+place of a skill dir. It is installed into the cache only, extracting just
+the members whose hash differs from the cached version.
+
+With --from URL, the arguments are plugin names on a marketplace server
+(`scripts/serve_marketplace.py`). Their bundles are downloaded through a
+response cache under <cache>/.http and installed as above. Bundles that
+match the server's registry are reused without a request, and the others
+are revalidated by ETag, so only changed plugins are transferred. A
+downloaded bundle whose index does not match the registry's contentDigest
+is rejected before anything is installed.
+
 All paths are configured for Hideki's environment.
 """
 
+from __future__ import annotations
+
 import argparse
-import json
-import re
+import hashlib
+import os
 import shutil
 import sys
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
+from typing import Callable
 
 # ── Environment paths ──────────────────────────────────────────────
 MARKETPLACE_DIR = Path(r"D:\Shared\agents\my-skills\my-marketplace")
@@ -30,201 +63,406 @@ PLUGINS_DIR = CLAUDE_DIR / "plugins"
 INSTALLED_JSON = PLUGINS_DIR / "installed_plugins.json"
 SETTINGS_JSON = CLAUDE_DIR / "settings.json"
 CACHE_DIR = PLUGINS_DIR / "cache" / "hideki-plugins"
+# Content-addressed objects shared by every cached plugin version (--link-mode store).
+CACHE_OBJECTS = CACHE_DIR / ".objects"
+# Responses from marketplace servers (--from), revalidated by ETag.
+HTTP_CACHE = CACHE_DIR / ".http"
 MARKETPLACE_NAME = "hideki-plugins"
 
-
-import re
-
-def strip_comments(text: str) -> str:
-    # Remove // comments
-    text = re.sub(r'//.*', '', text)
-    # Remove /* */ comments (not handling nested or string-embedded specifically but good enough for config)
-    text = re.sub(r'/\*[\s\S]*?\*/', '', text)
-    return text
-
-def read_json(path: Path) -> dict:
-    text = path.read_text(encoding="utf-8")
-    clean_text = strip_comments(text)
-    return json.loads(clean_text)
-
-
-def write_json(path: Path, data: dict):
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-
-
-def extract_skill_meta(skill_dir: Path) -> dict:
+# Shared sync helpers live in the repo's scripts/ dir. A copy of this file run
+# from elsewhere (e.g. a plugin cache) uses a skillsync/ vendored next to it,
+# then the configured marketplace checkout.
+_SCRIPT_DIR = Path(__file__).resolve().parent
+for _scripts_dir in (_SCRIPT_DIR.parents[1] / "scripts", _SCRIPT_DIR, MARKETPLACE_DIR.parent / "scripts"):
+    if (_scripts_dir / "skillsync").is_dir():
+        sys.path.insert(0, str(_scripts_dir))
+        break
+
+try:
+    from skillsync import timing
+    from skillsync.bundle import BUNDLE_SUFFIX, BundleError, extract_changed, read_index
+    from skillsync.cachegc import collect_garbage, digest_path
+    from skillsync.configfile import ConfigError, read_jsonc, update_json
+    from skillsync.core import (
+        EXCLUDED_TREE_NAMES,
+        FINGERPRINT_CACHE,
+        SkillMeta,
+        collect_files,
+        json_text,
+        ordered_map,
+        plugin_content,
+        plugin_metadata_files,
+        read_skill_meta,
+        resolve_jobs,
+        skill_ignore,
+        sync_registry,
+        tree_digest,
+        write_plugin_metadata,
+    )
+    from skillsync.fingerprint import FingerprintCache
+    from skillsync.frontmatter import FrontmatterError
+    from skillsync.httpcache import FetchError, ResponseCache
+    from skillsync.linking import LINK_MODES, Materializer
+    from skillsync.manifest import iter_tree_files
+    from skillsync.publish import atomic_write_text, new_staging, publish
+    from skillsync.store import ObjectStore, tree_usage
+    from skillsync.units import format_size, parse_size
+except ImportError as exc:
+    sys.exit(
+        f"Error: cannot import the shared sync helpers ({exc}). install_skill.py needs the my-skills repo "
+        "checkout: run the copy in <repo>/my-skill-factory/scripts/, copy the checkout's scripts/skillsync/ to "
+        f"{_SCRIPT_DIR / 'skillsync'}, or set MARKETPLACE_DIR to the marketplace inside the checkout so "
+        f"{MARKETPLACE_DIR.parent / 'scripts' / 'skillsync'} exists."
+    )
+
+
+def extract_skill_meta(skill_dir: Path) -> SkillMeta:
     """Read name and description from SKILL.md frontmatter."""
     skill_md = skill_dir / "SKILL.md"
     if not skill_md.exists():
         sys.exit(f"Error: {skill_md} not found")
+    try:
+        return read_skill_meta(skill_dir)
+    except FrontmatterError as exc:
+        sys.exit(f"Error: {exc}")
+
+
+def copy_skill_contents(skill_dir: Path, plugin_skills: Path, materializer: Materializer):
+    for rel, src in iter_tree_files(skill_dir, EXCLUDED_TREE_NAMES, skill_ignore(skill_dir)):
+        materializer.place(src, plugin_skills / rel)
+
+
+def plugin_digest(name: str, description: str, version: str, source_files: dict[str, dict], content: dict) -> str:
+    """Content digest of the plugin that would be built for skill ``name`` at ``version``."""
+    files = {f"skills/{name}/{rel}": entry["sha256"] for rel, entry in source_files.items()}
+    for file_name, data in plugin_metadata_files(name, description, version, content).items():
+        files[f".claude-plugin/{file_name}"] = hashlib.sha256(json_text(data).encode("utf-8")).hexdigest()
+    return tree_digest(files)
+
+
+def cached_digest(cache_dir: Path) -> str | None:
+    if not cache_dir.is_dir():
+        return None
+    try:
+        return digest_path(cache_dir).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+
+
+def cache_plugin(meta: SkillMeta, version: str, digest: str, content: dict, materializer: Materializer) -> Path:
+    """Build the plugin straight into a staging dir next to the cache and publish it atomically.
+
+    Metadata JSON is always a real file, whatever the link mode.
+    """
+    cache_dir = CACHE_DIR / meta.name / version
+    staging = new_staging(cache_dir, clone=False)
+    plugin_skills = staging / "skills" / meta.name
+    plugin_skills.mkdir(parents=True)
+    copy_skill_contents(meta.source_dir, plugin_skills, materializer)
+    write_plugin_metadata(staging, meta.name, meta.description, version, content)
+    publish(staging, cache_dir)
+    atomic_write_text(digest_path(cache_dir), digest + "\n")
+    return cache_dir
+
+
+def build_plugin(
+    meta: SkillMeta, version: str, cache_only: bool, materializer: Materializer, hasher: Callable[[Path], str]
+) -> tuple[Path, list[str]]:
+    """Build one plugin (marketplace tree unless ``cache_only``, then the cache).
+
+    Returns the cache dir and the progress lines, so parallel builds can
+    report in a stable order.
+    """
+    name = meta.name
+    lines: list[str] = []
+    source_files = collect_files(meta.source_dir, hasher=hasher, ignore=skill_ignore(meta.source_dir))
+    content = plugin_content(name, source_files)
+
+    if not cache_only:
+        # 1. Build the marketplace plugin structure in a staging generation
+        plugin_dir = MARKETPLACE_DIR / "plugins" / name
+        staging = new_staging(plugin_dir, clone=False)
+        plugin_skills = staging / "skills" / name
 
-    text = skill_md.read_text(encoding="utf-8")
-    if not text.startswith("---"):
-        sys.exit("Error: SKILL.md missing YAML frontmatter")
-
-    # Parse frontmatter between --- markers
-    parts = text.split("---", 2)
-    if len(parts) < 3:
-        sys.exit("Error: SKILL.md frontmatter not properly closed")
-
-    meta = {}
-    for line in parts[1].strip().splitlines():
-        if ":" in line:
-            key, _, val = line.partition(":")
-            meta[key.strip()] = val.strip()
-    return meta
-
-
-def install(skill_dir: Path, version: str, cache_only: bool = False):
-    skill_dir = skill_dir.resolve()
-    if not skill_dir.is_dir():
-        sys.exit(f"Error: {skill_dir} is not a directory")
+        plugin_skills.mkdir(parents=True)
 
-    meta = extract_skill_meta(skill_dir)
-    name = meta.get("name")
-    desc = meta.get("description", "")
-    if not name:
-        sys.exit("Error: SKILL.md frontmatter missing 'name' field")
+        # Copy skill contents
+        copy_skill_contents(meta.source_dir, plugin_skills, materializer)
+
+        # Write plugin.json and per-plugin marketplace.json
+        write_plugin_metadata(staging, name, meta.description, version, content)
+        publish(staging, plugin_dir)
+        lines.append(f"  [+] Marketplace plugin: {plugin_dir}")
+
+    # 3. Cache for Claude Code, unless the cached version already has this content
+    cache_dir = CACHE_DIR / name / version
+    digest = plugin_digest(name, meta.description, version, source_files, content)
+    if cached_digest(cache_dir) == digest:
+        # Counts as a use for cache eviction.
+        os.utime(digest_path(cache_dir))
+        lines.append(f"  [=] Cache up to date: {cache_dir}")
+    else:
+        cache_plugin(meta, version, digest, content, materializer)
+        lines.append(f"  [+] Cached: {cache_dir}")
+
+    return cache_dir, lines
+
+
+def install_bundle(bundle_path: Path, index: dict, hasher: Callable[[Path], str]) -> tuple[Path, list[str]]:
+    """Install a packed plugin into the cache, extracting only members that changed."""
+    cache_dir = CACHE_DIR / index["name"] / index["plugin_version"]
+    if cached_digest(cache_dir) == index["digest"]:
+        os.utime(digest_path(cache_dir))
+        return cache_dir, [f"  [=] Cache up to date: {cache_dir}"]
+
+    current = {rel: hasher(path) for rel, path in iter_tree_files(cache_dir, ())} if cache_dir.is_dir() else {}
+    staging = new_staging(cache_dir, clone=True)
+    try:
+        extracted, removed, unchanged = extract_changed(bundle_path, index, staging, current)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    publish(staging, cache_dir)
+    atomic_write_text(digest_path(cache_dir), index["digest"] + "\n")
+    summary = f"{len(extracted)} extracted, {len(removed)} removed, {unchanged} unchanged"
+    return cache_dir, [f"  [+] Cached from bundle: {cache_dir} ({summary})"]
+
+
+def bundle_matches(index: dict, entry: dict) -> bool:
+    """Whether a bundle index lists exactly the plugin a registry entry describes.
+
+    The entry's contentDigest covers the skill files. The metadata files are
+    rebuilt from the entry, so the index may list those files and nothing
+    else. Members are checked against their index hashes as they are extracted.
+    """
+    name, version, description = index["name"], index["plugin_version"], index["description"]
+    if "contentDigest" not in entry or (name, version, description) != (
+        entry.get("name"), entry.get("version"), entry.get("description")
+    ):
+        return False
+    prefix = f"skills/{name}/"
+    files = {rel[len(prefix):]: item for rel, item in index["files"].items() if rel.startswith(prefix)}
+    content = plugin_content(name, files)
+    if content["contentDigest"] != entry["contentDigest"]:
+        return False
+    listed = tree_digest({rel: item["sha256"] for rel, item in index["files"].items()})
+    return listed == index["digest"] == plugin_digest(name, description, version, files, content)
+
+
+def fetch_bundles(base_url: str, names: list[str], jobs: int = 1) -> list[Path]:
+    """Download the bundles of plugins ``names`` from a marketplace server, transferring only changed ones."""
+    base_url = base_url.rstrip("/")
+    responses = ResponseCache(HTTP_CACHE)
+    try:
+        registry = responses.fetch_json(f"{base_url}/marketplace.json")
+    except FetchError as exc:
+        sys.exit(f"Error: {exc}")
+    entries = {plugin.get("name"): plugin for plugin in registry.get("plugins", [])}
+    unknown = [name for name in names if name not in entries]
+    if unknown:
+        sys.exit(f"Error: {base_url} has no plugin named {', '.join(unknown)}")
+
+    def fetch(name: str) -> Path:
+        url = f"{base_url}/bundles/{name}{BUNDLE_SUFFIX}"
+        cached = responses.cached(url)
+        try:
+            if cached is not None and bundle_matches(read_index(cached), entries[name]):
+                return cached
+        except BundleError:
+            pass
+        path = responses.fetch(url)
+        if not bundle_matches(read_index(path), entries[name]):
+            raise FetchError(f"{url} does not match the contentDigest of {name} in {base_url}/marketplace.json")
+        return path
+
+    try:
+        return ordered_map(fetch, names, jobs)
+    except (FetchError, BundleError) as exc:
+        sys.exit(f"Error: {exc}")
+
+
+def install_many(
+    paths: list[Path], version: str, cache_only: bool = False, link_mode: str = "copy", jobs: int = 1
+):
+    """Install skill dirs and/or plugin bundles (which always go to the cache only)."""
+    fingerprints = FingerprintCache(FINGERPRINT_CACHE)
+    materializer = Materializer(link_mode, ObjectStore(CACHE_OBJECTS, hasher=fingerprints.sha256))
+    metas: list[SkillMeta] = []
+    # (name, version, label, build) per plugin
+    tasks: list[tuple[str, str, str, Callable[[], tuple[Path, list[str]]]]] = []
+    for path in paths:
+        path = path.resolve()
+        if path.is_file():
+            try:
+                index = read_index(path)
+            except BundleError as exc:
+                sys.exit(f"Error: {exc}")
+            task = (index["name"], index["plugin_version"], " (bundle)",
+                    partial(install_bundle, path, index, fingerprints.sha256))
+        elif path.is_dir():
+            meta = extract_skill_meta(path)
+            metas.append(meta)
+            task = (meta.name, version, " (cache-only)" if cache_only else "",
+                    partial(build_plugin, meta, version, cache_only, materializer, fingerprints.sha256))
+        else:
+            sys.exit(f"Error: {path} is not a directory or plugin bundle")
+        if any(other[0] == task[0] for other in tasks):
+            sys.exit(f"Error: skill name '{task[0]}' is given more than once")
+        tasks.append(task)
 
-    plugin_key = f"{name}@{MARKETPLACE_NAME}"
     now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
 
-    print(f"Installing skill: {name} v{version}{' (cache-only)' if cache_only else ''}")
-
-    if cache_only:
-        # Build plugin structure in a temp directory, cache it, then clean up
-        import tempfile
-        tmp_root = Path(tempfile.mkdtemp())
+    def run_task(task: tuple[str, str, str, Callable[[], tuple[Path, list[str]]]]) -> tuple[Path, list[str]]:
+        with timing.skill(task[0]):
+            return task[3]()
+
+    try:
+        built = ordered_map(run_task, tasks, jobs)
+    except BundleError as exc:
+        sys.exit(f"Error: {exc}")
+    fingerprints.save()
+    for (name, task_version, label, _), (_, lines) in zip(tasks, built):
+        print(f"Installing skill: {name} v{task_version}{label}")
+        for line in lines:
+            print(line)
+
+    # 2. Register in root marketplace.json
+    if metas and not cache_only:
         try:
-            plugin_dir = tmp_root / name
-            plugin_skills = plugin_dir / "skills" / name
-            plugin_claude = plugin_dir / ".claude-plugin"
-            plugin_skills.mkdir(parents=True)
-            plugin_claude.mkdir(parents=True)
-
-            for item in skill_dir.iterdir():
-                dest = plugin_skills / item.name
-                if item.is_dir():
-                    shutil.copytree(item, dest)
-                else:
-                    shutil.copy2(item, dest)
-
-            write_json(plugin_claude / "plugin.json", {
-                "name": name, "version": version, "description": desc[:200],
-                "author": {"name": "Hideki"}, "keywords": [name],
-                "license": "MIT", "skills": "./skills"
-            })
-            write_json(plugin_claude / "marketplace.json", {
-                "name": MARKETPLACE_NAME,
-                "owner": {"name": "Hideki"},
-                "metadata": {"description": "Custom Claude Code plugins by Hideki"},
-                "plugins": [{"name": name, "source": {"type": "local", "path": "."},
-                             "description": desc[:200], "version": version}]
-            })
-
-            cache_dir = CACHE_DIR / name / version
-            if cache_dir.exists():
-                shutil.rmtree(cache_dir)
-            shutil.copytree(plugin_dir, cache_dir)
-            print(f"  [+] Cached: {cache_dir}")
-        finally:
-            shutil.rmtree(tmp_root, ignore_errors=True)
-    else:
-        # 1. Create marketplace plugin structure
-        plugin_dir = MARKETPLACE_DIR / "plugins" / name
-        plugin_skills = plugin_dir / "skills" / name
-        plugin_claude = plugin_dir / ".claude-plugin"
-
-        if plugin_dir.exists():
-            shutil.rmtree(plugin_dir)
-
-        plugin_skills.mkdir(parents=True)
-        plugin_claude.mkdir(parents=True)
-
-        # Copy skill contents
-        for item in skill_dir.iterdir():
-            dest = plugin_skills / item.name
-            if item.is_dir():
-                shutil.copytree(item, dest)
-            else:
-                shutil.copy2(item, dest)
-
-        # Write plugin.json
-        write_json(plugin_claude / "plugin.json", {
-            "name": name,
-            "version": version,
-            "description": desc[:200],
-            "author": {"name": "Hideki"},
-            "keywords": [name],
-            "license": "MIT",
-            "skills": "./skills"
-        })
-
-        # Write per-plugin marketplace.json
-        write_json(plugin_claude / "marketplace.json", {
-            "name": MARKETPLACE_NAME,
-            "owner": {"name": "Hideki"},
-            "metadata": {"description": "Custom Claude Code plugins by Hideki"},
-            "plugins": [{
-                "name": name,
-                "source": {"type": "local", "path": "."},
-                "description": desc[:200],
-                "version": version
-            }]
-        })
-        print(f"  [+] Marketplace plugin: {plugin_dir}")
-
-        # 2. Register in root marketplace.json
-        marketplace = read_json(MARKETPLACE_JSON)
-        existing = [p for p in marketplace["plugins"] if p["name"] != name]
-        existing.append({
-            "name": name,
-            "source": f"./plugins/{name}",
-            "description": desc[:200]
-        })
-        marketplace["plugins"] = existing
-        write_json(MARKETPLACE_JSON, marketplace)
+            sync_registry(metas, registry_path=MARKETPLACE_JSON)
+        except ConfigError as exc:
+            sys.exit(f"Error: {exc}")
         print(f"  [+] Root marketplace.json updated")
 
-        # 3. Cache for Claude Code
-        cache_dir = CACHE_DIR / name / version
-        if cache_dir.exists():
-            shutil.rmtree(cache_dir)
-        shutil.copytree(plugin_dir, cache_dir)
-        print(f"  [+] Cached: {cache_dir}")
-
     # 4. Register in installed_plugins.json
-    installed = read_json(INSTALLED_JSON)
-    installed["plugins"][plugin_key] = [{
-        "scope": "user",
-        "installPath": str(cache_dir).replace("/", "\\"),
-        "version": version,
-        "installedAt": now,
-        "lastUpdated": now,
-        "gitCommitSha": ""
-    }]
-    write_json(INSTALLED_JSON, installed)
-    print(f"  [+] installed_plugins.json updated")
+    def register(installed: dict) -> None:
+        plugins = installed.setdefault("plugins", {})
+        for (name, task_version, _, _), (cache_dir, _) in zip(tasks, built):
+            plugins[f"{name}@{MARKETPLACE_NAME}"] = [{
+                "scope": "user",
+                "installPath": str(cache_dir).replace("/", "\\"),
+                "version": task_version,
+                "installedAt": now,
+                "lastUpdated": now,
+                "gitCommitSha": ""
+            }]
 
     # 5. Enable in settings.json
-    settings = read_json(SETTINGS_JSON)
-    if "enabledPlugins" not in settings:
-        settings["enabledPlugins"] = {}
-    settings["enabledPlugins"][plugin_key] = True
-    write_json(SETTINGS_JSON, settings)
-    print(f"  [+] settings.json: {plugin_key} enabled")
-
-    print(f"\nDone! '{name}' is now available as '{name}:{name}' in new Claude Code sessions.")
+    def enable(settings: dict) -> None:
+        enabled = settings.setdefault("enabledPlugins", {})
+        for name, *_ in tasks:
+            enabled[f"{name}@{MARKETPLACE_NAME}"] = True
+
+    # Each file is updated under its lock and merged with what concurrent installs wrote meanwhile.
+    try:
+        update_json(INSTALLED_JSON, register)
+        print(f"  [+] installed_plugins.json updated")
+        update_json(SETTINGS_JSON, enable)
+    except ConfigError as exc:
+        sys.exit(f"Error: {exc}")
+    for name, *_ in tasks:
+        print(f"  [+] settings.json: {name}@{MARKETPLACE_NAME} enabled")
+
+    print()
+    for name, *_ in tasks:
+        print(f"Done! '{name}' is now available as '{name}:{name}' in new Claude Code sessions.")
+
+
+def installed_versions(installed: dict) -> set[tuple[str, str]]:
+    """``(name, version)`` of every hideki-plugins entry in installed_plugins.json."""
+    versions: set[tuple[str, str]] = set()
+    suffix = f"@{MARKETPLACE_NAME}"
+    for key, entries in installed.get("plugins", {}).items():
+        if not key.endswith(suffix):
+            continue
+        for entry in entries:
+            versions.add((key[: -len(suffix)], str(entry.get("version", ""))))
+    return versions
+
+
+def gc(max_size: int = 0, dry_run: bool = False):
+    try:
+        reachable = installed_versions(read_jsonc(INSTALLED_JSON)) if INSTALLED_JSON.exists() else set()
+    except ConfigError as exc:
+        sys.exit(f"Error: {exc}")
+    evicted, before, after = collect_garbage(
+        CACHE_DIR, reachable, max_size=max_size, dry_run=dry_run, store=ObjectStore(CACHE_OBJECTS)
+    )
+    verb = "Would evict" if dry_run else "Evicted"
+    for entry in evicted:
+        print(f"  [-] {verb} {entry.name}@{entry.version}: {format_size(entry.size)}")
+    print(f"Cache GC: {'would reclaim' if dry_run else 'reclaimed'} {format_size(before - after)} "
+          f"from {len(evicted)} version(s); cache is {format_size(after)} (budget {format_size(max_size)})")
+
+
+def cached_versions() -> list[Path]:
+    """Published ``<name>/<version>`` dirs in the plugin cache."""
+    if not CACHE_DIR.is_dir():
+        return []
+    versions: list[Path] = []
+    for plugin_dir in sorted(CACHE_DIR.iterdir()):
+        if plugin_dir.name.startswith(".") or not plugin_dir.is_dir():
+            continue
+        versions.extend(child for child in sorted(plugin_dir.iterdir()) if not child.name.startswith("."))
+    return versions
+
+
+def stats():
+    versions = cached_versions()
+    files, logical, physical = tree_usage(versions)
+    objects, object_bytes = ObjectStore(CACHE_OBJECTS).usage()
+    print(f"Plugin cache: {len(versions)} version(s), {files} file(s)")
+    print(f"  logical:  {format_size(logical)}")
+    print(f"  physical: {format_size(physical)} (saved {format_size(logical - physical)})")
+    print(f"  object store: {objects} object(s), {format_size(object_bytes)}")
+
+
+def install(skill_dir: Path, version: str, cache_only: bool = False, link_mode: str = "copy"):
+    install_many([skill_dir], version, cache_only=cache_only, link_mode=link_mode)
+
+
+def gc_main(argv: list[str]):
+    parser = argparse.ArgumentParser(prog="install_skill.py gc",
+                                     description="Evict unreferenced plugin versions from the Claude Code cache")
+    parser.add_argument("--max-size", type=parse_size, default=0,
+                        help="Cache size budget, e.g. 500M or 2G (default: 0, evict every unreferenced version)")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be evicted")
+    args = parser.parse_args(argv)
+    gc(args.max_size, dry_run=args.dry_run)
 
 
 def main():
+    if sys.argv[1:2] == ["gc"]:
+        return gc_main(sys.argv[2:])
+    if sys.argv[1:2] == ["stats"]:
+        return stats()
+
     parser = argparse.ArgumentParser(description="Install a skill into hideki-plugins marketplace")
-    parser.add_argument("skill_dir", type=Path, help="Path to the skill directory containing SKILL.md")
+    parser.add_argument("skill_dirs", type=Path, nargs="+", metavar="skill_dir",
+                        help="Path(s) to skill directories containing SKILL.md, or plugin bundles (.zip);"
+                             " plugin names with --from")
+    parser.add_argument("--from", dest="from_url", default=None, metavar="URL",
+                        help="Install the named plugins' bundles from a marketplace server (serve_marketplace.py)")
     parser.add_argument("--version", default="1.0.0", help="Version string (default: 1.0.0)")
     parser.add_argument("--cache-only", action="store_true",
                         help="Only update the Claude Code cache, skip marketplace file writes")
+    parser.add_argument("--link-mode", choices=LINK_MODES, default="copy",
+                        help="How plugin files are materialized (store: hardlinks into the cache object store;"
+                             " auto: reflink, then hardlink, then copy)")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="Plugins built in parallel (0 = CPU count, default: 0)")
+    parser.add_argument("--gc", nargs="?", type=parse_size, const=0, default=None, metavar="MAX_SIZE",
+                        help="After installing, evict unreferenced cached versions down to MAX_SIZE (default: 0)")
+    timing.add_arguments(parser)
     args = parser.parse_args()
-    install(args.skill_dir, args.version, cache_only=args.cache_only)
+    timing.enable(args.timings, args.trace_out)
+    jobs = resolve_jobs(args.jobs)
+    paths = args.skill_dirs
+    if args.from_url:
+        paths = fetch_bundles(args.from_url, [str(name) for name in args.skill_dirs], jobs)
+    install_many(paths, args.version, cache_only=args.cache_only, link_mode=args.link_mode, jobs=jobs)
+    if args.gc is not None:
+        gc(args.gc)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Benchmark the sync and install scripts against a synthetic skill repo.
+
+Usage:
+  python scripts/bench_skills.py
+  python scripts/bench_skills.py --skill-count 500 --files-per-skill 40 --repeat 5
+  python scripts/bench_skills.py --scenarios sync-warm validate
+  python scripts/bench_skills.py --out baseline.json
+  python scripts/bench_skills.py --baseline baseline.json --threshold 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from skillbench.generator import RepoConfig, generate_repo
+from skillbench.runner import (
+    METRICS,
+    RESULTS_VERSION,
+    SCENARIO_NAMES,
+    SCENARIOS,
+    BenchError,
+    Sandbox,
+    compare,
+    run_scenario,
+)
+from skillsync.core import PROJECT_ROOT, SYNC_STATE_DIR
+from skillsync.linking import LINK_MODES
+from skillsync.publish import atomic_write_text
+from skillsync.units import format_size, parse_size
+
+DEFAULT_RESULTS = SYNC_STATE_DIR / "bench" / "results.json"
+
+
+def format_metric(metric: str, value: float | None) -> str:
+    if value is None:
+        return "n/a"
+    if metric == "wall_s":
+        return f"{value:.3f} s"
+    return format_size(int(value))
+
+
+def print_results(results: dict) -> None:
+    print(f"{'scenario':<16}" + "".join(f"{metric:>16}" for metric in METRICS))
+    for name, scenario in results["scenarios"].items():
+        median = scenario["median"]
+        print(f"{name:<16}" + "".join(f"{format_metric(metric, median[metric]):>16}" for metric in METRICS))
+
+
+def run_compare(results: dict, baseline_path: Path, threshold: float) -> int:
+    try:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        print(f"Error: cannot read baseline {baseline_path}: {exc}")
+        return 1
+    try:
+        comparisons = compare(results, baseline, threshold)
+    except BenchError as exc:
+        print(f"Error: {exc}")
+        return 1
+
+    print(f"\nCompared with {baseline_path} (threshold {threshold:.0%}):")
+    regressions = 0
+    for item in comparisons:
+        marker = "REGRESSION" if item.regressed else ""
+        print(
+            f"  {item.scenario:<16}{item.metric:<14}{format_metric(item.metric, item.baseline):>12} -> "
+            f"{format_metric(item.metric, item.current):<12}{item.change:+8.1%}  {marker}".rstrip()
+        )
+        regressions += item.regressed
+    if regressions:
+        print(f"{regressions} metric(s) regressed.")
+        return 1
+    print("No regressions.")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark skill sync and install against a synthetic repo")
+    parser.add_argument("--skill-count", type=int, default=RepoConfig.skills, help="Skills to generate")
+    parser.add_argument(
+        "--files-per-skill", type=int, default=RepoConfig.files_per_skill, help="Files per skill, SKILL.md included"
+    )
+    parser.add_argument(
+        "--median-size",
+        type=parse_size,
+        default=RepoConfig.median_size,
+        help="Median file size; sizes are log-normal around it (e.g. 4K)",
+    )
+    parser.add_argument(
+        "--size-sigma", type=float, default=RepoConfig.size_sigma, help="Spread of the log-normal file sizes"
+    )
+    parser.add_argument("--max-size", type=parse_size, default=RepoConfig.max_size, help="Largest file size")
+    parser.add_argument(
+        "--binary-ratio",
+        type=float,
+        default=RepoConfig.binary_ratio,
+        help="Fraction of files that are binary screenshots",
+    )
+    parser.add_argument("--seed", type=int, default=RepoConfig.seed, help="Seed for the generated content")
+    parser.add_argument(
+        "--selected", type=int, default=5, help="Skills edited and passed to --skills by sync-selective"
+    )
+    parser.add_argument("--link-mode", choices=LINK_MODES, default="copy", help="Link mode for syncs and installs")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIO_NAMES, default=None, help="Scenarios to run (default: all)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Measured runs per scenario; medians are reported")
+    parser.add_argument("--out", type=Path, default=DEFAULT_RESULTS, help=f"Results JSON (default: {DEFAULT_RESULTS})")
+    parser.add_argument("--baseline", type=Path, default=None, help="Saved results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative increase of a median that counts as a regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--workdir", type=Path, default=None, help="Create the sandbox here instead of the system temp dir"
+    )
+    parser.add_argument("--keep", action="store_true", help="Keep the sandbox after the run")
+    args = parser.parse_args()
+
+    config = RepoConfig(
+        skills=args.skill_count,
+        files_per_skill=args.files_per_skill,
+        median_size=args.median_size,
+        size_sigma=args.size_sigma,
+        max_size=args.max_size,
+        binary_ratio=args.binary_ratio,
+        seed=args.seed,
+    )
+    scenarios = [s for s in SCENARIOS if args.scenarios is None or s.name in args.scenarios]
+    sandbox = Sandbox(
+        Path(tempfile.mkdtemp(prefix="skillbench-", dir=args.workdir)), config, args.link_mode, args.selected
+    )
+
+    try:
+        start = time.perf_counter()
+        size = generate_repo(sandbox.repo, config, PROJECT_ROOT)
+        print(
+            f"Generated {config.skills} skills ({config.skills * config.files_per_skill} files, "
+            f"{format_size(size)}) in {time.perf_counter() - start:.1f} s: {sandbox.repo}"
+        )
+        results = {
+            "version": RESULTS_VERSION,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {**config.as_dict(), "link_mode": args.link_mode, "selected": args.selected},
+            "repeat": args.repeat,
+            "scenarios": {},
+        }
+        for scenario in scenarios:
+            print(f"Running {scenario.name}: {scenario.description}")
+            results["scenarios"][scenario.name] = run_scenario(sandbox, scenario, args.repeat)
+    except BenchError as exc:
+        print(f"Error: {exc}")
+        return 1
+    finally:
+        if args.keep:
+            print(f"Sandbox kept: {sandbox.root}")
+        else:
+            shutil.rmtree(sandbox.root, ignore_errors=True)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(args.out, json.dumps(results, indent=2) + "\n")
+    print()
+    print_results(results)
+    print(f"\nResults written to {args.out}")
+    if args.baseline:
+        return run_compare(results, args.baseline, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
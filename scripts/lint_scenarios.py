@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Lint e2e-test scenario CSVs and compile them into cached execution plans.
+
+Usage:
+  python scripts/lint_scenarios.py e2e-test/test-scenarios
+  python scripts/lint_scenarios.py path/to/scenario-001-login.csv --strict
+  python scripts/lint_scenarios.py . --jobs 8 --show-plans
+
+Each CSV is checked against the format in
+scenario-gen/references/csv-format.md: config keys and values, the steps
+header, step numbering, the action vocabulary and per-action targets and
+inputs. Findings are printed as `path:line: severity: message`. Each CSV
+is compiled into a JSON plan, findings included, under
+.skill-sync/scenario-plans/ and keyed by the CSV's sha256, so unchanged
+scenarios are never parsed twice.
+Directories are searched recursively for *.csv and linted in parallel.
+Exits 1 when any scenario has errors (or warnings, with --strict).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from scenariolint.parser import Finding
+from scenariolint.plan import PlanCache, plan_findings
+from skillsync import timing
+from skillsync.core import EXCLUDED_SOURCE_DIRS, FINGERPRINT_CACHE, SYNC_STATE_DIR, ordered_map, resolve_jobs
+from skillsync.fingerprint import FingerprintCache
+
+PLAN_CACHE = SYNC_STATE_DIR / "scenario-plans"
+
+
+def find_scenarios(paths: list[Path]) -> list[Path]:
+    """The CSV files given, plus every *.csv under the directories given, in a stable order."""
+    found: dict[Path, None] = {}
+    for path in paths:
+        if path.is_file():
+            found[path] = None
+            continue
+        with timing.phase("discovery", str(path)):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_SOURCE_DIRS)
+                found.update((Path(root) / name, None) for name in sorted(files) if name.lower().endswith(".csv"))
+    return list(found)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Lint e2e-test scenario CSVs and compile cached execution plans")
+    parser.add_argument("paths", type=Path, nargs="+", help="Scenario CSVs or directories to search for *.csv")
+    parser.add_argument("--strict", action="store_true", help="Fail on warnings as well as errors")
+    parser.add_argument("--show-plans", action="store_true", help="Print the plan file of every scenario that passes")
+    parser.add_argument("--jobs", type=int, default=0, help="Scenarios linted in parallel (0 = CPU count, default: 0)")
+    timing.add_arguments(parser)
+    args = parser.parse_args()
+    timing.enable(args.timings, args.trace_out)
+
+    missing = [str(path) for path in args.paths if not path.exists()]
+    if missing:
+        sys.exit(f"Error: no such file or directory: {', '.join(missing)}")
+    scenarios = find_scenarios(args.paths)
+    if not scenarios:
+        print("No scenario CSVs found.")
+        return 0
+
+    fingerprints = FingerprintCache(FINGERPRINT_CACHE)
+    plans = PlanCache(PLAN_CACHE, fingerprints.sha256)
+    results = ordered_map(plans.load, scenarios, resolve_jobs(args.jobs))
+    fingerprints.save()
+
+    errors = warnings = cached = failed = 0
+    for path, (plan, from_cache) in zip(scenarios, results):
+        findings: list[Finding] = plan_findings(plan)
+        cached += from_cache
+        for finding in findings:
+            print(finding.format(str(path)))
+        file_errors = sum(finding.severity == "error" for finding in findings)
+        errors += file_errors
+        warnings += len(findings) - file_errors
+        if file_errors or (args.strict and findings):
+            failed += 1
+        elif args.show_plans:
+            print(f"{path}: plan {plans.plan_path(plan['sha256'])} ({len(plan['steps'])} steps)")
+
+    print(
+        f"Linted {len(scenarios)} scenario(s), {cached} from cache: "
+        f"{errors} error(s), {warnings} warning(s), {failed} failed."
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""Refresh changed skills in the Claude Code plugin cache without holding up `git push`.
+
+Usage:
+  python scripts/refresh_skills.py --pre-push --budget 0.8 < <pre-push stdin>
+  python scripts/refresh_skills.py dev-workflow review-pr
+  python scripts/refresh_skills.py --since origin/main
+  python scripts/refresh_skills.py --status
+
+Skills are queued in a shared queue file and installed (`install_skill.py
+--cache-only`, several at a time) by a single background worker that keeps
+draining the queue until it is empty. The caller waits up to --budget seconds
+for its skills and then returns, leaving the worker to finish; the worker's
+output goes to a log next to the queue. Pushes that queue a skill before the
+worker gets to it share one install, and a skill queued again while it is
+being installed is installed once more afterwards, never twice at once.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from skillsync import timing
+from skillsync.configfile import ConfigError, FileLock, locked_json, read_jsonc, update_json
+from skillsync.core import PROJECT_ROOT, enclosing_skill_roots, ordered_map, resolve_jobs
+from skillsync.gitdiff import GitError, changed_paths, push_ranges
+
+INSTALL_SCRIPT = PROJECT_ROOT / "my-skill-factory" / "scripts" / "install_skill.py"
+# Shared by every checkout and worktree, like the cache it fills.
+REFRESH_DIR = Path.home() / ".claude" / "plugins" / "cache" / "hideki-plugins" / ".refresh"
+QUEUE_JSON = REFRESH_DIR / "queue.json"
+WORKER_LOCK = REFRESH_DIR / "worker.lock"
+LOG_FILE = REFRESH_DIR / "refresh.log"
+LOG_ROTATE_BYTES = 1024 * 1024
+POLL_SECONDS = 0.05
+
+
+def empty_queue() -> dict:
+    return {"pending": {}, "running": {}, "results": {}}
+
+
+def now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def log(message: str) -> None:
+    print(f"[{now()}] {message}", flush=True)
+
+
+def changed_skill_dirs(paths: set[str]) -> dict[str, Path]:
+    """Skill roots containing the repo-relative ``paths``, keyed by their own repo-relative path."""
+    return {rel: PROJECT_ROOT / rel for rel in enclosing_skill_roots(PROJECT_ROOT / path for path in paths)}
+
+
+def pushed_skill_dirs(updates: list[str]) -> dict[str, Path]:
+    """Skill roots touched by the commits of a push."""
+    paths: set[str] = set()
+    with timing.phase("discovery", "git diff"):
+        for revision in push_ranges(PROJECT_ROOT, updates):
+            try:
+                paths.update(changed_paths(PROJECT_ROOT, since=revision))
+            except GitError as exc:
+                print(f"[refresh] Warning: cannot diff {revision}: {exc}", file=sys.stderr)
+    return changed_skill_dirs(paths)
+
+
+def named_skill_dirs(names: list[str]) -> dict[str, Path]:
+    dirs: dict[str, Path] = {}
+    for name in names:
+        path = (PROJECT_ROOT / name).resolve()
+        if not (path / "SKILL.md").is_file():
+            sys.exit(f"Error: {path} is not a skill root (no SKILL.md)")
+        try:
+            dirs[path.relative_to(PROJECT_ROOT).as_posix()] = path
+        except ValueError:
+            dirs[str(path)] = path
+    return dirs
+
+
+def enqueue(skills: dict[str, Path]) -> None:
+    def add(queue: dict) -> None:
+        for key, path in skills.items():
+            queue.setdefault("pending", {})[key] = {"dir": str(path), "queued": now()}
+
+    update_json(QUEUE_JSON, add, default=empty_queue)
+
+
+def spawn_worker(jobs: int) -> subprocess.Popen:
+    """Start a worker detached from this process, so it outlives the hook that started it."""
+    REFRESH_DIR.mkdir(parents=True, exist_ok=True)
+    if LOG_FILE.exists() and LOG_FILE.stat().st_size > LOG_ROTATE_BYTES:
+        os.replace(LOG_FILE, LOG_FILE.with_name(LOG_FILE.name + ".1"))
+    if os.name == "nt":
+        detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        detach = {"start_new_session": True}
+    with LOG_FILE.open("ab") as log_fh:
+        return subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "--worker", "--jobs", str(jobs)],
+            stdin=subprocess.DEVNULL,
+            stdout=log_fh,
+            stderr=subprocess.STDOUT,
+            cwd=PROJECT_ROOT,
+            **detach,
+        )
+
+
+def install(dirs: list[str], jobs: int) -> bool:
+    cmd = [sys.executable, str(INSTALL_SCRIPT), *dirs, "--cache-only", "--jobs", str(jobs)]
+    return subprocess.run(cmd, stdin=subprocess.DEVNULL).returncode == 0
+
+
+def install_batch(batch: dict[str, dict], jobs: int) -> dict[str, bool]:
+    """Install every skill of ``batch`` in one run; on failure, retry them one by one to find the culprits."""
+    log(f"Installing {', '.join(sorted(batch))}")
+    if install([entry["dir"] for entry in batch.values()], jobs):
+        return dict.fromkeys(batch, True)
+    if len(batch) == 1:
+        return dict.fromkeys(batch, False)
+    log("Batch install failed; retrying skills one at a time")
+    keys = sorted(batch)
+    return dict(zip(keys, ordered_map(lambda key: install([batch[key]["dir"]], 1), keys, jobs)))
+
+
+def run_worker(jobs: int) -> int:
+    lock = FileLock(WORKER_LOCK, timeout=0)
+    try:
+        lock.__enter__()
+    except ConfigError:
+        # Another worker is draining the queue and will pick up what was just queued.
+        return 0
+    try:
+        with locked_json(QUEUE_JSON, default=empty_queue) as queue:
+            # Only one worker runs at a time, so anything still marked running was left by a crashed one.
+            stale = queue.get("running", {})
+            queue["pending"] = {**stale, **queue.get("pending", {})}
+            queue["running"] = {}
+        while True:
+            with locked_json(QUEUE_JSON, default=empty_queue) as queue:
+                batch = queue["pending"]
+                if not batch:
+                    # Released under the queue lock: whoever queues next finds the worker lock free.
+                    lock.__exit__(None, None, None)
+                    return 0
+                queue["pending"], queue["running"] = {}, batch
+            results = install_batch(batch, jobs)
+            with locked_json(QUEUE_JSON, default=empty_queue) as queue:
+                queue["running"] = {}
+                for key, ok in results.items():
+                    queue.setdefault("results", {})[key] = {"ok": ok, "dir": batch[key]["dir"], "finished": now()}
+            failed = sorted(key for key, ok in results.items() if not ok)
+            log(f"Failed: {', '.join(failed)}" if failed else "Done")
+    finally:
+        lock.__exit__(None, None, None)
+
+
+def wait_for(keys: set[str], worker: subprocess.Popen, budget: float | None) -> set[str]:
+    """Wait until none of ``keys`` is queued or installing, for at most ``budget`` seconds; return the rest."""
+    deadline = None if budget is None else time.monotonic() + budget
+    while True:
+        try:
+            queue = read_jsonc(QUEUE_JSON)
+        except ConfigError:
+            queue = empty_queue()
+        busy = keys & (set(queue.get("pending", {})) | set(queue.get("running", {})))
+        if not busy or (deadline is not None and time.monotonic() >= deadline):
+            return busy
+        if worker.poll() is not None:
+            # The worker has exited, so these will not finish now; the next run picks up what it left behind.
+            return busy
+        time.sleep(POLL_SECONDS)
+
+
+def report(keys: set[str], busy: set[str]) -> int:
+    if busy:
+        print(f"[refresh] Still installing in the background: {', '.join(sorted(busy))} (log: {LOG_FILE})")
+        return 0
+    results = read_jsonc(QUEUE_JSON).get("results", {})
+    failed = sorted(key for key in keys if not results.get(key, {}).get("ok"))
+    if failed:
+        print(f"[refresh] Warning: failed to install {', '.join(failed)} (log: {LOG_FILE})", file=sys.stderr)
+        return 1
+    print(f"[refresh] Plugin cache updated: {', '.join(sorted(keys))}")
+    return 0
+
+
+def status() -> int:
+    try:
+        queue = read_jsonc(QUEUE_JSON)
+    except ConfigError:
+        print("No skill refresh has run yet.")
+        return 0
+    print(f"Queued:     {', '.join(sorted(queue.get('pending', {}))) or '-'}")
+    print(f"Installing: {', '.join(sorted(queue.get('running', {}))) or '-'}")
+    for key, result in sorted(queue.get("results", {}).items()):
+        print(f"  {key:<32}{'ok' if result['ok'] else 'FAILED':<8}{result['finished']}")
+    print(f"Log: {LOG_FILE}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Refresh changed skills in the Claude Code plugin cache")
+    parser.add_argument("skills", nargs="*", help="Skill roots to refresh (relative to the repo root)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--pre-push",
+        action="store_true",
+        help="Refresh the skills changed by the ref updates a pre-push hook receives on stdin",
+    )
+    source.add_argument("--since", metavar="REV", default=None, help="Refresh the skills changed since REV")
+    source.add_argument("--status", action="store_true", help="Show the queue and the latest results, then exit")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Return after SECONDS, leaving unfinished installs to the background worker (default: wait)",
+    )
+    parser.add_argument("--jobs", type=int, default=0, help="Plugins built in parallel (0 = CPU count, default: 0)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    timing.add_arguments(parser)
+    args = parser.parse_args()
+    timing.enable(args.timings, args.trace_out)
+    jobs = resolve_jobs(args.jobs)
+
+    if args.worker:
+        return run_worker(jobs)
+    if args.status:
+        return status()
+    if args.pre_push:
+        skills = pushed_skill_dirs(sys.stdin.read().splitlines())
+    elif args.since:
+        try:
+            with timing.phase("discovery", "git diff"):
+                skills = changed_skill_dirs(set(changed_paths(PROJECT_ROOT, since=args.since)))
+        except GitError as exc:
+            sys.exit(f"Error: {exc}")
+    elif args.skills:
+        skills = named_skill_dirs(args.skills)
+    else:
+        parser.error("give skill roots, --since REV or --pre-push")
+
+    if not skills:
+        print("[refresh] No skill changes detected.")
+        return 0
+    print(f"[refresh] Changed skills: {', '.join(sorted(skills))}")
+    try:
+        enqueue(skills)
+    except ConfigError as exc:
+        sys.exit(f"Error: {exc}")
+    worker = spawn_worker(jobs)
+    busy = wait_for(set(skills), worker, args.budget)
+    # Reap the worker if it has exited; otherwise it carries on detached.
+    worker.poll()
+    return report(set(skills), busy)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Parser, linter and plan compiler for e2e-test scenario CSVs."""
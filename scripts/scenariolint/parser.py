@@ -0,0 +1,272 @@
+"""Streaming parser and checks for the e2e-test scenario CSV format.
+
+The format is documented in ``scenario-gen/references/csv-format.md`` and
+executed by the e2e-test skill::
+
+    # config
+    url,https://example.com
+    viewport,1280x720
+
+    # steps
+    step,action,target,input,expected_result
+    1,navigate,https://example.com,,Page loads
+
+Rows are read one at a time through ``csv.reader``, so quoted fields may hold
+commas and line breaks and every finding points at the line it starts on.
+Parsing never stops at the first problem: the whole file is checked and
+every finding is reported. Findings are errors when the e2e-test skill could
+not run the step as written, and warnings when the step breaks a convention of
+the format (such as a CSS selector as a target).
+"""
+
+from __future__ import annotations
+
+import csv
+import difflib
+import re
+from dataclasses import dataclass, field
+from typing import Iterable
+
+CONFIG = "config"
+STEPS = "steps"
+STEP_COLUMNS = ("step", "action", "target", "input", "expected_result")
+
+# Action -> Playwright MCP tool, as the e2e-test skill maps them.
+ACTIONS = {
+    "navigate": "browser_navigate",
+    "click": "browser_click",
+    "dblclick": "browser_click",
+    "type": "browser_type",
+    "fill": "browser_type",
+    "fill_form": "browser_fill_form",
+    "hover": "browser_hover",
+    "select": "browser_select_option",
+    "keypress": "browser_press_key",
+    "wait": "browser_wait_for",
+    "screenshot": "browser_take_screenshot",
+    "verify": "browser_snapshot",
+    "assert_text": "browser_snapshot",
+    "assert_visible": "browser_snapshot",
+    "assert_hidden": "browser_snapshot",
+    "assert_url": "browser_evaluate",
+    "url_check": "browser_evaluate",
+    "dialog": "browser_handle_dialog",
+    "upload": "browser_file_upload",
+    "evaluate": "browser_evaluate",
+    "run_code": "browser_run_code",
+    "console": "browser_console_messages",
+    "tab": "browser_tabs",
+}
+# Actions that act on an element (or, for navigate, a URL) and need a target.
+TARGET_ACTIONS = {"navigate", "click", "dblclick", "type", "fill", "hover", "select", "upload"}
+# Actions that are meaningless without an input value.
+INPUT_ACTIONS = {"select", "upload"}
+
+CONFIG_KEYS = ("url", "viewport", "setup", "timeout")
+DEFAULT_VIEWPORT = (1280, 720)
+DEFAULT_TIMEOUT = 10.0
+
+_VIEWPORT_RE = re.compile(r"^(\d+)\s*x\s*(\d+)$", re.IGNORECASE)
+_SECTION_RE = re.compile(r"^#\s*(\w+)\s*$")
+# How close a one-word '#' row must be to a section name to be reported as a misspelt header.
+_SECTION_TYPO_CUTOFF = 0.8
+_URL_RE = re.compile(r"^(https?://|/|#)", re.IGNORECASE)
+# Targets must be human-readable descriptions, not selectors.
+_SELECTOR_RE = re.compile(r"^[#.\[]\S|\S\s*>\s*\S|:(?:first|last|nth)-child|\[data-[\w-]+")
+
+
+@dataclass
+class Finding:
+    line: int
+    severity: str
+    message: str
+
+    def format(self, path: str) -> str:
+        return f"{path}:{self.line}: {self.severity}: {self.message}"
+
+
+@dataclass
+class Scenario:
+    config: dict = field(default_factory=dict)
+    steps: list[dict] = field(default_factory=list)
+    findings: list[Finding] = field(default_factory=list)
+
+    @property
+    def errors(self) -> list[Finding]:
+        return [finding for finding in self.findings if finding.severity == "error"]
+
+    @property
+    def warnings(self) -> list[Finding]:
+        return [finding for finding in self.findings if finding.severity == "warning"]
+
+
+class _Checker:
+    def __init__(self) -> None:
+        self.scenario = Scenario()
+        self.section: str | None = None
+        self.seen_sections: set[str] = set()
+        self.header_line: int | None = None
+        self.config_lines: dict[str, int] = {}
+
+    def error(self, line: int, message: str) -> None:
+        self.scenario.findings.append(Finding(line, "error", message))
+
+    def warning(self, line: int, message: str) -> None:
+        self.scenario.findings.append(Finding(line, "warning", message))
+
+    def row(self, line: int, fields: list[str]) -> None:
+        if not any(value.strip() for value in fields):
+            return
+        if fields[0].lstrip().startswith("#"):
+            match = _SECTION_RE.match(fields[0].strip()) if len(fields) == 1 else None
+            if match:
+                self.section_row(line, match.group(1).lower())
+            # Any other '#' row is a comment, in a section or before the first one.
+        elif self.section == CONFIG:
+            self.config_row(line, fields)
+        elif self.section == STEPS:
+            self.step_row(line, fields)
+        else:
+            self.error(line, "row outside a section; start the file with '# config'")
+
+    def section_row(self, line: int, word: str) -> None:
+        if word in (CONFIG, STEPS):
+            self.start_section(line, word)
+        elif difflib.get_close_matches(word, (CONFIG, STEPS), n=1, cutoff=_SECTION_TYPO_CUTOFF):
+            # '# step' or '# conifg' is a misspelt header, not a one-word comment like '# TODO'.
+            self.error(line, f"unknown section '# {word}'{_suggest(word, (CONFIG, STEPS))}")
+            self.section = None
+
+    def start_section(self, line: int, name: str) -> None:
+        if name in self.seen_sections:
+            self.error(line, f"duplicate '# {name}' section")
+        if name == CONFIG and STEPS in self.seen_sections:
+            self.error(line, "'# config' must come before '# steps'")
+        self.seen_sections.add(name)
+        self.section = name
+
+    def config_row(self, line: int, fields: list[str]) -> None:
+        key = fields[0].strip().lower()
+        if len(fields) != 2:
+            self.error(line, f"config row needs 2 fields (key,value), got {len(fields)}; quote values with commas")
+            return
+        value = fields[1].strip()
+        if key not in CONFIG_KEYS:
+            suggestion = _suggest(key, CONFIG_KEYS)
+            self.error(line, f"unknown config key '{key}'{suggestion} (expected one of {', '.join(CONFIG_KEYS)})")
+            return
+        if key in self.config_lines:
+            self.error(line, f"duplicate config key '{key}' (first set on line {self.config_lines[key]})")
+            return
+        self.config_lines[key] = line
+        config = self.scenario.config
+        if key == "url":
+            if not re.match(r"^https?://\S+$", value, re.IGNORECASE):
+                self.error(line, f"url must be an http(s) URL, got '{value}'")
+            config["url"] = value
+        elif key == "viewport":
+            match = _VIEWPORT_RE.match(value)
+            if not match or 0 in (int(match.group(1)), int(match.group(2))):
+                self.error(line, f"viewport must be WIDTHxHEIGHT (e.g. 1280x720), got '{value}'")
+                return
+            config["viewport"] = {"width": int(match.group(1)), "height": int(match.group(2))}
+        elif key == "setup":
+            if not value:
+                self.warning(line, "empty setup; drop the row instead")
+            config["setup"] = value
+        elif key == "timeout":
+            try:
+                timeout = float(value)
+            except ValueError:
+                timeout = 0.0
+            if timeout <= 0:
+                self.error(line, f"timeout must be a positive number of seconds, got '{value}'")
+                return
+            config["timeout"] = timeout
+
+    def step_row(self, line: int, fields: list[str]) -> None:
+        if self.header_line is None:
+            self.header_line = line
+            header = tuple(value.strip().lower() for value in fields)
+            if header != STEP_COLUMNS:
+                self.error(line, f"steps header must be '{','.join(STEP_COLUMNS)}', got '{','.join(fields)}'")
+            return
+        if len(fields) != len(STEP_COLUMNS):
+            self.error(
+                line,
+                f"step row needs {len(STEP_COLUMNS)} fields, got {len(fields)}; quote values with commas",
+            )
+            if len(fields) < 2:
+                return
+            fields = (fields + [""] * len(STEP_COLUMNS))[: len(STEP_COLUMNS)]
+        number, action, target, value, expected = (value.strip() for value in fields)
+        action = action.lower()
+
+        steps = self.scenario.steps
+        expected_number = steps[-1]["step"] + 1 if steps else 1
+        try:
+            step = int(number)
+        except ValueError:
+            self.error(line, f"step number must be an integer, got '{number}'")
+            step = expected_number
+        else:
+            if step != expected_number:
+                self.error(line, f"step {step} is out of sequence (expected {expected_number})")
+
+        if action not in ACTIONS:
+            suggestion = _suggest(action, ACTIONS)
+            self.error(line, f"step {step}: unknown action '{action}'{suggestion}")
+        if action in TARGET_ACTIONS and not target:
+            self.error(line, f"step {step}: '{action}' needs a target")
+        if action in INPUT_ACTIONS and not value:
+            self.error(line, f"step {step}: '{action}' needs an input")
+        if action == "navigate" and target and not _URL_RE.match(target):
+            self.error(line, f"step {step}: navigate target must be a URL or a path, got '{target}'")
+        elif action != "navigate" and _SELECTOR_RE.search(target):
+            self.warning(line, f"step {step}: target '{target}' looks like a CSS selector; describe the element")
+        if not expected:
+            self.warning(line, f"step {step}: no expected_result")
+
+        steps.append({
+            "step": step,
+            "line": line,
+            "action": action,
+            "tool": ACTIONS.get(action),
+            "target": target,
+            "input": value,
+            "expected_result": expected,
+        })
+
+    def finish(self) -> Scenario:
+        scenario = self.scenario
+        if CONFIG not in self.seen_sections:
+            self.error(1, "missing '# config' section")
+        elif "url" not in scenario.config:
+            self.error(1, "config has no url")
+        if STEPS not in self.seen_sections:
+            self.error(1, "missing '# steps' section")
+        elif not scenario.steps:
+            self.error(self.header_line or 1, "no steps")
+        scenario.config.setdefault("viewport", {"width": DEFAULT_VIEWPORT[0], "height": DEFAULT_VIEWPORT[1]})
+        scenario.config.setdefault("timeout", DEFAULT_TIMEOUT)
+        scenario.findings.sort(key=lambda finding: finding.line)
+        return scenario
+
+
+def _suggest(word: str, choices: Iterable[str]) -> str:
+    close = difflib.get_close_matches(word, list(choices), n=1)
+    return f" (did you mean '{close[0]}'?)" if close else ""
+
+
+def parse_scenario(lines: Iterable[str]) -> Scenario:
+    """Parse and check a scenario from its lines (e.g. an open file), one row at a time."""
+    checker = _Checker()
+    reader = csv.reader(lines)
+    line = 1
+    try:
+        for fields in reader:
+            checker.row(line, fields)
+            line = reader.line_num + 1
+    except csv.Error as exc:
+        checker.error(reader.line_num, f"malformed CSV: {exc}")
+    return checker.finish()
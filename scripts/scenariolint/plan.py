@@ -0,0 +1,71 @@
+"""Compiled execution plans for scenario CSVs, cached by content hash.
+
+A plan is the parsed scenario as JSON: the config with defaults filled in
+and one entry per step with its Playwright MCP tool. The findings are
+included, so an unchanged scenario is relinted without being parsed again.
+Plans are stored as ``<cache>/<sha256 of the CSV>.json``. Edits, renames and
+copies therefore need no invalidation, and identical scenarios share a plan.
+The file hash comes from the stat-fingerprint cache, so an unchanged CSV is
+not even read.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable
+
+from scenariolint.parser import Finding, parse_scenario
+from skillsync import timing
+from skillsync.publish import atomic_write_text
+
+# Bump when the parser or the plan layout changes, so stale plans are recompiled.
+PLAN_VERSION = 2
+
+
+def compile_plan(path: Path, sha256: str) -> dict:
+    # utf-8-sig: spreadsheet exports often start with a BOM.
+    with timing.phase("parse", path.name, files=1) as event, path.open(
+        encoding="utf-8-sig", errors="replace", newline=""
+    ) as fh:
+        event.bytes = os.fstat(fh.fileno()).st_size
+        scenario = parse_scenario(fh)
+    return {
+        "version": PLAN_VERSION,
+        "sha256": sha256,
+        "config": scenario.config,
+        "steps": scenario.steps,
+        "findings": [asdict(finding) for finding in scenario.findings],
+    }
+
+
+class PlanCache:
+    def __init__(self, root: Path, hasher: Callable[[Path], str]) -> None:
+        self.root = root
+        self.hasher = hasher
+
+    def plan_path(self, sha256: str) -> Path:
+        return self.root / f"{sha256}.json"
+
+    def load(self, path: Path) -> tuple[dict, bool]:
+        """The plan for the scenario at ``path`` and whether it came from the cache."""
+        sha256 = self.hasher(path)
+        plan_path = self.plan_path(sha256)
+        try:
+            with timing.phase("state", plan_path.name, files=1):
+                plan = json.loads(plan_path.read_text(encoding="utf-8"))
+            if plan.get("version") == PLAN_VERSION and plan.get("sha256") == sha256:
+                return plan, True
+        except (OSError, json.JSONDecodeError):
+            pass
+        plan = compile_plan(path, sha256)
+        self.root.mkdir(parents=True, exist_ok=True)
+        with timing.phase("state", plan_path.name, files=1):
+            atomic_write_text(plan_path, json.dumps(plan, indent=1, ensure_ascii=False) + "\n")
+        return plan, False
+
+
+def plan_findings(plan: dict) -> list[Finding]:
+    return [Finding(**finding) for finding in plan["findings"]]
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Serve the local marketplace over HTTP.
+
+Usage:
+  python scripts/serve_marketplace.py
+  python scripts/serve_marketplace.py --host 0.0.0.0 --port 8765
+  python scripts/serve_marketplace.py --quiet --timings
+
+Serves the root registry at /marketplace.json, plugin bundles at
+/bundles/<name>.zip (build them with `sync_marketplace.py --bundle`) and
+plugin trees under /plugins/<name>/. Responses carry content-derived ETags
+and support conditional GETs, byte ranges and gzip. Install from it with
+`install_skill.py --from http://<host>:<port> <name> ...`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from skillsync import timing
+from skillsync.core import MARKETPLACE_ROOT
+from skillsync.marketserver import make_server
+
+DEFAULT_PORT = 8765
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve the local marketplace over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument(
+        "--port", type=int, default=DEFAULT_PORT, help=f"Port to bind (0 = any free port, default: {DEFAULT_PORT})"
+    )
+    parser.add_argument(
+        "--root", type=Path, default=MARKETPLACE_ROOT, help="Marketplace dir to serve (default: my-marketplace)"
+    )
+    parser.add_argument("--quiet", action="store_true", help="Do not log requests")
+    timing.add_arguments(parser)
+    args = parser.parse_args()
+    timing.enable(args.timings, args.trace_out)
+
+    if not (args.root / ".claude-plugin" / "marketplace.json").is_file():
+        sys.exit(f"Error: {args.root} has no .claude-plugin/marketplace.json")
+    try:
+        server = make_server(args.root.resolve(), args.host, args.port, quiet=args.quiet)
+    except OSError as exc:
+        sys.exit(f"Error: cannot listen on {args.host}:{args.port}: {exc}")
+    host, port = server.server_address[:2]
+    print(f"Serving {args.root} at http://{host}:{port}/ (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Benchmarks for the skill sync and install scripts against synthetic repos."""
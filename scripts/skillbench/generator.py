@@ -0,0 +1,124 @@
+"""Synthetic skill repos for benchmarking.
+
+A generated repo mirrors the layout of this one: top-level skill roots with a
+``SKILL.md``, text references under ``references/`` and binary evidence
+(screenshots, as under ``e2e-test/e2e-evidence``) under
+``e2e-evidence/<run>/``. File sizes follow a log-normal distribution around
+``median_size``. The same config and seed always produce the same bytes, so
+results from different checkouts can be compared.
+
+The repo gets its own copy of the sync and install scripts, because those
+locate the marketplace and state dirs relative to their own path.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# Generated files are backdated so their fingerprints are cacheable from the
+# first run (see ``skillsync.fingerprint``); fresh mtimes would be rehashed
+# by early runs only and make repetitions disagree.
+GENERATED_MTIME = 1_577_836_800  # 2020-01-01
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+WORDS = (
+    "skill plugin marketplace workflow review commit branch scenario test agent session cache "
+    "install sync validate generate reference script asset evidence report step click navigate "
+    "expect assert screenshot prompt context handover design pattern trigger description"
+).split()
+# Copied into every generated repo, relative to the project root.
+TOOLING = (
+    "scripts/skillsync",
+    "scripts/sync_skills.py",
+    "scripts/sync_marketplace.py",
+    "my-skill-factory/scripts/install_skill.py",
+)
+
+
+@dataclass(frozen=True)
+class RepoConfig:
+    skills: int = 50
+    files_per_skill: int = 20
+    median_size: int = 4096
+    size_sigma: float = 1.0
+    max_size: int = 4 * 1024 * 1024
+    binary_ratio: float = 0.15
+    seed: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def skill_name(index: int) -> str:
+    return f"bench-skill-{index:04d}"
+
+
+def _file_size(rng: random.Random, config: RepoConfig) -> int:
+    size = int(rng.lognormvariate(math.log(config.median_size), config.size_sigma))
+    return max(1, min(size, config.max_size))
+
+
+def _text(rng: random.Random, size: int) -> bytes:
+    lines: list[str] = []
+    length = 0
+    while length < size:
+        line = " ".join(rng.choices(WORDS, k=rng.randint(4, 14))) + "\n"
+        lines.append(line)
+        length += len(line)
+    return "".join(lines).encode("ascii")[:size]
+
+
+def _binary(rng: random.Random, size: int) -> bytes:
+    return (PNG_SIGNATURE + rng.randbytes(max(0, size - len(PNG_SIGNATURE))))[:size]
+
+
+def _skill_md(name: str, index: int) -> bytes:
+    return (
+        f"---\n"
+        f"name: {name}\n"
+        f"description: Synthetic benchmark skill {index}. Use when measuring sync and install performance.\n"
+        f"---\n\n"
+        f"# {name}\n\nGenerated by skillbench.\n"
+    ).encode("ascii")
+
+
+def _write(path: Path, data: bytes) -> None:
+    path.write_bytes(data)
+    os.utime(path, (GENERATED_MTIME, GENERATED_MTIME))
+
+
+def generate_repo(root: Path, config: RepoConfig, project_root: Path) -> int:
+    """Write a synthetic repo under ``root`` and return the bytes of skill content written."""
+    rng = random.Random(config.seed)
+    total = 0
+    for index in range(config.skills):
+        name = skill_name(index)
+        skill_dir = root / name
+        (skill_dir / "references").mkdir(parents=True)
+        skill_md = _skill_md(name, index)
+        _write(skill_dir / "SKILL.md", skill_md)
+        total += len(skill_md)
+        for number in range(1, config.files_per_skill):
+            size = _file_size(rng, config)
+            if rng.random() < config.binary_ratio:
+                path = skill_dir / "e2e-evidence" / f"run-{number % 3:02d}" / f"step-{number:03d}.png"
+                data = _binary(rng, size)
+            else:
+                path = skill_dir / "references" / f"reference-{number:03d}.md"
+                data = _text(rng, size)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write(path, data)
+            total += len(data)
+
+    for rel in TOOLING:
+        src, dest = project_root / rel, root / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if src.is_dir():
+            shutil.copytree(src, dest, ignore=shutil.ignore_patterns("__pycache__"))
+        else:
+            shutil.copy2(src, dest)
+    return total
@@ -0,0 +1,60 @@
+"""Run a script in this process and record its I/O and peak RSS on exit.
+
+Usage:
+  python probe.py STATS_FILE SCRIPT [ARGS...]
+
+``SCRIPT`` runs as ``__main__`` with its own directory first on
+``sys.path``, exactly as if started directly. When the interpreter exits
+the bytes it read and wrote through syscalls (``/proc/self/io`` ``rchar`` /
+``wchar``; ``None`` where that is unavailable) and its peak RSS are written
+to ``STATS_FILE`` as JSON. Subprocesses the script starts (such as git) are
+not included.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import runpy
+import sys
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _io_counters() -> dict[str, int]:
+    try:
+        text = Path("/proc/self/io").read_text(encoding="ascii")
+    except OSError:
+        return {}
+    counters = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(":")
+        counters[key.strip()] = int(value)
+    return counters
+
+
+def _write_stats(path: str) -> None:
+    peak_rss = None
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        # ru_maxrss is KiB on Linux and bytes on macOS.
+        peak_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    io = _io_counters()
+    stats = {"bytes_read": io.get("rchar"), "bytes_written": io.get("wchar"), "peak_rss": peak_rss}
+    Path(path).write_text(json.dumps(stats), encoding="utf-8")
+
+
+def main() -> None:
+    stats_file, script, *args = sys.argv[1:]
+    atexit.register(_write_stats, stats_file)
+    sys.argv = [script, *args]
+    sys.path[0] = str(Path(script).resolve().parent)
+    runpy.run_path(script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
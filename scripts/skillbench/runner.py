@@ -0,0 +1,219 @@
+"""Benchmark scenarios, measurement and baseline comparison.
+
+Each scenario runs one entry point of a generated repo in a fresh
+interpreter, wrapped by ``probe.py``, so measurements include interpreter
+startup the way a git hook sees it. The repo lives in ``<sandbox>/repo``,
+next to the ``HOME`` and ``CODEX_HOME`` the scripts are pointed at, so
+nothing outside the sandbox is touched. A scenario's ``setup`` establishes its
+preconditions once (unmeasured) and ``prepare`` runs before every measured
+repetition, so scenarios can be run in any order or on their own.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from skillbench.generator import RepoConfig, skill_name
+
+RESULTS_VERSION = 1
+METRICS = ("wall_s", "bytes_read", "bytes_written", "peak_rss")
+# Changes smaller than these are noise, whatever the relative threshold.
+NOISE_FLOORS = {"wall_s": 0.05, "bytes_read": 64 * 1024, "bytes_written": 64 * 1024, "peak_rss": 1024 * 1024}
+PROBE = Path(__file__).with_name("probe.py")
+SYNC_SKILLS = "scripts/sync_skills.py"
+SYNC_MARKETPLACE = "scripts/sync_marketplace.py"
+INSTALL_SKILL = "my-skill-factory/scripts/install_skill.py"
+
+
+class BenchError(RuntimeError):
+    pass
+
+
+@dataclass
+class Sandbox:
+    root: Path
+    config: RepoConfig
+    link_mode: str = "copy"
+    selected: int = 5
+    edits: int = field(default=0, init=False)
+
+    @property
+    def repo(self) -> Path:
+        return self.root / "repo"
+
+    @property
+    def home(self) -> Path:
+        return self.root / "home"
+
+    @property
+    def cache_root(self) -> Path:
+        return self.home / ".claude" / "plugins"
+
+    def env(self) -> dict[str, str]:
+        env = dict(os.environ)
+        env.update(HOME=str(self.home), USERPROFILE=str(self.home), CODEX_HOME=str(self.root / "codex"))
+        env.pop("PYTHONPATH", None)
+        return env
+
+    def skill_dirs(self) -> list[str]:
+        return [str(self.repo / skill_name(index)) for index in range(self.config.skills)]
+
+    def selected_names(self) -> list[str]:
+        return [skill_name(index) for index in range(min(self.selected, self.config.skills))]
+
+    def _exec(self, script: str, argv: list[str]) -> None:
+        proc = subprocess.run(
+            [sys.executable, *argv], cwd=self.repo, env=self.env(), capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            tail = (proc.stdout + proc.stderr).strip().splitlines()[-10:]
+            raise BenchError(f"{script} exited with {proc.returncode}:\n  " + "\n  ".join(tail))
+
+    def run(self, script: str, *args: str) -> None:
+        """Run an entry point without measuring it."""
+        self._exec(script, [script, *args])
+
+    def measure(self, script: str, *args: str) -> dict:
+        stats_file = self.root / ".probe-stats.json"
+        stats_file.unlink(missing_ok=True)
+        start = time.perf_counter()
+        self._exec(script, [str(PROBE), str(stats_file), script, *args])
+        wall = time.perf_counter() - start
+        stats = json.loads(stats_file.read_text(encoding="utf-8"))
+        return {"wall_s": round(wall, 4), **stats}
+
+    def reset_sync(self) -> None:
+        for path in (self.repo / ".skill-sync", self.repo / "my-marketplace", self.root / "codex"):
+            shutil.rmtree(path, ignore_errors=True)
+
+    def reset_cache(self) -> None:
+        shutil.rmtree(self.home / ".claude", ignore_errors=True)
+        self.cache_root.mkdir(parents=True)
+        (self.cache_root / "installed_plugins.json").write_text('{"version": 2, "plugins": {}}\n', encoding="utf-8")
+        (self.home / ".claude" / "settings.json").write_text("{}\n", encoding="utf-8")
+
+    def edit_selected(self) -> None:
+        """Append a line to the SKILL.md of every selected skill."""
+        self.edits += 1
+        for name in self.selected_names():
+            with (self.repo / name / "SKILL.md").open("a", encoding="utf-8") as fh:
+                fh.write(f"\nEdit {self.edits}.\n")
+
+
+def _noop(sandbox: Sandbox) -> None:
+    pass
+
+
+def _synced(sandbox: Sandbox) -> None:
+    sandbox.run(SYNC_SKILLS, "--link-mode", sandbox.link_mode)
+
+
+def _validated(sandbox: Sandbox) -> None:
+    _synced(sandbox)
+    sandbox.run(SYNC_MARKETPLACE, "--validate")
+
+
+def _installed(sandbox: Sandbox) -> None:
+    sandbox.reset_cache()
+    sandbox.run(INSTALL_SKILL, *_install_args(sandbox))
+
+
+def _sync_args(sandbox: Sandbox) -> list[str]:
+    return ["--link-mode", sandbox.link_mode]
+
+
+def _selective_args(sandbox: Sandbox) -> list[str]:
+    return ["--skills", *sandbox.selected_names(), "--link-mode", sandbox.link_mode]
+
+
+def _install_args(sandbox: Sandbox) -> list[str]:
+    return [*sandbox.skill_dirs(), "--cache-only", "--link-mode", sandbox.link_mode]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    description: str
+    script: str
+    args: Callable[[Sandbox], list[str]]
+    setup: Callable[[Sandbox], None] = _noop
+    prepare: Callable[[Sandbox], None] = _noop
+
+
+SCENARIOS = (
+    Scenario("sync-cold", "sync_skills.py with no generated trees or state", SYNC_SKILLS, _sync_args,
+             prepare=Sandbox.reset_sync),
+    Scenario("sync-warm", "sync_skills.py with nothing changed", SYNC_SKILLS, _sync_args, setup=_synced),
+    Scenario("sync-selective", "sync_skills.py --skills after editing the selected skills", SYNC_SKILLS,
+             _selective_args, setup=_synced, prepare=Sandbox.edit_selected),
+    Scenario("validate", "sync_marketplace.py --validate with a warm fingerprint cache", SYNC_MARKETPLACE,
+             lambda sandbox: ["--validate"], setup=_validated),
+    Scenario("install-cold", "install_skill.py --cache-only of every skill into an empty cache", INSTALL_SKILL,
+             _install_args, prepare=Sandbox.reset_cache),
+    Scenario("install-warm", "install_skill.py --cache-only of every skill with the cache up to date",
+             INSTALL_SKILL, _install_args, setup=_installed),
+)
+SCENARIO_NAMES = tuple(scenario.name for scenario in SCENARIOS)
+
+
+def _median(runs: list[dict]) -> dict:
+    median = {}
+    for metric in METRICS:
+        values = [run[metric] for run in runs if run.get(metric) is not None]
+        median[metric] = statistics.median(values) if values else None
+    return median
+
+
+def run_scenario(sandbox: Sandbox, scenario: Scenario, repeat: int) -> dict:
+    scenario.setup(sandbox)
+    runs = []
+    for _ in range(repeat):
+        scenario.prepare(sandbox)
+        runs.append(sandbox.measure(scenario.script, *scenario.args(sandbox)))
+    return {"description": scenario.description, "runs": runs, "median": _median(runs)}
+
+
+@dataclass
+class Comparison:
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+    regressed: bool
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline if self.baseline else 0.0
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[Comparison]:
+    """Compare medians of every scenario present in both result sets.
+
+    A metric regresses when it grew by more than ``threshold`` (relative) and
+    by more than its noise floor (absolute).
+    """
+    if baseline.get("version") != RESULTS_VERSION:
+        raise BenchError("baseline was written by an incompatible benchmark version")
+    if baseline.get("config") != results["config"]:
+        raise BenchError("baseline was recorded with a different repo config; rerun it with the same options")
+    comparisons = []
+    for name, scenario in results["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        for metric in METRICS:
+            old, new = base["median"].get(metric), scenario["median"].get(metric)
+            if old is None or new is None:
+                continue
+            regressed = new - old > max(old * threshold, NOISE_FLOORS[metric])
+            comparisons.append(Comparison(name, metric, old, new, regressed))
+    return comparisons
@@ -0,0 +1 @@
+"""Shared helpers for the skill sync and install scripts."""
@@ -0,0 +1,159 @@
+"""Single-file plugin bundles with an embedded index.
+
+A bundle is a zip archive whose first member is ``index.json``::
+
+    {"version": 1, "name": ..., "plugin_version": ..., "description": ...,
+     "digest": <tree digest>, "files": {<path>: {"size": ..., "sha256": ...}}}
+
+followed by every plugin file (``.claude-plugin/*`` and ``skills/<name>/*``).
+Member timestamps are fixed, so identical content always produces an
+identical archive, and the index digest matches the plugin content digest
+the installer records for cached versions. Installers read the index first
+and extract only members whose hash differs from what they already have.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import secrets
+import zipfile
+from pathlib import Path
+from typing import Callable, Iterable
+
+from skillsync import timing
+from skillsync.core import tree_digest
+from skillsync.manifest import file_sha256, prune_empty_dirs
+from skillsync.publish import iter_published_files
+
+BUNDLE_VERSION = 1
+BUNDLE_INDEX = "index.json"
+BUNDLE_SUFFIX = ".zip"
+_FIXED_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+class BundleError(ValueError):
+    """Raised when a file is not a readable plugin bundle."""
+
+
+def build_index(plugin_dir: Path, excluded: Iterable[str], hasher: Callable[[Path], str] = file_sha256) -> dict:
+    plugin_json = json.loads((plugin_dir / ".claude-plugin" / "plugin.json").read_text(encoding="utf-8"))
+    files = {
+        rel: {"size": path.stat().st_size, "sha256": hasher(path)}
+        for rel, path in iter_published_files(plugin_dir, excluded)
+    }
+    return {
+        "version": BUNDLE_VERSION,
+        "name": plugin_json["name"],
+        "plugin_version": str(plugin_json.get("version", "1.0.0")),
+        "description": plugin_json.get("description", ""),
+        "digest": tree_digest({rel: entry["sha256"] for rel, entry in files.items()}),
+        "files": files,
+    }
+
+
+def read_index(bundle_path: Path) -> dict:
+    try:
+        with zipfile.ZipFile(bundle_path) as archive:
+            names = archive.namelist()
+            if not names or names[0] != BUNDLE_INDEX:
+                raise BundleError(f"{bundle_path} does not start with {BUNDLE_INDEX}")
+            index = json.loads(archive.read(BUNDLE_INDEX))
+    except (zipfile.BadZipFile, json.JSONDecodeError) as exc:
+        raise BundleError(f"{bundle_path} is not a plugin bundle: {exc}") from exc
+    if not isinstance(index, dict) or index.get("version") != BUNDLE_VERSION:
+        version = index.get("version") if isinstance(index, dict) else None
+        raise BundleError(f"{bundle_path} has unsupported bundle version {version}")
+    _check_index(bundle_path, index)
+    return index
+
+
+def _check_index(bundle_path: Path, index: dict) -> None:
+    """Reject indexes whose name, version or member paths would land outside the install dir."""
+    for key in ("name", "plugin_version"):
+        value = index.get(key)
+        if not isinstance(value, str) or value in ("", ".", "..") or "/" in value or "\\" in value:
+            raise BundleError(f"{bundle_path}: invalid {key} {value!r} in {BUNDLE_INDEX}")
+    files = index.get("files")
+    if not isinstance(files, dict) or not isinstance(index.get("digest"), str):
+        raise BundleError(f"{bundle_path}: {BUNDLE_INDEX} is missing its files or digest")
+    for rel, entry in files.items():
+        parts = rel.split("/")
+        if rel.startswith("/") or "\\" in rel or ":" in parts[0] or any(part in ("", ".", "..") for part in parts):
+            raise BundleError(f"{bundle_path}: unsafe member path {rel!r} in {BUNDLE_INDEX}")
+        if not isinstance(entry, dict) or not isinstance(entry.get("sha256"), str):
+            raise BundleError(f"{bundle_path}: member {rel} has no sha256 in {BUNDLE_INDEX}")
+
+
+def write_bundle(
+    plugin_dir: Path, bundle_path: Path, excluded: Iterable[str] = (), hasher: Callable[[Path], str] = file_sha256
+) -> bool:
+    """Pack ``plugin_dir`` into ``bundle_path``; return False when the bundle was already current."""
+    index = build_index(plugin_dir, excluded, hasher)
+    if bundle_path.exists():
+        try:
+            if read_index(bundle_path)["digest"] == index["digest"]:
+                return False
+        except BundleError:
+            pass
+
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    with timing.phase("copy", bundle_path.name, files=len(index["files"])) as event:
+        _write_archive(plugin_dir, bundle_path, index)
+        event.bytes = sum(entry["size"] for entry in index["files"].values())
+    return True
+
+
+def _write_archive(plugin_dir: Path, bundle_path: Path, index: dict) -> None:
+    tmp = bundle_path.parent / f".{bundle_path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp"
+    try:
+        with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            info = zipfile.ZipInfo(BUNDLE_INDEX, _FIXED_DATE)
+            archive.writestr(info, json.dumps(index, indent=1, sort_keys=True), zipfile.ZIP_DEFLATED)
+            for rel in sorted(index["files"]):
+                info = zipfile.ZipInfo(rel, _FIXED_DATE)
+                info.external_attr = 0o644 << 16
+                archive.writestr(info, (plugin_dir / rel).read_bytes(), zipfile.ZIP_DEFLATED)
+        os.replace(tmp, bundle_path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def extract_changed(
+    bundle_path: Path, index: dict, dest: Path, current: dict[str, str]
+) -> tuple[list[str], list[str], int]:
+    """Update ``dest`` (a clone of the installed tree) to match the bundle.
+
+    ``current`` maps the relative paths already in ``dest`` to their sha256.
+    Only members whose hash differs are extracted; files the index no longer
+    lists are deleted. Returns ``(extracted, removed, unchanged)``.
+    """
+    extracted: list[str] = []
+    unchanged = 0
+    root = dest.resolve()
+    with zipfile.ZipFile(bundle_path) as archive:
+        for rel, entry in sorted(index["files"].items()):
+            if current.get(rel) == entry["sha256"]:
+                unchanged += 1
+                continue
+            target = dest / rel
+            # read_index rejects unsafe paths; this also catches symlinked dirs in ``dest``.
+            if not target.parent.resolve().is_relative_to(root):
+                raise BundleError(f"{bundle_path}: member {rel} would be written outside {dest}")
+            # Unlink first: the clone shares inodes with the published tree.
+            target.unlink(missing_ok=True)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with timing.phase("copy", rel, files=1, nbytes=entry["size"]):
+                data = archive.read(rel)
+                if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+                    raise BundleError(f"{bundle_path}: member {rel} does not match its index entry")
+                target.write_bytes(data)
+            extracted.append(rel)
+
+    removed = sorted(set(current) - set(index["files"]))
+    for rel in removed:
+        (dest / rel).unlink(missing_ok=True)
+    prune_empty_dirs(dest, removed)
+    return extracted, removed, unchanged
@@ -0,0 +1,164 @@
+"""Garbage collection for the installed plugin cache.
+
+The cache holds one published directory per plugin version
+(``<cache>/<name>/<version>``, see ``skillsync.publish``) with its
+generations dir and content digest beside it. Versions referenced by
+``installed_plugins.json`` are always kept; the others are evicted least
+recently used first until the whole cache fits the size budget. A version's
+last use is the later of its last publish and its last up-to-date install.
+Sizes are physical: content hardlinked from several versions, or into the
+object store, is counted once.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+from skillsync.publish import generations_dir, remove_published
+from skillsync.store import ObjectStore
+
+
+@dataclass
+class CacheEntry:
+    name: str
+    version: str
+    path: Path
+    size: int
+    last_used: float
+    reachable: bool
+
+
+def digest_path(version_dir: Path) -> Path:
+    """Where the content digest of a cached plugin version is recorded."""
+    return version_dir.parent / f".{version_dir.name}.digest"
+
+
+def _iter_files(paths: list[Path]):
+    """``lstat`` results for every file under ``paths`` (symlinks are not followed)."""
+    for path in paths:
+        if path.is_symlink() or path.is_file():
+            yield path.lstat()
+        elif path.is_dir():
+            for dirpath, _, filenames in os.walk(path):
+                for filename in filenames:
+                    yield os.lstat(os.path.join(dirpath, filename))
+
+
+def _reclaimable_size(paths: list[Path], store_inodes: set[tuple[int, int]]) -> int:
+    """Bytes freed by deleting ``paths`` (and then pruning the object store).
+
+    An inode only counts when every link to it is inside ``paths``, apart
+    from the store's own link, so content shared with other versions is not
+    claimed twice.
+    """
+    links: dict[tuple[int, int], list] = {}
+    for st in _iter_files(paths):
+        entry = links.setdefault((st.st_dev, st.st_ino), [st, 0])
+        entry[1] += 1
+    total = 0
+    for key, (st, count) in links.items():
+        if st.st_nlink <= count + (1 if key in store_inodes else 0):
+            total += st.st_size
+    return total
+
+
+def cache_size(cache_root: Path) -> int:
+    """Physical bytes under ``cache_root``, counting each inode once."""
+    seen: set[tuple[int, int]] = set()
+    total = 0
+    for st in _iter_files([cache_root]):
+        key = (st.st_dev, st.st_ino)
+        if key not in seen:
+            seen.add(key)
+            total += st.st_size
+    return total
+
+
+def _last_used(version_dir: Path) -> float:
+    stamps = []
+    for path in (version_dir, digest_path(version_dir)):
+        try:
+            stamps.append(path.lstat().st_mtime)
+        except FileNotFoundError:
+            pass
+    return max(stamps, default=0.0)
+
+
+def scan_cache(
+    cache_root: Path, reachable: set[tuple[str, str]], store: ObjectStore | None = None
+) -> list[CacheEntry]:
+    """List every cached plugin version with its reclaimable size and last use."""
+    entries: list[CacheEntry] = []
+    if not cache_root.is_dir():
+        return entries
+    store_inodes = set()
+    if store is not None:
+        store_inodes = {(st.st_dev, st.st_ino) for st in (obj.stat() for obj in store.objects())}
+    for plugin_dir in sorted(cache_root.iterdir()):
+        # Dot dirs (the object store) are not plugins.
+        if plugin_dir.name.startswith(".") or not plugin_dir.is_dir() or plugin_dir.is_symlink():
+            continue
+        versions = {child.name for child in plugin_dir.iterdir() if not child.name.startswith(".")}
+        # Generations whose published link is already gone still count.
+        versions |= {
+            child.name[1 : -len(".generations")]
+            for child in plugin_dir.iterdir()
+            if child.name.startswith(".") and child.name.endswith(".generations")
+        }
+        for version in sorted(versions):
+            path = plugin_dir / version
+            size = _reclaimable_size([path, generations_dir(path), digest_path(path)], store_inodes)
+            entries.append(
+                CacheEntry(
+                    name=plugin_dir.name,
+                    version=version,
+                    path=path,
+                    size=size,
+                    last_used=_last_used(path),
+                    reachable=(plugin_dir.name, version) in reachable,
+                )
+            )
+    return entries
+
+
+def evict(entry: CacheEntry) -> None:
+    remove_published(entry.path)
+    digest_path(entry.path).unlink(missing_ok=True)
+    plugin_dir = entry.path.parent
+    if plugin_dir.is_dir() and not any(plugin_dir.iterdir()):
+        shutil.rmtree(plugin_dir, ignore_errors=True)
+
+
+def collect_garbage(
+    cache_root: Path,
+    reachable: set[tuple[str, str]],
+    max_size: int = 0,
+    dry_run: bool = False,
+    store: ObjectStore | None = None,
+) -> tuple[list[CacheEntry], int, int]:
+    """Evict unreachable versions, least recently used first, until the cache fits ``max_size``.
+
+    Returns the evicted entries and the cache size before and after (the
+    latter estimated on a dry run). Reachable versions are never evicted, so
+    the result can still exceed the budget. Store objects no version links
+    to any more are pruned afterwards.
+    """
+    before = cache_size(cache_root) if cache_root.is_dir() else 0
+    total = before
+    evicted: list[CacheEntry] = []
+    entries = scan_cache(cache_root, reachable, store)
+    for entry in sorted((e for e in entries if not e.reachable), key=lambda e: e.last_used):
+        if total <= max_size:
+            break
+        if not dry_run:
+            evict(entry)
+        evicted.append(entry)
+        total -= entry.size
+    if dry_run:
+        return evicted, before, total
+    if store is not None:
+        store.prune()
+    return evicted, before, cache_size(cache_root) if cache_root.is_dir() else 0
@@ -0,0 +1,160 @@
+"""Transactional updates of shared JSON config files.
+
+``installed_plugins.json``, ``settings.json`` and the marketplace registry are
+rewritten by installs that may run at the same time (parallel installs,
+pre-push hooks in several worktrees). ``update_json`` makes each change a
+transaction: it takes an exclusive lock on a ``.<name>.lock`` file next to the
+config, reads the current content under the lock, applies the caller's
+change to it and replaces the file atomically. A writer therefore merges its
+change into whatever the others committed before it, instead of overwriting
+it with a copy read earlier. A change that leaves the content as it was
+writes nothing.
+
+The lock is advisory and only honoured by these scripts. Claude Code itself
+can still replace ``settings.json`` between our read and write.
+
+Files are read as JSONC: ``//`` and ``/* */`` comments and trailing commas
+are accepted, while the same characters inside strings (URLs, Windows paths)
+are left alone. Comments are not preserved when a file is rewritten.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+from skillsync import timing
+from skillsync.publish import atomic_write_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_TIMEOUT = 30.0
+LOCK_POLL_SECONDS = 0.05
+
+# Strings come first so comment markers and commas inside them are consumed with the string.
+# A block comment ends at its first "*/", even when a lookahead backtracks.
+_COMMENT = r"//[^\n]*|/\*(?:[^*]|\*(?!/))*\*/"
+_TOKEN_RE = re.compile(rf'"(?:[^"\\]|\\.)*"|{_COMMENT}|,(?=(?:\s|{_COMMENT})*[\]}}])')
+
+
+class ConfigError(RuntimeError):
+    """Raised when a config file cannot be parsed, is missing, or stays locked."""
+
+
+def _blank(match: re.Match) -> str:
+    token = match.group(0)
+    if token.startswith('"'):
+        return token
+    # Keep newlines so error positions still point at the right line.
+    return re.sub(r"[^\n]", " ", token)
+
+
+def strip_jsonc(text: str) -> str:
+    """``text`` with comments and trailing commas blanked out and strings untouched."""
+    return _TOKEN_RE.sub(_blank, text)
+
+
+def read_jsonc(path: Path) -> dict:
+    try:
+        text = path.read_text(encoding="utf-8-sig")
+    except FileNotFoundError as exc:
+        raise ConfigError(f"{path} does not exist") from exc
+    try:
+        return json.loads(strip_jsonc(text))
+    except json.JSONDecodeError as exc:
+        raise ConfigError(f"{path}: {exc}") from exc
+
+
+def lock_path(path: Path) -> Path:
+    return path.parent / f".{path.name}.lock"
+
+
+class FileLock:
+    """Exclusive inter-process lock on ``path`` (created if missing), as a context manager."""
+
+    def __init__(self, path: Path, timeout: float = LOCK_TIMEOUT) -> None:
+        self.path = path
+        self.timeout = timeout
+        self._fd: int | None = None
+
+    def _try_lock(self, fd: int) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def __enter__(self) -> FileLock:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        deadline = time.monotonic() + self.timeout
+        while not self._try_lock(fd):
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                raise ConfigError(f"timed out after {self.timeout:g}s waiting for {self.path}")
+            time.sleep(LOCK_POLL_SECONDS)
+        self._fd = fd
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            # The lock file itself stays: removing it would let two writers lock different inodes.
+            os.close(fd)
+
+
+@contextmanager
+def locked_json(
+    path: Path, default: Callable[[], dict] | None = None, timeout: float = LOCK_TIMEOUT
+) -> Iterator[dict]:
+    """Hold the lock on ``path`` and yield its current content; changes made to it are written back on exit.
+
+    A missing file starts from ``default()``, or is an error when there is
+    no default. Nothing is written if the block raises.
+    """
+    with FileLock(lock_path(path), timeout):
+        if path.exists() or default is None:
+            data = read_jsonc(path)
+        else:
+            data = default()
+        before = copy.deepcopy(data)
+        yield data
+        if data != before or not path.exists():
+            atomic_write_json(path, data)
+
+
+def update_json(
+    path: Path,
+    change: Callable[[dict], None],
+    default: Callable[[], dict] | None = None,
+    timeout: float = LOCK_TIMEOUT,
+) -> dict:
+    """Apply ``change`` to the current content of ``path`` in one locked transaction and return the result.
+
+    ``change`` mutates the parsed document in place (see ``locked_json``).
+    """
+    with timing.phase("registry", f"update {path.name}", files=1), locked_json(path, default, timeout) as data:
+        change(data)
+    return data
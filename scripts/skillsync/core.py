@@ -0,0 +1,414 @@
+"""Skill discovery, plugin metadata and registry helpers shared by the entry points."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, TypeVar
+
+from skillsync import timing
+from skillsync.configfile import update_json
+from skillsync.discovery import SkillIndex, selection_matches
+from skillsync.frontmatter import parse_skill_frontmatter
+from skillsync.gitdiff import changed_paths
+from skillsync.ignore import SkillIgnore, load_rules
+from skillsync.manifest import SyncResult, file_sha256, load_manifest, manifest_path, sync_tree_fanout
+from skillsync.publish import atomic_write_text
+from skillsync.store import ObjectStore
+from skillsync.treediff import (
+    CHANGED,
+    EXTRA,
+    MISSING,
+    ErrorLimit,
+    TreeFile,
+    diff_trees,
+    largest_files,
+    same_content,
+    walk_files,
+)
+from skillsync.units import format_size
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+MARKETPLACE_ROOT = PROJECT_ROOT / "my-marketplace"
+MARKETPLACE_REGISTRY = MARKETPLACE_ROOT / ".claude-plugin" / "marketplace.json"
+PLUGINS_DIR = MARKETPLACE_ROOT / "plugins"
+BUNDLES_DIR = MARKETPLACE_ROOT / "bundles"
+SYNC_STATE_DIR = PROJECT_ROOT / ".skill-sync"
+FINGERPRINT_CACHE = SYNC_STATE_DIR / "fingerprints.json"
+SKILL_INDEX = SYNC_STATE_DIR / "skill-index.json"
+OBJECT_STORE = SYNC_STATE_DIR / "objects"
+MARKETPLACE_NAME = "hideki-plugins"
+
+EXCLUDED_SOURCE_DIRS = {
+    ".git",
+    ".cursor",
+    ".skill-sync",
+    "my-marketplace",
+}
+EXCLUDED_TREE_NAMES = {
+    "__pycache__",
+    ".DS_Store",
+}
+# Skills with at least this many files get their file hashing fanned out too.
+HASH_FANOUT_MIN_FILES = 32
+# Registry generations kept in the change log of marketplace.json.
+REGISTRY_CHANGE_LOG = 50
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class SkillMeta:
+    dir_name: str
+    name: str
+    description: str
+    source_dir: Path
+
+
+def resolve_jobs(value: int) -> int:
+    return value if value > 0 else (os.cpu_count() or 1)
+
+
+def ordered_map(func: Callable[[T], R], items: Iterable[T], jobs: int) -> list[R]:
+    """Apply ``func`` to ``items`` on up to ``jobs`` threads, returning results in input order."""
+    items = list(items)
+    if jobs <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(jobs, len(items))) as pool:
+        return list(pool.map(timing.bind(func), items))
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def json_text(data: dict) -> str:
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+def write_json(path: Path, data: dict) -> None:
+    text = json_text(data)
+    if path.exists() and read_text(path) == text:
+        return
+    atomic_write_text(path, text)
+
+
+def read_skill_meta(skill_dir: Path) -> SkillMeta:
+    with timing.phase("frontmatter", skill_dir.name, files=1):
+        name, description = parse_skill_frontmatter(skill_dir / "SKILL.md")
+    return SkillMeta(
+        dir_name=skill_dir.name,
+        name=name,
+        description=description,
+        source_dir=skill_dir,
+    )
+
+
+def open_skill_index() -> SkillIndex:
+    return SkillIndex(
+        PROJECT_ROOT, SKILL_INDEX, EXCLUDED_SOURCE_DIRS, EXCLUDED_TREE_NAMES, ignore=load_rules(PROJECT_ROOT)
+    )
+
+
+def skill_ignore(source_dir: Path) -> SkillIgnore:
+    """The ``.skillignore`` rules for one skill root: its own, then the repo-level ones."""
+    try:
+        prefix = source_dir.resolve().relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        prefix = None
+    return SkillIgnore(load_rules(PROJECT_ROOT), prefix, load_rules(source_dir))
+
+
+def indexed_skill_meta(rel: str, entry: dict) -> SkillMeta:
+    return SkillMeta(
+        dir_name=rel,
+        name=entry["name"],
+        description=entry["description"],
+        source_dir=PROJECT_ROOT / rel,
+    )
+
+
+def discover_source_skills(selected: set[str] | None, index: SkillIndex | None = None) -> list[SkillMeta]:
+    """Resolve skill roots (nested ones included) through the discovery index."""
+    with timing.phase("discovery", "skill index"):
+        index = index or open_skill_index()
+        skills = [indexed_skill_meta(rel, entry) for rel, entry in index.resolve(selected).items()]
+    index.save()
+
+    skills.sort(key=lambda item: item.name)
+    return skills
+
+
+def enclosing_skill_roots(paths: Iterable[Path], known: set[str] = frozenset()) -> set[str]:
+    """Map paths to the (possibly nested) skill roots they live in.
+
+    A path inside a directory listed in ``known`` maps to it even if its
+    SKILL.md is gone, so callers can notice removed roots.
+    """
+    roots: set[str] = set()
+    for path in paths:
+        try:
+            rel = path.relative_to(PROJECT_ROOT)
+        except ValueError:
+            continue
+        if not rel.parts or rel.parts[0] in EXCLUDED_SOURCE_DIRS:
+            continue
+        for depth in range(len(rel.parts), 0, -1):
+            candidate = "/".join(rel.parts[:depth])
+            if candidate in known or (PROJECT_ROOT / candidate / "SKILL.md").is_file():
+                roots.add(candidate)
+                break
+    return roots
+
+
+def changed_source_skills(
+    since: str | None, staged: bool, selected: set[str] | None
+) -> list[SkillMeta]:
+    """Discover only the skills whose roots contain paths git reports as changed."""
+    with timing.phase("discovery", "git diff"):
+        paths = changed_paths(PROJECT_ROOT, since=since, staged=staged)
+    roots = enclosing_skill_roots(PROJECT_ROOT / path for path in paths)
+    if not roots:
+        return []
+    skills = [meta for meta in discover_source_skills(roots) if meta.dir_name in roots]
+    if selected:
+        skills = [meta for meta in skills if selection_matches(meta.dir_name, meta.name, selected)]
+    return skills
+
+
+def copy_skill_tree(
+    source_dir: Path, dest_dirs: list[Path], full: bool = False, link_mode: str = "copy"
+) -> list[SyncResult]:
+    """Mirror ``source_dir`` into every destination, reading each source file once."""
+    return sync_tree_fanout(
+        source_dir,
+        [(dest_dir, manifest_path(SYNC_STATE_DIR, dest_dir)) for dest_dir in dest_dirs],
+        EXCLUDED_TREE_NAMES,
+        full=full,
+        link_mode=link_mode,
+        store=ObjectStore(OBJECT_STORE),
+        ignore=skill_ignore(source_dir),
+    )
+
+
+def plugin_description(name: str, description: str) -> str:
+    return (description or f"{name} skill")[:200]
+
+
+def plugin_content(name: str, files: dict[str, dict]) -> dict:
+    """Content digest, file count and total bytes of a plugin's skill tree.
+
+    ``files`` maps paths relative to the skill root to ``{"size", "sha256"}``.
+    The digest covers ``skills/<name>/...`` only, so it does not depend on
+    the metadata files it is written into.
+    """
+    return {
+        "contentDigest": tree_digest({f"skills/{name}/{rel}": entry["sha256"] for rel, entry in files.items()}),
+        "fileCount": len(files),
+        "totalBytes": sum(entry["size"] for entry in files.values()),
+    }
+
+
+def plugin_json_data(name: str, description: str, version: str, content: dict | None = None) -> dict:
+    return {
+        "name": name,
+        "version": version,
+        "description": plugin_description(name, description),
+        "author": {"name": "Hideki"},
+        "keywords": [name],
+        "license": "MIT",
+        "skills": "./skills",
+        **(content or {}),
+    }
+
+
+def plugin_marketplace_data(name: str, description: str, version: str, content: dict | None = None) -> dict:
+    return {
+        "name": MARKETPLACE_NAME,
+        "owner": {"name": "Hideki"},
+        "metadata": {"description": "Custom Claude Code plugins by Hideki"},
+        "plugins": [
+            {
+                "name": name,
+                "source": {"type": "local", "path": "."},
+                "description": plugin_description(name, description),
+                "version": version,
+                **(content or {}),
+            }
+        ],
+    }
+
+
+def plugin_metadata_files(name: str, description: str, version: str, content: dict | None = None) -> dict[str, dict]:
+    """Contents of the files under a plugin's ``.claude-plugin/`` dir, by file name."""
+    return {
+        "plugin.json": plugin_json_data(name, description, version, content),
+        "marketplace.json": plugin_marketplace_data(name, description, version, content),
+    }
+
+
+def write_plugin_metadata(
+    plugin_dir: Path, name: str, description: str, version: str, content: dict | None = None
+) -> None:
+    plugin_meta_dir = plugin_dir / ".claude-plugin"
+    with timing.phase("metadata", name) as event:
+        for file_name, data in plugin_metadata_files(name, description, version, content).items():
+            write_json(plugin_meta_dir / file_name, data)
+            event.files += 1
+
+
+def ensure_plugin_metadata(plugin_dir: Path, meta: SkillMeta) -> None:
+    """Write the plugin's metadata after a sync, carrying its version forward.
+
+    The content summary comes from the sync manifest of ``skills/<name>``,
+    which records every file's size and sha256, so nothing is rehashed.
+    """
+    plugin_json_path = plugin_dir / ".claude-plugin" / "plugin.json"
+    version = "1.0.0"
+    if plugin_json_path.exists():
+        try:
+            existing = json.loads(read_text(plugin_json_path))
+            version = str(existing.get("version", version))
+        except json.JSONDecodeError:
+            pass
+
+    skill_dir = plugin_dir / "skills" / meta.name
+    files = load_manifest(manifest_path(SYNC_STATE_DIR, skill_dir), skill_dir)
+    write_plugin_metadata(plugin_dir, meta.name, meta.description, version, plugin_content(meta.name, files))
+
+
+def registry_entry(meta: SkillMeta, plugins_dir: Path) -> dict:
+    """The registry entry of a synced plugin, with the version and content summary from its plugin.json."""
+    entry = {
+        "name": meta.name,
+        "source": f"./plugins/{meta.name}",
+        "description": plugin_description(meta.name, meta.description),
+    }
+    try:
+        plugin_json = json.loads(read_text(plugins_dir / meta.name / ".claude-plugin" / "plugin.json"))
+    except (OSError, json.JSONDecodeError):
+        return entry
+    for key in ("version", "contentDigest", "fileCount", "totalBytes"):
+        if key in plugin_json:
+            entry[key] = plugin_json[key]
+    return entry
+
+
+def sync_registry(
+    synced: list[SkillMeta], removed: Iterable[str] = (), registry_path: Path = MARKETPLACE_REGISTRY
+) -> None:
+    """Merge synced and removed plugins into the root registry.
+
+    Every update that changes an entry bumps the registry's ``generation``,
+    stamps it on the changed entries and appends ``{generation, changed,
+    removed}`` to the ``changes`` log (the last REGISTRY_CHANGE_LOG kept). A
+    client that remembers the generation it last saw reads only the log, or
+    compares ``contentDigest`` per plugin once the log has moved past it.
+    """
+    plugins_dir = registry_path.parent.parent / "plugins"
+    entries = {meta.name: registry_entry(meta, plugins_dir) for meta in synced}
+
+    def merge(registry: dict) -> None:
+        existing_by_name = {plugin.get("name"): plugin for plugin in registry.get("plugins", [])}
+        changed: list[str] = []
+        for name, entry in entries.items():
+            old = existing_by_name.get(name, {})
+            if {key: value for key, value in old.items() if key != "generation"} == entry:
+                entry = {**entry, "generation": old["generation"]} if "generation" in old else entry
+            else:
+                changed.append(name)
+            existing_by_name[name] = entry
+        dropped = sorted(name for name in set(removed) if existing_by_name.pop(name, None) is not None)
+        if changed or dropped:
+            generation = int(registry.get("generation", 0)) + 1
+            for name in changed:
+                existing_by_name[name] = {**existing_by_name[name], "generation": generation}
+            registry["generation"] = generation
+            change = {"generation": generation, "changed": sorted(changed), "removed": dropped}
+            registry["changes"] = [*registry.get("changes", []), change][-REGISTRY_CHANGE_LOG:]
+        registry["plugins"] = sorted(existing_by_name.values(), key=lambda item: item["name"])
+
+    # Locked and merged into the file's current content: parallel installs share the root registry.
+    update_json(
+        registry_path, merge, default=lambda: {"name": MARKETPLACE_NAME, "owner": {"name": "Hideki"}, "plugins": []}
+    )
+
+
+def budget_errors(meta: SkillMeta, budget: int) -> list[str]:
+    """Flag a skill whose shipped files add up to more than ``budget`` bytes."""
+    files = walk_files(meta.source_dir, EXCLUDED_TREE_NAMES, skill_ignore(meta.source_dir))
+    total, largest = largest_files(files, 3)
+    if total <= budget:
+        return []
+    listing = ", ".join(f"{rel} ({format_size(size)})" for size, rel in largest)
+    return [
+        f"[{meta.name}] plugin size {format_size(total)} exceeds the {format_size(budget)} budget"
+        f" (largest: {listing}); trim it with a .skillignore"
+    ]
+
+
+def file_hash(path: Path) -> str:
+    return file_sha256(path)
+
+
+def tree_digest(files: dict[str, str]) -> str:
+    """Digest of a whole tree given ``{relative path: file sha256}``."""
+    digest = hashlib.sha256()
+    for rel in sorted(files):
+        digest.update(f"{rel}\0{files[rel]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def collect_files(
+    base: Path,
+    jobs: int = 1,
+    hasher: Callable[[Path], str] = file_hash,
+    ignore: SkillIgnore | None = None,
+) -> dict[str, dict]:
+    """``{relative path: {"size", "sha256"}}`` for the files under ``base``."""
+    files = list(walk_files(base, EXCLUDED_TREE_NAMES, ignore))
+    hash_jobs = jobs if len(files) >= HASH_FANOUT_MIN_FILES else 1
+    digests = ordered_map(lambda file: hasher(Path(file.path)), files, hash_jobs)
+    return {file.rel: {"size": file.stat.st_size, "sha256": sha} for file, sha in zip(files, digests)}
+
+
+def tree_errors(
+    meta: SkillMeta,
+    destination: Path,
+    label: str,
+    hasher: Callable[[Path], str] = file_hash,
+    limit: ErrorLimit | None = None,
+    trust_mtime: bool = True,
+    same: Callable[[TreeFile, TreeFile], bool] | None = None,
+) -> list[str]:
+    """Describe how ``destination`` differs from the skill's source, in one streaming pass over both.
+
+    Files present in both are compared with ``same`` when given, else by
+    metadata and then ``hasher``. Stops early once ``limit`` is reached;
+    only the differences found so far are reported.
+    """
+    if same is None:
+
+        def same(left: TreeFile, right: TreeFile) -> bool:
+            return same_content(left, right, hasher, trust_mtime)
+
+    found: dict[str, list[str]] = {MISSING: [], EXTRA: [], CHANGED: []}
+    differences = diff_trees(meta.source_dir, destination, EXCLUDED_TREE_NAMES, same, skill_ignore(meta.source_dir))
+    for kind, rel in differences:
+        if limit is not None and not limit.take():
+            break
+        found[kind].append(rel)
+
+    errors: list[str] = []
+    if found[MISSING]:
+        errors.append(f"[{meta.name}] missing files in {label}: {', '.join(found[MISSING])}")
+    if found[EXTRA]:
+        errors.append(f"[{meta.name}] extra files in {label}: {', '.join(found[EXTRA])}")
+    if found[CHANGED]:
+        errors.append(f"[{meta.name}] changed file content in {label}: {', '.join(found[CHANGED])}")
+    return errors
@@ -0,0 +1,213 @@
+"""Persistent index of skill roots for selective discovery.
+
+The index maps each skill root (its path relative to the repo root, e.g.
+``dev-workflow`` or ``group/nested-skill``) to the ``name`` and
+``description`` parsed from its SKILL.md plus that file's ``(size,
+mtime_ns)``. It also records the mtime of every non-skill directory scanned
+while looking for roots; adding or removing a root changes one of those
+mtimes, so staleness is detected with a handful of ``stat()`` calls.
+
+Selections resolve by lookup and only the matched roots are re-verified, so
+``--skills dev-workflow`` costs O(selected skills). A full scan happens only
+when the index is stale or a selection does not resolve. Directories ignored
+by the repo-level ``.skillignore`` are not searched; the index is rebuilt
+when those rules change.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterable
+
+from skillsync import timing
+from skillsync.frontmatter import parse_skill_frontmatter
+from skillsync.ignore import EMPTY_RULES, IgnoreRules
+from skillsync.publish import atomic_write_text
+
+INDEX_VERSION = 1
+RACY_WINDOW_NS = 2_000_000_000
+# How many directory levels below the repo root are searched for skill roots.
+MAX_DISCOVERY_DEPTH = 3
+SKIPPED_SCAN_DIRS = {"node_modules"}
+
+
+def selection_matches(rel: str, name: str, selected: set[str]) -> bool:
+    """A ``--skills`` entry selects a root by frontmatter name, relative path or basename."""
+    return name in selected or rel in selected or rel.rsplit("/", 1)[-1] in selected
+
+
+class SkillIndex:
+    def __init__(
+        self,
+        root: Path,
+        path: Path,
+        excluded_roots: Iterable[str],
+        excluded_names: Iterable[str],
+        ignore: IgnoreRules = EMPTY_RULES,
+    ) -> None:
+        self.root = root
+        self.path = path
+        self.excluded_roots = set(excluded_roots)
+        self.excluded_names = set(excluded_names) | SKIPPED_SCAN_DIRS
+        self.ignore = ignore
+        self.parsed = 0
+        self._containers: dict[str, int] = {}
+        self._skills: dict[str, dict] = {}
+        # Stamps parsed by this process, including racy ones not persisted.
+        self._seen: dict[str, tuple[int, int]] = {}
+        self._loaded = self._load()
+        self._dirty = False
+
+    def _load(self) -> bool:
+        if not self.path.exists():
+            return False
+        try:
+            with timing.phase("state", self.path.name, files=1):
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return False
+        if data.get("version") != INDEX_VERSION or data.get("root") != str(self.root):
+            return False
+        if data.get("ignore", "") != self.ignore.digest:
+            return False
+        self._containers = data.get("containers", {})
+        self._skills = data.get("skills", {})
+        return True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "ignore": self.ignore.digest,
+            "containers": self._containers,
+            "skills": self._skills,
+        }
+        with timing.phase("state", self.path.name, files=1):
+            atomic_write_text(self.path, json.dumps(data, indent=1, sort_keys=True, ensure_ascii=False) + "\n")
+        self._dirty = False
+
+    def _abs(self, rel: str) -> Path:
+        return self.root / rel if rel else self.root
+
+    def is_stale(self) -> bool:
+        if not self._loaded:
+            return True
+        for rel, mtime_ns in self._containers.items():
+            try:
+                if os.stat(self._abs(rel)).st_mtime_ns != mtime_ns:
+                    return True
+            except FileNotFoundError:
+                return True
+        return False
+
+    def _skip(self, parent_rel: str, name: str) -> bool:
+        if name in self.excluded_names or name.startswith("."):
+            return True
+        if not parent_rel and name in self.excluded_roots:
+            return True
+        return bool(self.ignore.match(f"{parent_rel}/{name}" if parent_rel else name, True))
+
+    def _ignored_root(self, rel: str) -> bool:
+        parts = rel.split("/")
+        return any(self.ignore.match("/".join(parts[:depth]), True) for depth in range(1, len(parts) + 1))
+
+    def rescan(self) -> None:
+        """Walk the repo for skill roots, reparsing only SKILL.md files that changed."""
+        containers: dict[str, int] = {}
+        found: list[str] = []
+        pending = [("", 0)]
+        while pending:
+            rel, depth = pending.pop()
+            directory = self._abs(rel)
+            containers[rel] = directory.stat().st_mtime_ns
+            if depth >= MAX_DISCOVERY_DEPTH:
+                continue
+            for entry in sorted(os.scandir(directory), key=lambda item: item.name):
+                if not entry.is_dir(follow_symlinks=False) or self._skip(rel, entry.name):
+                    continue
+                child_rel = f"{rel}/{entry.name}" if rel else entry.name
+                if os.path.isfile(os.path.join(entry.path, "SKILL.md")):
+                    found.append(child_rel)
+                else:
+                    pending.append((child_rel, depth + 1))
+
+        self._skills = {rel: entry for rel, entry in self._skills.items() if rel in found}
+        for rel in found:
+            self.refresh(rel)
+        # Only record container mtimes once every root parsed, so a failed scan
+        # leaves the index stale and is retried.
+        self._containers = containers
+        self._loaded = True
+        self._dirty = True
+
+    def refresh(self, rel: str) -> dict | None:
+        """Return the up-to-date entry for one root, reparsing SKILL.md only if it changed."""
+        skill_md = self._abs(rel) / "SKILL.md"
+        try:
+            st = None if self._ignored_root(rel) else skill_md.stat()
+        except FileNotFoundError:
+            st = None
+        if st is None:
+            if self._skills.pop(rel, None) is not None:
+                self._dirty = True
+            return None
+
+        stamp = (st.st_size, st.st_mtime_ns)
+        entry = self._skills.get(rel)
+        if entry and (stamp == (entry["size"], entry["mtime_ns"]) or self._seen.get(rel) == stamp):
+            return entry
+
+        with timing.phase("frontmatter", rel, files=1, nbytes=st.st_size):
+            name, description = parse_skill_frontmatter(skill_md)
+        self.parsed += 1
+        # A SKILL.md written within the racy window may change again without
+        # moving its mtime; leave its stamp unset so the next run reparses it.
+        racy = time.time_ns() - st.st_mtime_ns <= RACY_WINDOW_NS
+        entry = {
+            "name": name,
+            "description": description,
+            "size": -1 if racy else st.st_size,
+            "mtime_ns": -1 if racy else st.st_mtime_ns,
+        }
+        self._skills[rel] = entry
+        self._seen[rel] = stamp
+        self._dirty = True
+        return entry
+
+    def roots(self) -> list[str]:
+        return sorted(self._skills)
+
+    @staticmethod
+    def matches(rel: str, entry: dict, selected: set[str]) -> bool:
+        return selection_matches(rel, entry["name"], selected)
+
+    def resolve(self, selected: set[str] | None) -> dict[str, dict]:
+        """Return ``{root: entry}`` for every selected skill root (all roots if ``selected`` is None)."""
+        if self.is_stale():
+            self.rescan()
+
+        if selected:
+            candidates = [rel for rel in self.roots() if self.matches(rel, self._skills[rel], selected)]
+            resolved: dict[str, dict] = {}
+            for rel in candidates:
+                entry = self.refresh(rel)
+                if entry is not None and self.matches(rel, entry, selected):
+                    resolved[rel] = entry
+            covered = {entry["name"] for entry in resolved.values()} | set(resolved)
+            covered |= {rel.rsplit("/", 1)[-1] for rel in resolved}
+            if selected <= covered:
+                return resolved
+
+        # Unfiltered discovery, or a selection the index could not answer:
+        # verify every root (stat only, reparse on change).
+        result: dict[str, dict] = {}
+        for rel in self.roots():
+            entry = self.refresh(rel)
+            if entry is not None and (not selected or self.matches(rel, entry, selected)):
+                result[rel] = entry
+        return result
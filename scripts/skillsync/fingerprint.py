@@ -0,0 +1,89 @@
+"""Persistent stat-fingerprint cache in front of sha256.
+
+Entries are keyed by absolute path and remember the ``(inode, size,
+mtime_ns)`` the digest was computed for. A lookup whose stat still matches is
+answered without reading the file, so repeated validation is dominated by
+``stat()`` calls. Files modified within ``RACY_WINDOW_NS`` of the lookup are
+hashed but never cached, since a same-timestamp rewrite could go unnoticed.
+In paranoid mode every lookup rehashes the file and refreshes its entry.
+
+Within one run digests are also shared by inode, so hardlinked or symlinked
+generated trees are verified against their source without a second read.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from skillsync import timing
+from skillsync.manifest import file_sha256
+from skillsync.publish import atomic_write_text
+
+CACHE_VERSION = 1
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class FingerprintCache:
+    def __init__(self, path: Path, paranoid: bool = False) -> None:
+        self.path = path
+        self.paranoid = paranoid
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, list] = self._load()
+        self._by_inode: dict[tuple[int, int, int, int], str] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, list]:
+        if not self.path.exists():
+            return {}
+        try:
+            with timing.phase("state", self.path.name, files=1):
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def sha256(self, file_path: Path) -> str:
+        key = str(file_path.absolute())
+        st = file_path.stat()
+        stamp = [st.st_ino, st.st_size, st.st_mtime_ns]
+        inode_key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            cached = self._entries.get(key)
+            linked = self._by_inode.get(inode_key)
+            if linked is not None:
+                self.hits += 1
+                return linked
+            if cached and cached[:3] == stamp and not self.paranoid:
+                self.hits += 1
+                self._by_inode[inode_key] = cached[3]
+                return cached[3]
+
+        digest = file_sha256(file_path)
+        with self._lock:
+            self.misses += 1
+            self._by_inode[inode_key] = digest
+            if time.time_ns() - st.st_mtime_ns > RACY_WINDOW_NS:
+                self._entries[key] = stamp + [digest]
+                self._dirty = True
+            elif key in self._entries:
+                del self._entries[key]
+                self._dirty = True
+        return digest
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        with timing.phase("state", self.path.name, files=1):
+            entries = {key: value for key, value in self._entries.items() if os.path.exists(key)}
+            # A unique temp file per writer: concurrent runs may save the same cache.
+            text = json.dumps({"version": CACHE_VERSION, "entries": entries}, sort_keys=True) + "\n"
+            atomic_write_text(self.path, text)
+        self._dirty = False
@@ -0,0 +1,119 @@
+"""SKILL.md frontmatter parsing.
+
+Only the subset of YAML that skill frontmatter uses is supported: top-level
+``key: value`` pairs whose values are plain or quoted scalars (optionally
+continued on more-indented lines), or folded (``>``) / literal (``|``) block
+scalars with optional chomping (``-``/``+``) and indentation indicators.
+Nested mappings and sequences are skipped.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+_KEY_RE = re.compile(r"^([A-Za-z0-9_-]+):(?:\s+(.*))?$")
+_BLOCK_RE = re.compile(r"^([|>])([+-]?)([1-9]?)([+-]?)\s*(?:#.*)?$")
+
+
+class FrontmatterError(ValueError):
+    """Raised when SKILL.md frontmatter is missing or malformed."""
+
+
+def split_frontmatter(text: str, source: object = "SKILL.md") -> list[str]:
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != "---":
+        raise FrontmatterError(f"{source} is missing YAML frontmatter")
+    for idx in range(1, len(lines)):
+        if lines[idx].strip() == "---":
+            return lines[1:idx]
+    raise FrontmatterError(f"{source} has malformed YAML frontmatter")
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(" "))
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value[1:-1]
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+    return value
+
+
+def _block_scalar(lines: list[str], style: str, chomp: str, indent: int) -> str:
+    if not indent:
+        indent = min((_indent(line) for line in lines if line.strip()), default=0)
+    body = [line[indent:] if line.strip() else "" for line in lines]
+
+    if style == "|":
+        text = "\n".join(body)
+    else:
+        # Folded: single line breaks become spaces, a blank line becomes one
+        # newline, and more-indented lines keep their line breaks.
+        text = ""
+        previous: str | None = None
+        for line in body:
+            if previous is None:
+                text = line
+            elif not line:
+                text += "\n"
+            elif not previous:
+                text += line
+            elif line.startswith(" ") or previous.startswith(" "):
+                text += "\n" + line
+            else:
+                text += " " + line
+            previous = line
+
+    stripped = text.rstrip("\n")
+    if chomp == "-":
+        return stripped
+    if chomp == "+":
+        return text + "\n"
+    return stripped + "\n" if stripped else ""
+
+
+def parse_frontmatter(text: str, source: object = "SKILL.md") -> dict[str, str]:
+    """Return the top-level scalar keys of a SKILL.md frontmatter block."""
+    lines = split_frontmatter(text, source)
+    values: dict[str, str] = {}
+    idx = 0
+    while idx < len(lines):
+        line = lines[idx]
+        match = _KEY_RE.match(line) if line and not line[0].isspace() else None
+        idx += 1
+        if not match:
+            continue
+
+        key, raw = match.group(1), (match.group(2) or "").strip()
+        continuation: list[str] = []
+        while idx < len(lines) and (not lines[idx].strip() or _indent(lines[idx]) > 0):
+            continuation.append(lines[idx])
+            idx += 1
+
+        block = _BLOCK_RE.match(raw)
+        if block:
+            style = block.group(1)
+            chomp = block.group(2) or block.group(4)
+            values[key] = _block_scalar(continuation, style, chomp, int(block.group(3) or 0))
+        elif raw:
+            parts = [raw] + [part.strip() for part in continuation if part.strip()]
+            values[key] = _unquote(" ".join(parts)) if len(parts) > 1 else _unquote(raw)
+        elif not any(part.strip().startswith(("-", "?")) or ":" in part for part in continuation):
+            values[key] = " ".join(part.strip() for part in continuation if part.strip())
+    return values
+
+
+def parse_skill_frontmatter(skill_md: Path) -> tuple[str, str]:
+    values = parse_frontmatter(skill_md.read_text(encoding="utf-8"), skill_md)
+    name = values.get("name", "").strip()
+    if not name:
+        raise FrontmatterError(f"{skill_md} frontmatter must include `name`")
+    return name, values.get("description", "").strip()
+
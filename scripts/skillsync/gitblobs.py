@@ -0,0 +1,81 @@
+"""Validation by git blob id, for ``--validate --git-index``.
+
+Git already records a content id for every tracked file. For source files
+whose working copy matches the index (``git ls-files -s`` minus what
+``git status`` reports as modified), that id is taken as-is and the file is
+never read. On the generated side, the sync manifest records the blob id of
+every file it wrote, which stands as long as the file still has the size and
+mtime it was written with. Only a side with no known id is read, and it is
+hashed blob-style so the ids can be compared.
+
+Index ids describe content after eol conversion and clean filters, so two ids
+that differ are confirmed by hashing both files' raw bytes before a change is
+reported.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Callable, Iterable
+
+from skillsync import timing
+from skillsync.gitdiff import clean_blob_ids, object_format, toplevel
+from skillsync.manifest import HASH_CHUNK_SIZE, blob_hasher, load_manifest
+from skillsync.treediff import TreeFile, same_metadata
+
+
+def file_blob_id(path: str, algorithm: str = "sha1") -> str:
+    with timing.phase("hash", os.path.basename(path), files=1) as event, open(path, "rb") as fh:
+        h = blob_hasher(os.fstat(fh.fileno()).st_size, algorithm)
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+            event.bytes += len(chunk)
+    return h.hexdigest()
+
+
+class GitBlobs:
+    """The index blob ids of the clean tracked files under ``directories``, read with one git call each."""
+
+    def __init__(self, root: Path, directories: Iterable[Path]) -> None:
+        self.top = toplevel(root)
+        self.algorithm = object_format(self.top)
+        prefixes = [prefix for prefix in map(self._prefix, directories) if prefix is not None]
+        with timing.phase("state", "git index"):
+            self.ids = clean_blob_ids(self.top, prefixes)
+
+    def _prefix(self, directory: Path) -> str | None:
+        try:
+            return directory.resolve().relative_to(self.top).as_posix()
+        except ValueError:
+            return None
+
+    def comparer(
+        self, source_dir: Path, dest_dir: Path, manifest_file: Path, hasher: Callable[[Path], str]
+    ) -> Callable[[TreeFile, TreeFile], bool]:
+        """A ``diff_trees`` comparison of ``source_dir`` against the generated ``dest_dir``."""
+        prefix = self._prefix(source_dir)
+        ids = self.ids if prefix is not None else {}
+        prefix = "" if prefix in (None, ".") else prefix + "/"
+        # Manifests record sha1 blob ids only.
+        entries = load_manifest(manifest_file, dest_dir) if self.algorithm == "sha1" else {}
+
+        def same(left: TreeFile, right: TreeFile) -> bool:
+            decided = same_metadata(left, right)
+            if decided is not None:
+                return decided
+            source_id = ids.get(prefix + left.rel)
+            entry = entries.get(right.rel)
+            dest_id = None
+            if entry and (entry["size"], entry["mtime_ns"]) == (right.stat.st_size, right.stat.st_mtime_ns):
+                dest_id = entry.get("blob_sha1")
+            if source_id is not None or dest_id is not None:
+                if source_id is None:
+                    source_id = file_blob_id(left.path, self.algorithm)
+                if dest_id is None:
+                    dest_id = file_blob_id(right.path, self.algorithm)
+                if source_id == dest_id:
+                    return True
+            return hasher(Path(left.path)) == hasher(Path(right.path))
+
+        return same
@@ -0,0 +1,128 @@
+"""Ask git which source paths changed (``--since`` / ``--staged``) and what the index knows about them."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from typing import Iterable
+
+
+# Index modes of entries that are not regular files: symlinks and submodules.
+SPECIAL_MODES = {"120000", "160000"}
+
+
+class GitError(RuntimeError):
+    """Raised when a git command fails (bad revision, not a repository, ...)."""
+
+
+def _git(root: Path, *args: str, allowed: tuple[int, ...] = (0,)) -> str:
+    try:
+        proc = subprocess.run(["git", "-C", str(root), *args], capture_output=True, text=True)
+    except FileNotFoundError as exc:
+        raise GitError("git executable not found") from exc
+    if proc.returncode not in allowed:
+        raise GitError(proc.stderr.strip() or f"git {' '.join(args)} exited with {proc.returncode}")
+    return proc.stdout
+
+
+def submodule_paths(root: Path) -> set[str]:
+    """Paths of the submodules declared in ``.gitmodules`` (they are not skill sources)."""
+    if not (root / ".gitmodules").exists():
+        return set()
+    # Exit status 1 just means no submodule has a path entry.
+    out = _git(root, "config", "--file", ".gitmodules", "--get-regexp", r"^submodule\..*\.path$", allowed=(0, 1))
+    return {line.split(None, 1)[1] for line in out.splitlines() if " " in line}
+
+
+def changed_paths(root: Path, since: str | None = None, staged: bool = False) -> list[str]:
+    """Repo-relative paths changed since ``since`` (or staged in the index), submodules excluded.
+
+    ``since`` is anything ``git diff`` accepts: a single revision compares it
+    with the working tree (or the index with ``staged``), ``A..B`` / ``A...B``
+    compare commits.
+    """
+    args = ["diff", "--name-only", "-z", "--no-renames", "--relative"]
+    if staged:
+        args.append("--cached")
+    if since:
+        args.append(since)
+    args.append("--")
+    submodules = submodule_paths(root)
+    paths = []
+    for path in _git(root, *args).split("\0"):
+        if not path or any(path == sub or path.startswith(sub + "/") for sub in submodules):
+            continue
+        paths.append(path)
+    return paths
+
+
+def push_ranges(root: Path, updates: Iterable[str], base: str = "origin/master") -> list[str]:
+    """``git diff`` revisions covering the ref updates a pre-push hook receives on stdin.
+
+    Each update line is ``<local ref> <local oid> <remote ref> <remote oid>``.
+    Deletions are skipped. A new branch is compared from its merge base
+    with ``base``, or as a single revision when there is none.
+    """
+    revisions: list[str] = []
+    for line in updates:
+        fields = line.split()
+        if len(fields) != 4:
+            continue
+        local_oid, remote_oid = fields[1], fields[3]
+        if not local_oid.strip("0"):
+            continue
+        if remote_oid.strip("0"):
+            revisions.append(f"{remote_oid}..{local_oid}")
+            continue
+        try:
+            merge_base = _git(root, "merge-base", base, local_oid).strip()
+        except GitError:
+            merge_base = ""
+        revisions.append(f"{merge_base}..{local_oid}" if merge_base else local_oid)
+    return revisions
+
+
+def toplevel(root: Path) -> Path:
+    return Path(_git(root, "rev-parse", "--show-toplevel").strip()).resolve()
+
+
+def object_format(root: Path) -> str:
+    """Hash algorithm of the repository's object ids: "sha1" or "sha256"."""
+    out = _git(root, "rev-parse", "--show-object-format").strip()
+    # Git before 2.29 does not know the option and echoes it back.
+    return out if out in ("sha1", "sha256") else "sha1"
+
+
+def clean_blob_ids(top: Path, pathspecs: list[str]) -> dict[str, str]:
+    """Index blob ids of the regular files under ``pathspecs`` whose working copy matches the index.
+
+    Keys are paths relative to the repository top level ``top``. Files
+    modified in the working tree, conflicted or untracked are left out.
+    """
+    if not pathspecs:
+        return {}
+    ids: dict[str, str] = {}
+    conflicted: set[str] = set()
+    for record in _git(top, "ls-files", "-s", "-z", "--", *pathspecs).split("\0"):
+        if not record:
+            continue
+        info, path = record.split("\t", 1)
+        mode, oid, stage = info.split()
+        if stage != "0":
+            conflicted.add(path)
+        elif mode not in SPECIAL_MODES:
+            ids[path] = oid
+
+    records = iter(_git(top, "status", "--porcelain", "-z", "--untracked-files=no", "--", *pathspecs).split("\0"))
+    for record in records:
+        if not record:
+            continue
+        status, path = record[:2], record[3:]
+        if status[0] in "RC":
+            # Renames and copies are followed by their original path.
+            next(records, None)
+        if status[1] != " ":
+            ids.pop(path, None)
+    for path in conflicted:
+        ids.pop(path, None)
+    return ids
@@ -0,0 +1,120 @@
+"""Conditional HTTP downloads with a local response cache.
+
+``ResponseCache.fetch(url)`` keeps the last body received for each URL in
+``<root>/<key>.body`` with its ETag in ``<key>.json``, and revalidates it
+with ``If-None-Match``: an unchanged resource costs one 304 and no body.
+Gzip-encoded responses are decoded as they are written. A download that
+breaks off leaves a ``.part`` file, which the next fetch resumes with a
+``Range`` request guarded by ``If-Range``. If the resource changed in
+between, the server sends it whole instead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import urllib.error
+import urllib.request
+import zlib
+from pathlib import Path
+
+from skillsync import timing
+from skillsync.manifest import HASH_CHUNK_SIZE
+from skillsync.publish import atomic_write_text
+
+FETCH_TIMEOUT = 30.0
+USER_AGENT = "skillsync-installer/1"
+
+
+class FetchError(RuntimeError):
+    """Raised when a URL cannot be fetched and no usable cached copy exists."""
+
+
+class ResponseCache:
+    def __init__(self, root: Path, timeout: float = FETCH_TIMEOUT) -> None:
+        self.root = root
+        self.timeout = timeout
+
+    def _paths(self, url: str) -> tuple[Path, Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+        return self.root / f"{key}.body", self.root / f"{key}.json", self.root / f"{key}.part"
+
+    def _meta(self, meta_path: Path) -> dict:
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def cached(self, url: str) -> Path | None:
+        """The last body stored for ``url``, without revalidating it."""
+        body, meta_path, _ = self._paths(url)
+        return body if body.exists() and self._meta(meta_path).get("url") == url else None
+
+    def fetch(self, url: str) -> Path:
+        """Revalidate or download ``url`` and return the path of its current body."""
+        body, meta_path, part = self._paths(url)
+        meta = self._meta(meta_path)
+        headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip"}
+        if body.exists() and meta.get("url") == url and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        offset = part.stat().st_size if part.exists() and meta.get("partial_etag") else 0
+        if offset:
+            # Ranges apply to the encoded bytes, so a resumed download asks for the identity encoding.
+            headers.update(
+                {"Range": f"bytes={offset}-", "If-Range": meta["partial_etag"], "Accept-Encoding": "identity"}
+            )
+
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304:
+                return body
+            if exc.code == 416 and offset:
+                # The partial file no longer fits the resource; start over.
+                part.unlink(missing_ok=True)
+                self._write_meta(meta_path, {**meta, "partial_etag": None})
+                return self.fetch(url)
+            raise FetchError(f"{url}: HTTP {exc.code} {exc.reason}") from exc
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as exc:
+            raise FetchError(f"{url}: {exc}") from exc
+
+        with response, timing.phase("fetch", url.rsplit("/", 1)[-1], files=1) as event:
+            etag = response.headers.get("ETag")
+            encoding = (response.headers.get("Content-Encoding") or "identity").lower()
+            resumed = response.status == 206 and offset > 0 and self._resumes_at(response, offset)
+            if response.status == 206 and not resumed:
+                raise FetchError(f"{url}: unexpected partial response {response.headers.get('Content-Range')}")
+            self.root.mkdir(parents=True, exist_ok=True)
+            # Only identity downloads can be resumed by byte offset.
+            self._write_meta(meta_path, {**meta, "partial_etag": etag if encoding == "identity" else None})
+            decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == "gzip" else None
+            try:
+                with part.open("ab" if resumed else "wb") as fh:
+                    for chunk in iter(lambda: response.read(HASH_CHUNK_SIZE), b""):
+                        event.bytes += len(chunk)
+                        fh.write(decoder.decompress(chunk) if decoder else chunk)
+                    if decoder:
+                        fh.write(decoder.flush())
+            except (OSError, http.client.HTTPException, zlib.error) as exc:
+                raise FetchError(f"{url}: download interrupted ({exc}); the next fetch resumes it") from exc
+        os.replace(part, body)
+        self._write_meta(meta_path, {"url": url, "etag": etag, "partial_etag": None})
+        return body
+
+    def _resumes_at(self, response, offset: int) -> bool:
+        content_range = response.headers.get("Content-Range", "")
+        return content_range.startswith(f"bytes {offset}-")
+
+    def _write_meta(self, meta_path: Path, meta: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(meta_path, json.dumps(meta, sort_keys=True) + "\n")
+
+    def fetch_json(self, url: str) -> dict:
+        path = self.fetch(url)
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as exc:
+            raise FetchError(f"{url}: {exc}") from exc
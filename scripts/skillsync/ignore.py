@@ -0,0 +1,168 @@
+"""gitignore-style ``.skillignore`` rules.
+
+A ``.skillignore`` at the repo root applies to every skill, with paths
+relative to the repo root as in a root ``.gitignore``. A ``.skillignore``
+in a skill root applies to that skill only, with paths relative to the skill
+root, and takes precedence over the repo-level file. The usual gitignore
+syntax is supported: ``#`` comments, ``!`` negation, a trailing ``/`` for
+directories only, a leading or inner ``/`` to anchor a pattern, ``*``,
+``?``, ``[...]`` and ``**``. The last matching pattern wins. As in git, a
+file inside an ignored directory stays ignored even if a later pattern
+re-includes it.
+
+Each file is compiled once per content (cached by path, size and mtime).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+IGNORE_FILE = ".skillignore"
+
+
+@dataclass(frozen=True)
+class _Pattern:
+    regex: re.Pattern
+    negated: bool
+    dir_only: bool
+
+
+def _translate(glob: str) -> str:
+    """Regex for one gitignore glob (without its anchor, negation or trailing slash)."""
+    parts: list[str] = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i) and (i == 0 or glob[i - 1] == "/"):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i) and i + 2 == len(glob) and (i == 0 or glob[i - 1] == "/"):
+            parts.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif glob[i] == "[":
+            start = i + 1
+            if glob.startswith("!", start):
+                start += 1
+            if glob.startswith("]", start):
+                start += 1
+            end = glob.find("]", start)
+            if end < 0:
+                parts.append(re.escape("["))
+                i += 1
+                continue
+            body = glob[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            i = end + 1
+        elif glob[i] == "\\" and i + 1 < len(glob):
+            parts.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(glob[i]))
+            i += 1
+    return "".join(parts)
+
+
+def compile_pattern(line: str) -> _Pattern | None:
+    """Compile one ``.skillignore`` line; ``None`` for blanks and comments."""
+    line = line.rstrip("\n")
+    if not line.endswith("\\ "):
+        line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    prefix = "" if anchored else "(?:.*/)?"
+    return _Pattern(re.compile(f"^{prefix}{_translate(line)}$"), negated, dir_only)
+
+
+class IgnoreRules:
+    """The compiled patterns of one ignore file."""
+
+    def __init__(self, patterns: list[_Pattern], digest: str = "") -> None:
+        self.patterns = patterns
+        # Identifies the rule text, so caches built under other rules can be dropped.
+        self.digest = digest
+
+    @classmethod
+    def parse(cls, text: str) -> IgnoreRules:
+        patterns = [pattern for pattern in map(compile_pattern, text.splitlines()) if pattern is not None]
+        return cls(patterns, hashlib.sha256(text.encode("utf-8")).hexdigest() if patterns else "")
+
+    def match(self, rel: str, is_dir: bool) -> bool | None:
+        """True if ``rel`` is ignored, False if re-included, None if no pattern matches it."""
+        result = None
+        for pattern in self.patterns:
+            if pattern.dir_only and not is_dir:
+                continue
+            if pattern.regex.match(rel):
+                result = not pattern.negated
+        return result
+
+
+EMPTY_RULES = IgnoreRules([])
+
+
+@lru_cache(maxsize=256)
+def _load(path: str, size: int, mtime_ns: int) -> IgnoreRules:
+    with open(path, encoding="utf-8") as fh:
+        return IgnoreRules.parse(fh.read())
+
+
+def load_rules(directory: Path) -> IgnoreRules:
+    """The rules of ``directory/.skillignore`` (empty when there is none)."""
+    path = os.path.join(directory, IGNORE_FILE)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return EMPTY_RULES
+    return _load(path, st.st_size, st.st_mtime_ns)
+
+
+class SkillIgnore:
+    """Decides which paths of one skill root are left out of generated trees.
+
+    ``prefix`` is the skill root relative to the repo root (``None`` when
+    the skill lives outside the repo, so repo-level rules do not apply).
+    """
+
+    def __init__(self, repo_rules: IgnoreRules, prefix: str | None, skill_rules: IgnoreRules) -> None:
+        self.repo_rules = repo_rules if prefix is not None else EMPTY_RULES
+        self.prefix = prefix
+        self.skill_rules = skill_rules
+
+    def match(self, rel: str, is_dir: bool) -> bool:
+        """Whether ``rel`` itself is ignored, assuming its parent dirs are not."""
+        if rel == IGNORE_FILE:
+            # The skill's own rules are never shipped.
+            return True
+        result = self.skill_rules.match(rel, is_dir)
+        if result is None and self.repo_rules.patterns:
+            result = self.repo_rules.match(f"{self.prefix}/{rel}", is_dir)
+        return bool(result)
+
+    def ignored(self, rel: str) -> bool:
+        """Whether the file ``rel`` is ignored, itself or through one of its parent dirs."""
+        parts = rel.split("/")
+        for depth in range(1, len(parts)):
+            if self.match("/".join(parts[:depth]), True):
+                return True
+        return self.match(rel, False)
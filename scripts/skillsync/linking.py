@@ -0,0 +1,120 @@
+"""Materialize files into generated trees by copy, hardlink, reflink or symlink.
+
+``store`` hardlinks files to objects in a content-addressed store (see
+``skillsync.store``) so identical content is kept on disk once. ``auto``
+tries the cheapest strategy first (a copy-on-write reflink, then a
+hardlink) and remembers which strategies failed for a destination, so a tree
+on another device falls back to a plain copy after a single failed attempt.
+"""
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from skillsync import timing
+
+if TYPE_CHECKING:
+    from skillsync.store import ObjectStore
+
+LINK_MODES = ("copy", "hardlink", "reflink", "symlink", "store", "auto")
+AUTO_CANDIDATES = ("reflink", "hardlink")
+
+# Linux FICLONE ioctl: share extents between two files on btrfs/xfs/etc.
+FICLONE = 0x40049409
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def reflink_file(src: Path, dest: Path) -> None:
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink is not supported on this platform", str(dest))
+    try:
+        with src.open("rb") as src_fh, dest.open("wb") as dest_fh:
+            fcntl.ioctl(dest_fh.fileno(), FICLONE, src_fh.fileno())
+    except OSError:
+        dest.unlink(missing_ok=True)
+        raise
+    shutil.copystat(src, dest)
+
+
+def _place(mode: str, src: Path, dest: Path) -> None:
+    if mode == "copy":
+        shutil.copy2(src, dest)
+    elif mode == "hardlink":
+        os.link(src, dest)
+    elif mode == "symlink":
+        os.symlink(src.resolve(), dest)
+    elif mode == "reflink":
+        reflink_file(src, dest)
+    else:
+        raise ValueError(f"unknown link mode: {mode}")
+
+
+class Materializer:
+    """Places source files into one destination tree using a fixed link mode."""
+
+    def __init__(self, mode: str = "copy", store: ObjectStore | None = None) -> None:
+        if mode not in LINK_MODES:
+            raise ValueError(f"unknown link mode: {mode}")
+        if mode == "store" and store is None:
+            raise ValueError("link mode 'store' needs an object store")
+        self.mode = mode
+        self.store = store
+        self._unsupported: set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def copies(self) -> bool:
+        """True when files are always written as independent copies."""
+        return self.mode == "copy"
+
+    def place(self, src: Path, dest: Path, digest: str | None = None) -> str:
+        """Materialize ``src`` at ``dest`` (replacing it) and return the mode actually used.
+
+        ``digest`` is the sha256 of ``src`` when the caller already knows it.
+        """
+        with timing.phase("copy", dest.name, files=1) as event:
+            mode = self._place(src, dest, digest)
+            if timing.enabled():
+                event.label = f"{mode} {dest.name}"
+                event.bytes = src.stat().st_size
+        return mode
+
+    def _place(self, src: Path, dest: Path, digest: str | None) -> str:
+        if dest.is_symlink() or dest.is_file():
+            dest.unlink()
+        elif dest.is_dir():
+            shutil.rmtree(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.mode == "store":
+            self.store.link(src, dest, digest)
+            return self.mode
+        if self.mode != "auto":
+            _place(self.mode, src, dest)
+            return self.mode
+
+        for candidate in AUTO_CANDIDATES:
+            with self._lock:
+                if candidate in self._unsupported:
+                    continue
+            try:
+                _place(candidate, src, dest)
+                return candidate
+            except OSError:
+                with self._lock:
+                    self._unsupported.add(candidate)
+        shutil.copy2(src, dest)
+        return "copy"
+
+    def copytree(self, src: Path, dest: Path, ignore=None) -> None:
+        """``shutil.copytree`` replacement that materializes files with this mode."""
+        shutil.copytree(src, dest, ignore=ignore, copy_function=lambda s, d: self.place(Path(s), Path(d)))
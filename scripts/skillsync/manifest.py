@@ -0,0 +1,347 @@
+"""Incremental tree sync backed by a persistent per-destination manifest.
+
+Each destination directory gets a manifest recording, for every file that was
+synced into it, the source ``size``, ``mtime_ns`` and ``sha256``, plus the
+git blob id (``blob_sha1``) that lets validation compare against the git
+index without reading either side (see ``skillsync.gitblobs``). On the next
+run only files whose stat fingerprint moved are rehashed, only files whose
+content actually changed are copied, and files that disappeared from the
+source are deleted from the destination. Untouched files keep their mtime so
+downstream watchers are not invalidated, and changed destinations are
+published as a new generation (see ``skillsync.publish``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence
+
+from skillsync import timing
+from skillsync.linking import Materializer
+from skillsync.publish import atomic_write_text, new_staging, publish
+
+if TYPE_CHECKING:
+    from skillsync.ignore import SkillIgnore
+    from skillsync.store import ObjectStore
+
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+# Files up to this size are read into memory once and written to every destination.
+FANOUT_BUFFER_LIMIT = 8 * 1024 * 1024
+
+
+@dataclass
+class SyncResult:
+    copied: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.copied or self.removed)
+
+    def summary(self) -> str:
+        return f"{len(self.copied)} copied, {len(self.removed)} removed, {self.unchanged} unchanged"
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with timing.phase("hash", path.name, files=1) as event, path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+            event.bytes += len(chunk)
+    return h.hexdigest()
+
+
+def blob_hasher(size: int, algorithm: str = "sha1"):
+    """A hash object primed with the git blob header for ``size`` bytes of content."""
+    return hashlib.new(algorithm, b"blob %d\0" % size)
+
+
+def blob_sha1(data: bytes) -> str:
+    """Git blob id (sha1 object format) of ``data``."""
+    h = blob_hasher(len(data))
+    h.update(data)
+    return h.hexdigest()
+
+
+def file_digests(path: Path) -> tuple[str, str]:
+    """sha256 and git blob id of ``path`` from a single read."""
+    h = hashlib.sha256()
+    with timing.phase("hash", path.name, files=1) as event, path.open("rb") as fh:
+        blob = blob_hasher(os.fstat(fh.fileno()).st_size)
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+            blob.update(chunk)
+            event.bytes += len(chunk)
+    return h.hexdigest(), blob.hexdigest()
+
+
+def iter_tree_files(
+    base: Path, excluded: Iterable[str], ignore: SkillIgnore | None = None
+) -> Iterator[tuple[str, Path]]:
+    """Yield ``(relative posix path, absolute path)`` for files under ``base`` in sorted order.
+
+    Names in ``excluded`` and paths matched by ``ignore`` are skipped;
+    ignored directories are not descended into.
+    """
+    excluded = set(excluded)
+    for root, dirs, files in os.walk(base):
+        root_path = Path(root)
+        prefix = root_path.relative_to(base).as_posix() + "/" if root_path != base else ""
+        dirs[:] = sorted(
+            d for d in dirs if d not in excluded and not (ignore and ignore.match(prefix + d, True))
+        )
+        for name in sorted(files):
+            if name in excluded or (ignore and ignore.match(prefix + name, False)):
+                continue
+            yield prefix + name, root_path / name
+
+
+def _logical_path(dest_dir: Path) -> str:
+    # Not resolve(): published destinations are symlinks that move between generations.
+    return os.path.abspath(dest_dir)
+
+
+def manifest_path(state_dir: Path, dest_dir: Path) -> Path:
+    key = hashlib.sha256(_logical_path(dest_dir).encode("utf-8")).hexdigest()[:16]
+    return state_dir / "manifests" / f"{dest_dir.name}-{key}.json"
+
+
+def read_manifest(path: Path, dest_dir: Path) -> dict | None:
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if data.get("version") != MANIFEST_VERSION or data.get("destination") != _logical_path(dest_dir):
+        return None
+    return data
+
+
+def load_manifest(path: Path, dest_dir: Path) -> dict[str, dict]:
+    data = read_manifest(path, dest_dir)
+    return data.get("files", {}) if data else {}
+
+
+def save_manifest(
+    path: Path, source_dir: Path, dest_dir: Path, files: dict[str, dict], link_mode: str = "copy"
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "version": MANIFEST_VERSION,
+        "source": str(source_dir.resolve()),
+        "destination": _logical_path(dest_dir),
+        "link_mode": link_mode,
+        "files": files,
+    }
+    with timing.phase("state", path.name, files=1):
+        atomic_write_text(path, json.dumps(data, indent=1, sort_keys=True) + "\n")
+
+
+def prune_empty_dirs(dest_dir: Path, rel_paths: Iterable[str]) -> None:
+    parents = {(dest_dir / rel).parent for rel in rel_paths}
+    for parent in sorted(parents, key=lambda p: len(p.parts), reverse=True):
+        while parent != dest_dir and parent.is_dir() and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+
+
+def _same_size_file(path: Path, size: int) -> bool:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return False
+    return path.is_file() and st.st_size == size
+
+
+def _read_source(src: Path, size: int) -> tuple[str, str, bytes | None]:
+    """Hash ``src`` in one pass, keeping its bytes when small enough to fan out from memory."""
+    if size > FANOUT_BUFFER_LIMIT:
+        return (*file_digests(src), None)
+    with timing.phase("hash", src.name, files=1, nbytes=size):
+        data = src.read_bytes()
+        return hashlib.sha256(data).hexdigest(), blob_sha1(data), data
+
+
+def _write_copies(src: Path, data: bytes | None, dests: list[Path]) -> tuple[str, str]:
+    """Write ``src`` to every path in ``dests`` from a single read and return its sha256 and blob id."""
+    for dest in dests:
+        # Unlink first so a hardlinked or symlinked destination never writes through to its source.
+        if dest.is_dir() and not dest.is_symlink():
+            shutil.rmtree(dest)
+        else:
+            dest.unlink(missing_ok=True)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+    with timing.phase("copy", src.name, files=len(dests)) as event:
+        if data is not None:
+            for dest in dests:
+                dest.write_bytes(data)
+            event.bytes = len(data) * len(dests)
+            digests = hashlib.sha256(data).hexdigest(), blob_sha1(data)
+        else:
+            h = hashlib.sha256()
+            handles = [dest.open("wb") for dest in dests]
+            try:
+                with src.open("rb") as fh:
+                    blob = blob_hasher(os.fstat(fh.fileno()).st_size)
+                    for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+                        h.update(chunk)
+                        blob.update(chunk)
+                        for handle in handles:
+                            handle.write(chunk)
+                        event.bytes += len(chunk) * len(handles)
+            finally:
+                for handle in handles:
+                    handle.close()
+            digests = h.hexdigest(), blob.hexdigest()
+
+        for dest in dests:
+            shutil.copystat(src, dest)
+    return digests
+
+
+@dataclass
+class _DestinationState:
+    dest_dir: Path
+    manifest_file: Path
+    previous: dict[str, dict]
+    materializer: Materializer
+    rebuild: bool = False
+    staging: Path | None = None
+    current: dict[str, dict] = field(default_factory=dict)
+    result: SyncResult = field(default_factory=SyncResult)
+
+    def write_dir(self) -> Path:
+        """Staging dir for the next generation, created on the first write."""
+        if self.staging is None:
+            self.staging = new_staging(self.dest_dir, clone=not self.rebuild)
+        return self.staging
+
+
+def sync_tree(
+    source_dir: Path,
+    dest_dir: Path,
+    manifest_file: Path,
+    excluded: Iterable[str],
+    full: bool = False,
+    link_mode: str = "copy",
+    store: ObjectStore | None = None,
+    ignore: SkillIgnore | None = None,
+) -> SyncResult:
+    """Make ``dest_dir`` mirror ``source_dir``, touching only files that changed."""
+    return sync_tree_fanout(
+        source_dir,
+        [(dest_dir, manifest_file)],
+        excluded,
+        full=full,
+        link_mode=link_mode,
+        store=store,
+        ignore=ignore,
+    )[0]
+
+
+def sync_tree_fanout(
+    source_dir: Path,
+    destinations: Sequence[tuple[Path, Path]],
+    excluded: Iterable[str],
+    full: bool = False,
+    link_mode: str = "copy",
+    store: ObjectStore | None = None,
+    ignore: SkillIgnore | None = None,
+) -> list[SyncResult]:
+    """Mirror ``source_dir`` into every ``(dest_dir, manifest_file)`` pair.
+
+    The source tree is walked once and each source file is read and hashed at
+    most once, no matter how many destinations need it. Changes are written to
+    a staging generation (a hardlink clone of the published tree) and
+    published atomically, so readers never see a half-synced destination;
+    destinations with no changes are left untouched. With ``full=True``, or
+    when a destination was last synced with a different ``link_mode``, the
+    new generation is built from scratch. When a destination has no manifest
+    yet, its files are compared by content so the first incremental run after
+    a full sync does not rewrite everything. ``store`` is the object store
+    used by ``link_mode="store"``. Source files matched by ``ignore`` are
+    left out, and removed from destinations that still have them.
+    """
+    excluded = set(excluded)
+    states: list[_DestinationState] = []
+    for dest_dir, manifest_file in destinations:
+        data = read_manifest(manifest_file, dest_dir) if dest_dir.exists() else None
+        rebuild = full or bool(data and data.get("link_mode", "copy") != link_mode)
+        previous = data.get("files", {}) if data and not rebuild else {}
+        states.append(_DestinationState(dest_dir, manifest_file, previous, Materializer(link_mode, store), rebuild))
+
+    for rel, src in iter_tree_files(source_dir, excluded, ignore):
+        st = src.stat()
+        verify: list[tuple[_DestinationState, Path, dict | None]] = []
+        pending: list[_DestinationState] = []
+        for state in states:
+            dest = state.dest_dir / rel
+            old = state.previous.get(rel)
+            if state.rebuild or not _same_size_file(dest, st.st_size):
+                pending.append(state)
+            elif old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                state.current[rel] = old
+                state.result.unchanged += 1
+            else:
+                verify.append((state, dest, old))
+
+        if not verify and not pending:
+            continue
+
+        digest: str | None = None
+        blob: str | None = None
+        data: bytes | None = None
+        if verify or st.st_size <= FANOUT_BUFFER_LIMIT:
+            digest, blob, data = _read_source(src, st.st_size)
+        for state, dest, old in verify:
+            if (old["sha256"] if old else file_sha256(dest)) == digest:
+                state.result.unchanged += 1
+                state.current[rel] = {
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "sha256": digest,
+                    "blob_sha1": blob,
+                }
+            else:
+                pending.append(state)
+
+        copies = [state.write_dir() / rel for state in pending if state.materializer.copies]
+        if copies:
+            digest, blob = _write_copies(src, data, copies)
+        elif pending and digest is None:
+            digest, blob = file_digests(src)
+        for state in pending:
+            if not state.materializer.copies:
+                state.materializer.place(src, state.write_dir() / rel, digest)
+            state.result.copied.append(rel)
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest, "blob_sha1": blob}
+        for state in pending:
+            state.current[rel] = entry
+
+    for state in states:
+        if state.rebuild or not state.dest_dir.exists():
+            stale = []
+        elif state.previous:
+            stale = sorted(set(state.previous) - set(state.current))
+        else:
+            stale = sorted(rel for rel, _ in iter_tree_files(state.dest_dir, ()) if rel not in state.current)
+        for rel in stale:
+            (state.write_dir() / rel).unlink(missing_ok=True)
+            state.result.removed.append(rel)
+        if stale:
+            prune_empty_dirs(state.write_dir(), stale)
+
+        if state.staging is not None or not state.dest_dir.exists():
+            publish(state.write_dir(), state.dest_dir)
+        if state.current != state.previous:
+            save_manifest(state.manifest_file, source_dir, state.dest_dir, state.current, link_mode)
+    return [state.result for state in states]
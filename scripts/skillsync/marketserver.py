@@ -0,0 +1,271 @@
+"""HTTP server for the local marketplace (``serve_marketplace.py``).
+
+Serves, read-only, from the marketplace root:
+
+- ``/marketplace.json``: the root registry (``.claude-plugin/marketplace.json``)
+- ``/bundles/<name>.zip``: plugin bundles built by ``sync_marketplace.py --bundle``
+- ``/plugins/<name>/...``: the files of each generated plugin tree
+
+Every response carries a strong ETag derived from its content: a bundle's
+plugin content digest (read from its index), or the sha256 of any other
+file. ETags are cached in memory by path, size and mtime, so an unchanged
+file is hashed once per server run. ``If-None-Match`` is answered with 304,
+a single ``Range`` (honouring ``If-Range``) with 206, and text responses
+are gzip-encoded when the client accepts it and asked for no range. The
+gzip variant has its own ETag, and both variants count as a match for
+``If-None-Match``.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import re
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from skillsync import timing
+from skillsync.bundle import BUNDLE_SUFFIX, BundleError, read_index
+from skillsync.manifest import HASH_CHUNK_SIZE, file_sha256
+
+REGISTRY_PATH = ".claude-plugin/marketplace.json"
+# Content types by suffix; anything else is served as application/octet-stream.
+CONTENT_TYPES = {
+    ".json": "application/json",
+    ".md": "text/markdown; charset=utf-8",
+    ".txt": "text/plain; charset=utf-8",
+    ".py": "text/x-python; charset=utf-8",
+    ".sh": "text/x-shellscript; charset=utf-8",
+    ".yaml": "application/yaml",
+    ".yml": "application/yaml",
+    ".csv": "text/csv; charset=utf-8",
+    ".html": "text/html; charset=utf-8",
+    BUNDLE_SUFFIX: "application/zip",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+}
+COMPRESSIBLE = ("text/", "application/json", "application/yaml")
+# Smaller bodies are not worth a gzip header.
+GZIP_MIN_SIZE = 256
+# Gzipped bodies are kept in memory up to this size in total.
+GZIP_CACHE_BYTES = 16 * 1024 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """The inclusive ``(first, last)`` byte range of a single-range ``Range`` header.
+
+    Returns None when the header is not a single byte range, which is
+    served as a full response. Raises ValueError when the range cannot be
+    satisfied.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes.
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(header)
+    return start, end
+
+
+def accepts_gzip(header: str) -> bool:
+    for coding in header.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def etag_matches(header: str, tags: tuple[str, ...]) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match.
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return any(tag in candidates for tag in tags)
+
+
+class ContentTags:
+    """Content ETags and gzipped bodies of served files, keyed by path, size and mtime."""
+
+    def __init__(self) -> None:
+        self._etags: dict[str, tuple[int, int, str]] = {}
+        self._gzipped: dict[str, bytes] = {}
+        self._gzipped_bytes = 0
+        self._lock = threading.Lock()
+
+    def etag(self, path: Path, size: int, mtime_ns: int) -> str:
+        key = str(path)
+        with self._lock:
+            cached = self._etags.get(key)
+        if cached and cached[:2] == (size, mtime_ns):
+            return cached[2]
+        digest = None
+        if path.suffix == BUNDLE_SUFFIX:
+            try:
+                # Bundles are byte-identical for equal content, so their digest is a strong validator.
+                digest = read_index(path)["digest"]
+            except BundleError:
+                pass
+        if digest is None:
+            digest = file_sha256(path)
+        tag = f'"{digest}"'
+        with self._lock:
+            self._etags[key] = (size, mtime_ns, tag)
+        return tag
+
+    def gzipped(self, path: Path, etag: str) -> bytes:
+        with self._lock:
+            body = self._gzipped.get(etag)
+        if body is not None:
+            return body
+        with timing.phase("copy", f"gzip {path.name}", files=1) as event:
+            body = gzip.compress(path.read_bytes(), mtime=0)
+            event.bytes = len(body)
+        with self._lock:
+            if self._gzipped_bytes + len(body) > GZIP_CACHE_BYTES:
+                self._gzipped.clear()
+                self._gzipped_bytes = 0
+            self._gzipped[etag] = body
+            self._gzipped_bytes += len(body)
+        return body
+
+
+class MarketplaceHandler(BaseHTTPRequestHandler):
+    server_version = "skillsync-marketplace/1"
+    # Set on the subclass built by ``make_server``.
+    root: Path
+    tags: ContentTags
+    quiet = False
+
+    def do_GET(self) -> None:
+        self.serve(head=False)
+
+    def do_HEAD(self) -> None:
+        self.serve(head=True)
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def resolve(self, url_path: str) -> Path | None:
+        """The file behind ``url_path``, or None when it is not one the marketplace publishes."""
+        parts = [part for part in unquote(url_path).split("/") if part]
+        if parts == ["marketplace.json"]:
+            parts = REGISTRY_PATH.split("/")
+        elif not (
+            (len(parts) == 2 and parts[0] == "bundles" and parts[1].endswith(BUNDLE_SUFFIX))
+            or (len(parts) >= 3 and parts[0] == "plugins")
+        ):
+            return None
+        # Generation dirs, lock and temp files are dot-prefixed; plugin metadata is the one exception.
+        if any(part in ("..", ".") or (part.startswith(".") and part != ".claude-plugin") for part in parts):
+            return None
+        path = self.root.joinpath(*parts)
+        # Containment is checked before symlinks are followed: trees synced with
+        # --link-mode symlink point at the skill sources, outside the root. The
+        # filter above keeps a request from climbing out on its own.
+        if not Path(os.path.normpath(path)).is_relative_to(os.path.normpath(self.root)):
+            return None
+        try:
+            if not path.is_file():
+                return None
+        except OSError:
+            return None
+        return path
+
+    def serve(self, head: bool) -> None:
+        path = self.resolve(urlsplit(self.path).path)
+        if path is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        st = path.stat()
+        etag = self.tags.etag(path, st.st_size, st.st_mtime_ns)
+        content_type = CONTENT_TYPES.get(path.suffix.lower(), "application/octet-stream")
+        compressible = content_type.startswith(COMPRESSIBLE) and st.st_size >= GZIP_MIN_SIZE
+        gzip_etag = f'{etag[:-1]}-gzip"'
+
+        if etag_matches(self.headers.get("If-None-Match", ""), (etag, gzip_etag)):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_validators(compressible)
+            self.end_headers()
+            return
+
+        byte_range = None
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", etag) == etag:
+            try:
+                byte_range = parse_range(range_header, st.st_size)
+            except ValueError:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{st.st_size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        if byte_range is None and compressible and accepts_gzip(self.headers.get("Accept-Encoding", "")):
+            body = self.tags.gzipped(path, etag)
+            self.send_response(HTTPStatus.OK)
+            self.send_header("ETag", gzip_etag)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_body_headers(content_type, len(body), compressible)
+            if not head:
+                self.wfile.write(body)
+            return
+
+        first, last = byte_range or (0, st.st_size - 1)
+        length = last - first + 1
+        if byte_range is None:
+            self.send_response(HTTPStatus.OK)
+        else:
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {first}-{last}/{st.st_size}")
+        self.send_header("ETag", etag)
+        self.send_body_headers(content_type, length, compressible)
+        if head or length <= 0:
+            return
+        with timing.phase("copy", path.name, files=1, nbytes=length), path.open("rb") as fh:
+            fh.seek(first)
+            remaining = length
+            while remaining:
+                chunk = fh.read(min(HASH_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+    def send_validators(self, compressible: bool) -> None:
+        # Clients may cache, but must revalidate every time; the ETag makes that a 304.
+        self.send_header("Cache-Control", "no-cache")
+        if compressible:
+            self.send_header("Vary", "Accept-Encoding")
+
+    def send_body_headers(self, content_type: str, length: int, compressible: bool) -> None:
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_validators(compressible)
+        self.end_headers()
+
+
+def make_server(root: Path, host: str = "127.0.0.1", port: int = 0, quiet: bool = False) -> ThreadingHTTPServer:
+    """A server for the marketplace at ``root``; port 0 picks a free port (see ``server_address``)."""
+    handler = type(
+        "BoundMarketplaceHandler", (MarketplaceHandler,), {"root": root, "tags": ContentTags(), "quiet": quiet}
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
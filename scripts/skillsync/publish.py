@@ -0,0 +1,192 @@
+"""Atomic publish of generated trees and files.
+
+A published directory ``<parent>/<name>`` is a relative symlink to a numbered
+generation under ``<parent>/.<name>.generations/<N>``. A new generation is
+built in ``<N>.staging`` (usually a hardlink clone of the current one, so
+only changed files cost real writes), renamed into place and published by
+``os.replace`` of a fresh symlink over the old one, which is atomic on POSIX:
+readers see either the old tree or the new tree, never a partial one.
+
+Where symlinks cannot be created (e.g. Windows without developer mode) the
+staged tree is swapped in with two renames instead, which shrinks the window
+in which the directory is missing to a single rename.
+
+The current generation and the one before it are kept so readers that
+resolved the previous link a moment ago can finish; older generations,
+retired legacy trees and abandoned staging dirs are reclaimed on publish.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import shutil
+import stat
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from skillsync import timing
+
+KEEP_GENERATIONS = 2
+STALE_STAGING_SECONDS = 3600
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write ``text`` to a temp file next to ``path`` and rename it over ``path``.
+
+    Newlines are translated for the platform, as ``Path.write_text`` does.
+    If ``path`` is a symlink, the file it points to is replaced and the link
+    is kept. An existing file keeps its permissions.
+    """
+    target = Path(os.path.realpath(path))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Not mkstemp: that creates 0600 files, while new files should get the umask default.
+    tmp_name = target.parent / f".{target.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp"
+    fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        try:
+            os.chmod(tmp_name, stat.S_IMODE(os.stat(target).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_name, target)
+    except BaseException:
+        tmp_name.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_json(path: Path, data: dict) -> None:
+    atomic_write_text(path, json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+
+
+def generations_dir(dest: Path) -> Path:
+    return dest.parent / f".{dest.name}.generations"
+
+
+def is_generations_dir(name: str) -> bool:
+    return name.startswith(".") and name.endswith(".generations")
+
+
+def iter_published_files(base: Path, excluded: Iterable[str] = ()) -> Iterator[tuple[str, Path]]:
+    """Yield ``(relative posix path, path)`` for files under ``base`` as readers see them.
+
+    Published subdirectories are followed through their symlinks and the
+    generation dirs behind them are skipped.
+    """
+    excluded = set(excluded)
+    for root, dirs, files in os.walk(base, followlinks=True):
+        dirs[:] = sorted(d for d in dirs if d not in excluded and not is_generations_dir(d))
+        root_path = Path(root)
+        for name in sorted(files):
+            if name not in excluded:
+                file_path = root_path / name
+                yield file_path.relative_to(base).as_posix(), file_path
+
+
+def _generation_number(entry: Path) -> int | None:
+    head = entry.name.split(".", 1)[0]
+    return int(head) if head.isdigit() else None
+
+
+def current_generation(dest: Path) -> Path | None:
+    if not dest.is_symlink():
+        return None
+    target = (dest.parent / os.readlink(dest)).resolve()
+    return target if target.parent == generations_dir(dest).resolve() else None
+
+
+def _clone_file(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst, follow_symlinks=False)
+    except OSError:
+        shutil.copy2(src, dst, follow_symlinks=False)
+
+
+def new_staging(dest: Path, clone: bool = True) -> Path:
+    """Create an empty or cloned staging dir for the next generation of ``dest``."""
+    root = generations_dir(dest)
+    root.mkdir(parents=True, exist_ok=True)
+    numbers = [n for n in (_generation_number(entry) for entry in root.iterdir()) if n is not None]
+    number = max(numbers, default=0) + 1
+    while True:
+        staging = root / f"{number}.staging"
+        try:
+            staging.mkdir()
+            break
+        except FileExistsError:
+            number += 1
+
+    if clone and dest.is_dir():
+        source = current_generation(dest) or dest
+        staging.rmdir()
+        # Hardlinks keep the clone cheap; writers always unlink before writing.
+        with timing.phase("publish", f"clone {dest.name}"):
+            shutil.copytree(source, staging, symlinks=True, copy_function=_clone_file)
+    return staging
+
+
+def publish(staging: Path, dest: Path) -> Path:
+    """Publish ``staging`` as the new contents of ``dest`` and reclaim old generations."""
+    with timing.phase("publish", dest.name):
+        return _publish(staging, dest)
+
+
+def _publish(staging: Path, dest: Path) -> Path:
+    root = generations_dir(dest)
+    number = _generation_number(staging)
+    final = root / str(number)
+    os.rename(staging, final)
+
+    tmp_link = dest.parent / f".{dest.name}.{number}.link"
+    try:
+        os.symlink(os.path.relpath(final, dest.parent), tmp_link, target_is_directory=True)
+    except OSError:
+        # No symlink support: swap the staged tree in with renames.
+        if dest.is_symlink():
+            dest.unlink()
+        elif dest.exists():
+            os.rename(dest, root / f"{number}.retired")
+        os.rename(final, dest)
+    else:
+        if dest.exists() and not dest.is_symlink():
+            # One-time migration of a plain directory to the generation layout.
+            os.rename(dest, root / f"{number}.retired")
+        os.replace(tmp_link, dest)
+
+    reclaim_generations(dest)
+    return dest
+
+
+def reclaim_generations(dest: Path) -> None:
+    root = generations_dir(dest)
+    if not root.is_dir():
+        return
+    current = current_generation(dest)
+    published = sorted(
+        (entry for entry in root.iterdir() if entry.name.isdigit()),
+        key=lambda entry: int(entry.name),
+        reverse=True,
+    )
+    keep = {entry.resolve() for entry in published[:KEEP_GENERATIONS]}
+    if current is not None:
+        keep.add(current)
+
+    now = time.time()
+    for entry in root.iterdir():
+        if entry.resolve() in keep:
+            continue
+        if entry.name.endswith(".staging") and now - entry.stat().st_mtime < STALE_STAGING_SECONDS:
+            continue
+        shutil.rmtree(entry, ignore_errors=True)
+
+
+def remove_published(dest: Path) -> None:
+    """Remove a published directory together with all of its generations."""
+    if dest.is_symlink():
+        dest.unlink()
+    elif dest.exists():
+        shutil.rmtree(dest)
+    shutil.rmtree(generations_dir(dest), ignore_errors=True)
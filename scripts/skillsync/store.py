@@ -0,0 +1,113 @@
+"""Content-addressed object store shared by generated trees.
+
+Every file materialized with ``--link-mode store`` is added once to
+``<store>/<sha[:2]>/<sha[2:]>`` and the generated tree gets a hardlink to
+that object, so identical files across skills, targets and plugin versions
+occupy disk space once, and re-installing unchanged content writes nothing.
+An object whose link count drops back to one is referenced only by the
+store itself and can be pruned.
+
+Hardlinks cannot cross devices, so each store lives next to the trees it
+feeds (``.skill-sync/objects`` for sync, ``<cache>/.objects`` for install);
+a destination on another device falls back to a plain copy.
+"""
+
+from __future__ import annotations
+
+import os
+import secrets
+import shutil
+from pathlib import Path
+from typing import Callable, Iterable
+
+from skillsync.manifest import file_sha256
+from skillsync.publish import is_generations_dir
+
+
+class ObjectStore:
+    def __init__(self, root: Path, hasher: Callable[[Path], str] = file_sha256) -> None:
+        self.root = root
+        self.hasher = hasher
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:]
+
+    def add(self, src: Path, digest: str | None = None) -> Path:
+        """Ensure the content of ``src`` is stored and return its object path."""
+        digest = digest or self.hasher(src)
+        obj = self.object_path(digest)
+        if obj.exists():
+            return obj
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        tmp = obj.parent / f".{obj.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp"
+        shutil.copy2(src, tmp)
+        try:
+            # link() rather than replace() so a concurrent writer's object is never swapped out.
+            os.link(tmp, obj)
+        except FileExistsError:
+            pass
+        finally:
+            tmp.unlink(missing_ok=True)
+        return obj
+
+    def link(self, src: Path, dest: Path, digest: str | None = None) -> None:
+        """Materialize ``src`` at ``dest`` as a hardlink to its object (a copy across devices)."""
+        obj = self.add(src, digest)
+        try:
+            os.link(obj, dest)
+        except OSError:
+            shutil.copy2(obj, dest)
+
+    def objects(self) -> Iterable[Path]:
+        if not self.root.is_dir():
+            return
+        for bucket in sorted(self.root.iterdir()):
+            if bucket.is_dir():
+                yield from (obj for obj in sorted(bucket.iterdir()) if not obj.name.startswith("."))
+
+    def usage(self) -> tuple[int, int]:
+        """``(objects, bytes)`` currently held by the store."""
+        count = size = 0
+        for obj in self.objects():
+            count += 1
+            size += obj.stat().st_size
+        return count, size
+
+    def prune(self) -> tuple[int, int]:
+        """Delete objects no tree links to any more; return ``(objects, bytes)`` removed."""
+        count = size = 0
+        for obj in self.objects():
+            st = obj.stat()
+            if st.st_nlink <= 1:
+                obj.unlink()
+                count += 1
+                size += st.st_size
+        return count, size
+
+
+def tree_usage(roots: Iterable[Path]) -> tuple[int, int, int]:
+    """``(files, logical bytes, physical bytes)`` of the published trees under ``roots``.
+
+    Logical bytes count every file as a reader sees it; physical bytes count
+    each inode once, so hardlinked copies and store objects are not double
+    counted. Generation dirs behind published symlinks are skipped.
+    """
+    seen: set[tuple[int, int]] = set()
+    files = logical = physical = 0
+    for root in roots:
+        if not root.exists():
+            continue
+        for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+            dirnames[:] = [name for name in dirnames if not is_generations_dir(name) and name != ".objects"]
+            for name in filenames:
+                try:
+                    st = os.stat(os.path.join(dirpath, name))
+                except FileNotFoundError:
+                    continue
+                files += 1
+                logical += st.st_size
+                key = (st.st_dev, st.st_ino)
+                if key not in seen:
+                    seen.add(key)
+                    physical += st.st_size
+    return files, logical, physical
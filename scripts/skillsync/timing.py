@@ -0,0 +1,257 @@
+"""Phase timings for the sync and install scripts.
+
+Instrumented code wraps its work in ``phase(name, label)``. Each phase
+records its duration and thread, the skill it ran for (see ``skill``), and
+how many files and bytes it handled. Nothing is recorded until ``enable``
+is called, and until then a phase costs one flag check. On exit the
+recorded phases are printed as a summary table per phase and per skill
+(``--timings``) and/or written as Chrome trace-event JSON (``--trace-out``)
+for chrome://tracing or https://ui.perfetto.dev.
+
+Phase times are inclusive: a phase nested in another (frontmatter parsing
+during discovery, hashing during a skill sync) counts in both. Phases run
+on worker threads add up to more than the wall time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from skillsync.units import format_size
+
+# Summary order; "skill" phases wrap the per-skill work of an entry point.
+PHASES = ("discovery", "fetch", "frontmatter", "parse", "hash", "copy", "publish", "metadata", "registry", "state")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class Event:
+    phase: str
+    label: str
+    skill: str | None
+    thread: int
+    start_ns: int
+    end_ns: int = 0
+    files: int = 0
+    bytes: int = 0
+
+    def __enter__(self) -> Event:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.end_ns = time.perf_counter_ns()
+        _recorder.events.append(self)
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+
+class _Discarded:
+    """Stands in for an ``Event`` while recording is off; attribute writes are dropped."""
+
+    files = bytes = 0
+
+    def __enter__(self) -> _Discarded:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def __setattr__(self, name: str, value) -> None:
+        pass
+
+
+class _SkillScope:
+    def __init__(self, name: str, record: bool = True) -> None:
+        self.name = name
+        self.record = record
+        self.previous: str | None = None
+        self.event: Event | None = None
+
+    def __enter__(self) -> _SkillScope:
+        self.previous = getattr(_recorder.local, "skill", None)
+        _recorder.local.skill = self.name
+        if self.record:
+            self.event = phase("skill", self.name)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.event is not None:
+            self.event.__exit__(*exc_info)
+        _recorder.local.skill = self.previous
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.events: list[Event] = []
+        self.local = threading.local()
+        self.start_ns = 0
+
+
+_recorder = _Recorder()
+_DISCARDED = _Discarded()
+
+
+def enabled() -> bool:
+    return _recorder.enabled
+
+
+def phase(name: str, label: str = "", files: int = 0, nbytes: int = 0) -> Event | _Discarded:
+    """Context manager timing one unit of work; set ``files``/``bytes`` on it as they become known."""
+    if not _recorder.enabled:
+        return _DISCARDED
+    return Event(
+        name,
+        label,
+        getattr(_recorder.local, "skill", None),
+        threading.get_ident(),
+        time.perf_counter_ns(),
+        files=files,
+        bytes=nbytes,
+    )
+
+
+def skill(name: str) -> _SkillScope | _Discarded:
+    """Attribute the phases run inside (on this thread, or via ``bind``) to skill ``name``."""
+    if not _recorder.enabled:
+        return _DISCARDED
+    return _SkillScope(name)
+
+
+def bind(func: Callable[[T], R]) -> Callable[[T], R]:
+    """Wrap ``func`` so phases it runs on a worker thread count for the caller's current skill."""
+    current = getattr(_recorder.local, "skill", None)
+    if not _recorder.enabled or current is None:
+        return func
+
+    def bound(item: T) -> R:
+        with _SkillScope(current, record=False):
+            return func(item)
+
+    return bound
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="On exit, print where time went per phase and per skill (to stderr)",
+    )
+    parser.add_argument(
+        "--trace-out",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="On exit, write phase timings to PATH as Chrome trace-event JSON",
+    )
+
+
+def enable(summary: bool = True, trace_out: Path | None = None) -> None:
+    """Start recording and report at interpreter exit, however the script exits."""
+    if not (summary or trace_out) or _recorder.enabled:
+        return
+    _recorder.enabled = True
+    _recorder.start_ns = time.perf_counter_ns()
+    atexit.register(_report, summary, trace_out)
+
+
+def _report(summary: bool, trace_out: Path | None) -> None:
+    end_ns = time.perf_counter_ns()
+    events = [event for event in _recorder.events if event.end_ns]
+    if trace_out is not None:
+        write_trace(events, trace_out)
+    if summary:
+        print_summary(events, end_ns - _recorder.start_ns)
+
+
+def _ms(ns: int) -> str:
+    return f"{ns / 1e6:.1f} ms"
+
+
+@dataclass
+class _Totals:
+    calls: int = 0
+    files: int = 0
+    bytes: int = 0
+    duration_ns: int = 0
+
+    def add(self, event: Event) -> None:
+        self.calls += 1
+        self.files += event.files
+        self.bytes += event.bytes
+        self.duration_ns += event.duration_ns
+
+
+def print_summary(events: list[Event], wall_ns: int, out=sys.stderr) -> None:
+    phases: dict[str, _Totals] = {}
+    skills: dict[str, dict[str, _Totals]] = {}
+    for event in events:
+        if event.phase == "skill":
+            skills.setdefault(event.label, {}).setdefault("skill", _Totals()).add(event)
+            continue
+        phases.setdefault(event.phase, _Totals()).add(event)
+        if event.skill is not None:
+            skills.setdefault(event.skill, {}).setdefault(event.phase, _Totals()).add(event)
+
+    print(f"\nTimings (wall {_ms(wall_ns)}):", file=out)
+    print(f"  {'phase':<12}{'calls':>8}{'files':>8}{'bytes':>12}{'time':>12}", file=out)
+    for name in sorted(phases, key=lambda name: PHASES.index(name) if name in PHASES else len(PHASES)):
+        totals = phases[name]
+        print(
+            f"  {name:<12}{totals.calls:>8}{totals.files:>8}{format_size(totals.bytes):>12}"
+            f"{_ms(totals.duration_ns):>12}",
+            file=out,
+        )
+
+    if skills:
+        print(f"\n  {'skill':<32}{'time':>12}{'hashed':>22}{'copied':>22}", file=out)
+        ranked = sorted(skills.items(), key=lambda item: -item[1].get("skill", _Totals()).duration_ns)
+        for name, totals in ranked:
+            hashed, copied = totals.get("hash", _Totals()), totals.get("copy", _Totals())
+            print(
+                f"  {name:<32}{_ms(totals.get('skill', _Totals()).duration_ns):>12}"
+                f"{f'{hashed.files} ({format_size(hashed.bytes)})':>22}"
+                f"{f'{copied.files} ({format_size(copied.bytes)})':>22}",
+                file=out,
+            )
+
+
+def write_trace(events: list[Event], path: Path) -> None:
+    """Write ``events`` as Chrome trace-event JSON (complete "X" events, microseconds)."""
+    pid = os.getpid()
+    threads: dict[int, int] = {}
+    trace = []
+    for event in sorted(events, key=lambda event: event.start_ns):
+        tid = threads.setdefault(event.thread, len(threads) + 1)
+        args = {"files": event.files, "bytes": event.bytes}
+        if event.skill is not None:
+            args["skill"] = event.skill
+        trace.append({
+            "name": event.label or event.phase,
+            "cat": event.phase,
+            "ph": "X",
+            "ts": (event.start_ns - _recorder.start_ns) / 1000,
+            "dur": event.duration_ns / 1000,
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        })
+    trace.extend(
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": f"thread {tid}"}}
+        for tid in threads.values()
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"traceEvents": trace, "displayTimeUnit": "ms"}) + "\n", encoding="utf-8")
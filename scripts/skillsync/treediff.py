@@ -0,0 +1,167 @@
+"""Streaming comparison of two file trees.
+
+Both trees are walked with ``os.scandir`` in the same order, each directory
+sorted by name and excluded or ignored directories pruned before they are
+entered. The walks yield files ordered by their path components, so the two
+streams can be merge-joined: a file present on one side only is reported as
+soon as the other side moves past it, and memory stays bounded by the
+directory depth and width instead of the tree size.
+
+Files on both sides are compared by metadata first. The same inode (a
+hardlinked or symlinked tree) is equal. A different size is a change. An
+equal size and mtime is equal unless ``trust_mtime`` is off; the sync
+scripts copy mtimes along with content. Only the remaining pairs are
+hashed.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, NamedTuple
+
+if TYPE_CHECKING:
+    from skillsync.ignore import SkillIgnore
+
+MISSING = "missing"
+EXTRA = "extra"
+CHANGED = "changed"
+
+
+class TreeFile(NamedTuple):
+    key: tuple[str, ...]
+    rel: str
+    path: str
+    stat: os.stat_result
+
+
+def _sorted_entries(directory: str) -> list[os.DirEntry]:
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(entries, key=lambda entry: entry.name)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def walk_files(
+    base: Path, excluded: Iterable[str] = (), ignore: SkillIgnore | None = None
+) -> Iterator[TreeFile]:
+    """Yield the files under ``base`` ordered by path components.
+
+    Symlinks are followed. Names in ``excluded`` and paths matched by
+    ``ignore`` are skipped, and skipped directories are never entered.
+    """
+    excluded = set(excluded)
+    # One pending listing per directory level.
+    stack: list[tuple[tuple[str, ...], Iterator[os.DirEntry]]] = [((), iter(_sorted_entries(str(base))))]
+    while stack:
+        parts, entries = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+        if entry.name in excluded:
+            continue
+        key = parts + (entry.name,)
+        rel = "/".join(key)
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            continue
+        if ignore is not None and ignore.match(rel, is_dir):
+            continue
+        if is_dir:
+            stack.append((key, iter(_sorted_entries(entry.path))))
+            continue
+        try:
+            st = entry.stat()
+        except FileNotFoundError:
+            continue
+        yield TreeFile(key, rel, entry.path, st)
+
+
+def same_metadata(left: TreeFile, right: TreeFile, trust_mtime: bool = True) -> bool | None:
+    """Whether two files are equal judging by their stat alone; None when the content must decide."""
+    a, b = left.stat, right.stat
+    if (a.st_dev, a.st_ino) == (b.st_dev, b.st_ino):
+        return True
+    if a.st_size != b.st_size:
+        return False
+    if trust_mtime and a.st_mtime_ns == b.st_mtime_ns:
+        return True
+    return None
+
+
+def same_content(
+    left: TreeFile, right: TreeFile, hasher: Callable[[Path], str], trust_mtime: bool = True
+) -> bool:
+    decided = same_metadata(left, right, trust_mtime)
+    if decided is not None:
+        return decided
+    return hasher(Path(left.path)) == hasher(Path(right.path))
+
+
+def diff_trees(
+    source: Path,
+    dest: Path,
+    excluded: Iterable[str],
+    same: Callable[[TreeFile, TreeFile], bool],
+    ignore: SkillIgnore | None = None,
+) -> Iterator[tuple[str, str]]:
+    """Yield ``(MISSING | EXTRA | CHANGED, relative path)`` for every difference of ``dest`` from ``source``.
+
+    ``same`` decides whether a file present in both trees is unchanged (see
+    ``same_content``). ``ignore`` applies to the source only: an ignored
+    file found in ``dest`` is extra.
+    """
+    left_files = walk_files(source, excluded, ignore)
+    right_files = walk_files(dest, excluded)
+    left, right = next(left_files, None), next(right_files, None)
+    while left is not None or right is not None:
+        if right is None or (left is not None and left.key < right.key):
+            yield MISSING, left.rel
+            left = next(left_files, None)
+        elif left is None or right.key < left.key:
+            yield EXTRA, right.rel
+            right = next(right_files, None)
+        else:
+            if not same(left, right):
+                yield CHANGED, left.rel
+            left, right = next(left_files, None), next(right_files, None)
+
+
+def largest_files(files: Iterable[TreeFile], count: int) -> tuple[int, list[tuple[int, str]]]:
+    """Total size of ``files`` and the ``count`` largest as ``(size, rel)``, in one pass."""
+    total = 0
+    heap: list[tuple[int, str]] = []
+    for file in files:
+        total += file.stat.st_size
+        item = (file.stat.st_size, file.rel)
+        if len(heap) < count:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    return total, sorted(heap, reverse=True)
+
+
+class ErrorLimit:
+    """Counts differences across (possibly parallel) validations and signals when to stop."""
+
+    def __init__(self, limit: int | None = None) -> None:
+        self.limit = limit
+        self.count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def reached(self) -> bool:
+        return self.limit is not None and self.count >= self.limit
+
+    def take(self) -> bool:
+        """Count one difference; False if the limit was already reached and it should be dropped."""
+        with self._lock:
+            if self.reached:
+                return False
+            self.count += 1
+            return True
@@ -0,0 +1,199 @@
+"""File watchers for ``sync_skills.py --watch``.
+
+On Linux an inotify watcher (via ctypes, no third-party dependency) reports
+changes as they happen; elsewhere, or when inotify is unavailable, a polling
+watcher diffs stat snapshots of the tree. Both skip excluded top-level
+directories and excluded tree names anywhere below the root.
+"""
+
+from __future__ import annotations
+
+import abc
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+POLL_INTERVAL = 0.25
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Watcher(abc.ABC):
+    kind = ""
+
+    def __init__(self, root: Path, excluded_roots: Iterable[str], excluded_names: Iterable[str]) -> None:
+        self.root = root
+        self.excluded_roots = set(excluded_roots)
+        self.excluded_names = set(excluded_names)
+
+    def _skip_dir(self, parent: Path, name: str) -> bool:
+        if name in self.excluded_names:
+            return True
+        return parent == self.root and name in self.excluded_roots
+
+    def _walk_dirs(self, start: Path) -> Iterator[Path]:
+        for current, dirs, _ in os.walk(start):
+            current_path = Path(current)
+            dirs[:] = [d for d in dirs if not self._skip_dir(current_path, d)]
+            yield current_path
+
+    @abc.abstractmethod
+    def wait(self, timeout: float | None) -> set[Path]:
+        """Block up to ``timeout`` seconds (forever if None) and return changed paths."""
+
+    def close(self) -> None:
+        pass
+
+
+class PollingWatcher(_Watcher):
+    kind = "polling"
+
+    def __init__(self, root: Path, excluded_roots: Iterable[str], excluded_names: Iterable[str]) -> None:
+        super().__init__(root, excluded_roots, excluded_names)
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for directory in self._walk_dirs(self.root):
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.name in self.excluded_names or self._skip_dir(directory, entry.name):
+                    continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                snapshot[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {
+                path
+                for path in self._snapshot.keys() | current.keys()
+                if self._snapshot.get(path) != current.get(path)
+            }
+            self._snapshot = current
+            if changed:
+                return changed
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(POLL_INTERVAL, remaining))
+            else:
+                time.sleep(POLL_INTERVAL)
+
+
+class InotifyWatcher(_Watcher):
+    kind = "inotify"
+
+    def __init__(self, root: Path, excluded_roots: Iterable[str], excluded_names: Iterable[str]) -> None:
+        super().__init__(root, excluded_roots, excluded_names)
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not libc_name:
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        for directory in self._walk_dirs(root):
+            self._add_watch(directory)
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            return
+        self._dirs[wd] = directory
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; report the whole root so callers rescan everything.
+                changed.add(self.root)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._dirs[wd]
+                continue
+            path = directory / name if name else directory
+            if name and name in self.excluded_names:
+                continue
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and not self._skip_dir(directory, name):
+                for new_dir in self._walk_dirs(path):
+                    self._add_watch(new_dir)
+                    changed.update(p for p in new_dir.iterdir() if p.name not in self.excluded_names)
+            changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_watcher(
+    root: Path, excluded_roots: Iterable[str], excluded_names: Iterable[str], force_poll: bool = False
+) -> _Watcher:
+    if not force_poll:
+        try:
+            return InotifyWatcher(root, excluded_roots, excluded_names)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, excluded_roots, excluded_names)
+
+
+def debounced_batches(watcher: _Watcher, debounce: float) -> Iterator[tuple[set[Path], float]]:
+    """Yield ``(changed paths, monotonic time of the first event)`` once a burst has gone quiet."""
+    while True:
+        changed = watcher.wait(None)
+        if not changed:
+            continue
+        started = time.monotonic()
+        while True:
+            more = watcher.wait(debounce)
+            if not more:
+                break
+            changed |= more
+        yield changed, started
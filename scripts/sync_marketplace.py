@@ -5,262 +5,94 @@ Usage:
   python scripts/sync_marketplace.py
   python scripts/sync_marketplace.py --validate
   python scripts/sync_marketplace.py --skills dev-workflow review-pr
+  python scripts/sync_marketplace.py --full
+  python scripts/sync_marketplace.py --link-mode hardlink
+  python scripts/sync_marketplace.py --validate --paranoid
+  python scripts/sync_marketplace.py --validate --max-plugin-size 2M
+  python scripts/sync_marketplace.py --validate --max-errors 20
+  python scripts/sync_marketplace.py --validate --git-index
+  python scripts/sync_marketplace.py --validate --since origin/main
+  python scripts/sync_marketplace.py --staged
+  python scripts/sync_marketplace.py --bundle
+  python scripts/sync_marketplace.py --validate --timings
 """
 
 from __future__ import annotations
 
 import argparse
-import hashlib
-import json
-import shutil
 import sys
-from dataclasses import dataclass
 from pathlib import Path
-
-
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
-MARKETPLACE_ROOT = PROJECT_ROOT / "my-marketplace"
-MARKETPLACE_REGISTRY = MARKETPLACE_ROOT / ".claude-plugin" / "marketplace.json"
-PLUGINS_DIR = MARKETPLACE_ROOT / "plugins"
-
-EXCLUDED_SOURCE_DIRS = {
-    ".git",
-    ".cursor",
-    "my-marketplace",
-}
-EXCLUDED_TREE_NAMES = {
-    "__pycache__",
-    ".DS_Store",
-}
-
-
-@dataclass
-class SkillMeta:
-    dir_name: str
-    name: str
-    description: str
-    source_dir: Path
-
-
-def read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8")
-
-
-def write_json(path: Path, data: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-
-
-def parse_skill_frontmatter(skill_md: Path) -> tuple[str, str]:
-    text = read_text(skill_md)
-    if not text.startswith("---"):
-        raise ValueError(f"{skill_md} is missing YAML frontmatter")
-
-    parts = text.split("---", 2)
-    if len(parts) < 3:
-        raise ValueError(f"{skill_md} has malformed YAML frontmatter")
-
-    frontmatter = parts[1].splitlines()
-    name = ""
-    description = ""
-
-    idx = 0
-    while idx < len(frontmatter):
-        line = frontmatter[idx]
-        stripped = line.strip()
-
-        if stripped.startswith("name:"):
-            name = stripped.split(":", 1)[1].strip()
-            idx += 1
-            continue
-
-        if stripped.startswith("description:"):
-            raw = stripped.split(":", 1)[1].strip()
-            if raw in (">", "|"):
-                idx += 1
-                desc_lines: list[str] = []
-                while idx < len(frontmatter):
-                    block_line = frontmatter[idx]
-                    if not block_line.startswith("  "):
-                        break
-                    desc_lines.append(block_line.strip())
-                    idx += 1
-                description = " ".join(line for line in desc_lines if line).strip()
-                continue
-
-            description = raw.strip()
-            idx += 1
-            continue
-
-        idx += 1
-
-    if not name:
-        raise ValueError(f"{skill_md} frontmatter must include `name`")
-
-    return name, description
-
-
-def discover_source_skills(selected: set[str] | None) -> list[SkillMeta]:
-    skills: list[SkillMeta] = []
-    for child in PROJECT_ROOT.iterdir():
-        if not child.is_dir():
-            continue
-        if child.name in EXCLUDED_SOURCE_DIRS:
-            continue
-
-        skill_md = child / "SKILL.md"
-        if not skill_md.exists():
-            continue
-
-        name, description = parse_skill_frontmatter(skill_md)
-        if selected and name not in selected and child.name not in selected:
-            continue
-
-        skills.append(
-            SkillMeta(
-                dir_name=child.name,
-                name=name,
-                description=description,
-                source_dir=child,
-            )
-        )
-
-    skills.sort(key=lambda item: item.name)
-    return skills
-
-
-def copy_skill_tree(source_dir: Path, dest_dir: Path) -> None:
-    if dest_dir.exists():
-        shutil.rmtree(dest_dir)
-    dest_dir.mkdir(parents=True, exist_ok=True)
-
-    for item in source_dir.iterdir():
-        if item.name in EXCLUDED_TREE_NAMES:
-            continue
-        dest_path = dest_dir / item.name
-        if item.is_dir():
-            shutil.copytree(
-                item,
-                dest_path,
-                ignore=shutil.ignore_patterns(*EXCLUDED_TREE_NAMES),
-            )
-        else:
-            shutil.copy2(item, dest_path)
-
-
-def ensure_plugin_metadata(plugin_dir: Path, meta: SkillMeta) -> None:
-    plugin_meta_dir = plugin_dir / ".claude-plugin"
-    plugin_meta_dir.mkdir(parents=True, exist_ok=True)
-
-    plugin_json_path = plugin_meta_dir / "plugin.json"
-    version = "1.0.0"
-    if plugin_json_path.exists():
-        try:
-            existing = json.loads(read_text(plugin_json_path))
-            version = str(existing.get("version", version))
-        except json.JSONDecodeError:
-            pass
-
-    plugin_json = {
-        "name": meta.name,
-        "version": version,
-        "description": (meta.description or f"{meta.name} skill")[:200],
-        "author": {"name": "Hideki"},
-        "keywords": [meta.name],
-        "license": "MIT",
-        "skills": "./skills",
-    }
-    write_json(plugin_json_path, plugin_json)
-
-    plugin_marketplace = {
-        "name": "hideki-plugins",
-        "owner": {"name": "Hideki"},
-        "metadata": {"description": "Custom Claude Code plugins by Hideki"},
-        "plugins": [
-            {
-                "name": meta.name,
-                "source": {"type": "local", "path": "."},
-                "description": plugin_json["description"],
-                "version": version,
-            }
-        ],
-    }
-    write_json(plugin_meta_dir / "marketplace.json", plugin_marketplace)
-
-
-def sync_registry(synced: list[SkillMeta]) -> None:
-    if MARKETPLACE_REGISTRY.exists():
-        registry = json.loads(read_text(MARKETPLACE_REGISTRY))
-    else:
-        registry = {"name": "hideki-plugins", "owner": {"name": "Hideki"}, "plugins": []}
-
-    existing_plugins = registry.get("plugins", [])
-    existing_by_name = {plugin.get("name"): plugin for plugin in existing_plugins}
-
-    for meta in synced:
-        existing_by_name[meta.name] = {
-            "name": meta.name,
-            "source": f"./plugins/{meta.name}",
-            "description": (meta.description or f"{meta.name} skill")[:200],
-        }
-
-    registry["plugins"] = sorted(existing_by_name.values(), key=lambda item: item["name"])
-    write_json(MARKETPLACE_REGISTRY, registry)
-
-
-def file_hash(path: Path) -> str:
-    h = hashlib.sha256()
-    h.update(path.read_bytes())
-    return h.hexdigest()
-
-
-def collect_files(base: Path) -> dict[str, str]:
-    files: dict[str, str] = {}
-    for file_path in base.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if any(part in EXCLUDED_TREE_NAMES for part in file_path.parts):
-            continue
-        rel = str(file_path.relative_to(base)).replace("\\", "/")
-        files[rel] = file_hash(file_path)
-    return files
-
-
-def validate(meta: SkillMeta) -> list[str]:
-    errors: list[str] = []
+from typing import Callable
+
+from skillsync import timing
+from skillsync.bundle import BUNDLE_SUFFIX, write_bundle
+from skillsync.core import (
+    BUNDLES_DIR,
+    EXCLUDED_TREE_NAMES,
+    FINGERPRINT_CACHE,
+    MARKETPLACE_REGISTRY,
+    PLUGINS_DIR,
+    PROJECT_ROOT,
+    SYNC_STATE_DIR,
+    SkillMeta,
+    budget_errors,
+    changed_source_skills,
+    copy_skill_tree,
+    discover_source_skills,
+    ensure_plugin_metadata,
+    file_hash,
+    sync_registry,
+    tree_errors,
+)
+from skillsync.fingerprint import FingerprintCache
+from skillsync.gitblobs import GitBlobs
+from skillsync.gitdiff import GitError
+from skillsync.linking import LINK_MODES
+from skillsync.manifest import manifest_path
+from skillsync.treediff import ErrorLimit
+from skillsync.units import parse_size
+
+
+def validate(
+    meta: SkillMeta,
+    hasher: Callable[[Path], str] = file_hash,
+    max_plugin_size: int | None = None,
+    limit: ErrorLimit | None = None,
+    trust_mtime: bool = True,
+    blobs: GitBlobs | None = None,
+) -> list[str]:
     plugin_skill_dir = PLUGINS_DIR / meta.name / "skills" / meta.name
     if not plugin_skill_dir.exists():
+        if limit is not None and not limit.take():
+            return []
         return [f"[{meta.name}] missing generated directory: {plugin_skill_dir}"]
 
-    source_files = collect_files(meta.source_dir)
-    generated_files = collect_files(plugin_skill_dir)
-
-    missing = sorted(set(source_files) - set(generated_files))
-    extra = sorted(set(generated_files) - set(source_files))
-    changed = sorted(
-        rel for rel in source_files.keys() & generated_files.keys() if source_files[rel] != generated_files[rel]
-    )
-
-    if missing:
-        errors.append(f"[{meta.name}] missing files in generated plugin: {', '.join(missing)}")
-    if extra:
-        errors.append(f"[{meta.name}] extra files in generated plugin: {', '.join(extra)}")
-    if changed:
-        errors.append(f"[{meta.name}] changed file content: {', '.join(changed)}")
-
+    errors: list[str] = []
+    if max_plugin_size is not None:
+        errors.extend(error for error in budget_errors(meta, max_plugin_size) if limit is None or limit.take())
+    if limit is None or not limit.reached:
+        same = None
+        if blobs is not None:
+            manifest_file = manifest_path(SYNC_STATE_DIR, plugin_skill_dir)
+            same = blobs.comparer(meta.source_dir, plugin_skill_dir, manifest_file, hasher)
+        errors.extend(tree_errors(meta, plugin_skill_dir, "generated plugin", hasher, limit, trust_mtime, same))
     return errors
 
 
-def run_sync(skills: list[SkillMeta]) -> None:
+def run_sync(skills: list[SkillMeta], full: bool = False, link_mode: str = "copy") -> None:
     synced: list[SkillMeta] = []
 
     for meta in skills:
         plugin_dir = PLUGINS_DIR / meta.name
         plugin_skill_dir = plugin_dir / "skills" / meta.name
-        copy_skill_tree(meta.source_dir, plugin_skill_dir)
-        ensure_plugin_metadata(plugin_dir, meta)
+        with timing.skill(meta.name):
+            [result] = copy_skill_tree(meta.source_dir, [plugin_skill_dir], full=full, link_mode=link_mode)
+            ensure_plugin_metadata(plugin_dir, meta)
         synced.append(meta)
-        print(f"Synced {meta.name}: {meta.source_dir} -> {plugin_skill_dir}")
+        if result.changed:
+            print(f"Synced {meta.name}: {meta.source_dir} -> {plugin_skill_dir} ({result.summary()})")
+        else:
+            print(f"Up to date {meta.name}: {plugin_skill_dir}")
 
     if synced:
         sync_registry(synced)
@@ -269,15 +101,50 @@ def run_sync(skills: list[SkillMeta]) -> None:
         print("No skills matched selection; nothing synced.")
 
 
-def run_validate(skills: list[SkillMeta]) -> int:
+def run_bundle(skills: list[SkillMeta]) -> None:
+    fingerprints = FingerprintCache(FINGERPRINT_CACHE)
+    for meta in skills:
+        bundle_path = BUNDLES_DIR / f"{meta.name}{BUNDLE_SUFFIX}"
+        with timing.skill(meta.name):
+            written = write_bundle(PLUGINS_DIR / meta.name, bundle_path, EXCLUDED_TREE_NAMES, fingerprints.sha256)
+        if written:
+            print(f"Bundled {meta.name}: {bundle_path}")
+        else:
+            print(f"Bundle up to date {meta.name}: {bundle_path}")
+    fingerprints.save()
+
+
+def run_validate(
+    skills: list[SkillMeta],
+    paranoid: bool = False,
+    max_plugin_size: int | None = None,
+    max_errors: int | None = None,
+    git_index: bool = False,
+) -> int:
+    fingerprints = FingerprintCache(FINGERPRINT_CACHE, paranoid=paranoid)
+    limit = ErrorLimit(max_errors)
+    blobs = None
+    if git_index:
+        try:
+            blobs = GitBlobs(PROJECT_ROOT, [meta.source_dir for meta in skills])
+        except GitError as exc:
+            sys.exit(f"Error: {exc}")
     all_errors: list[str] = []
     for meta in skills:
-        all_errors.extend(validate(meta))
+        if limit.reached:
+            break
+        with timing.skill(meta.name):
+            all_errors.extend(
+                validate(meta, fingerprints.sha256, max_plugin_size, limit, trust_mtime=not paranoid, blobs=blobs)
+            )
+    fingerprints.save()
 
     if all_errors:
         print("Validation failed:")
         for err in all_errors:
             print(f"  - {err}")
+        if limit.reached:
+            print(f"Stopped after the first {limit.limit} difference(s); rerun without --max-errors for all.")
         return 1
 
     print("Validation succeeded: source and generated skills are in sync.")
@@ -293,18 +160,96 @@ def main() -> int:
         default=None,
         help="Optional skill names (or root dir names) to sync/validate",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild generated plugins from scratch instead of syncing incrementally",
+    )
+    parser.add_argument(
+        "--link-mode",
+        choices=LINK_MODES,
+        default="copy",
+        help=(
+            "How generated files are materialized (store: hardlinks into the content-addressed store;"
+            " auto: reflink, then hardlink, then copy; default: copy)"
+        ),
+    )
+    parser.add_argument(
+        "--paranoid",
+        action="store_true",
+        help="With --validate, ignore the fingerprint cache and rehash every file",
+    )
+    parser.add_argument(
+        "--max-plugin-size",
+        type=parse_size,
+        default=None,
+        metavar="SIZE",
+        help="With --validate, fail when a skill ships more than SIZE bytes (e.g. 2M) after .skillignore",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=None,
+        metavar="N",
+        help="With --validate, stop after the first N differences (default: report all)",
+    )
+    parser.add_argument(
+        "--git-index",
+        action="store_true",
+        help="With --validate, use git index blob ids for clean tracked sources instead of reading them",
+    )
+    parser.add_argument(
+        "--bundle",
+        action="store_true",
+        help="Also pack each synced plugin into a single-file bundle under my-marketplace/bundles/",
+    )
+    changes = parser.add_mutually_exclusive_group()
+    changes.add_argument(
+        "--since",
+        metavar="REV",
+        default=None,
+        help="Only process skills with paths changed since REV (any `git diff` revision or A..B range)",
+    )
+    changes.add_argument(
+        "--staged",
+        action="store_true",
+        help="Only process skills with changes staged in the git index",
+    )
+    timing.add_arguments(parser)
     args = parser.parse_args()
+    timing.enable(args.timings, args.trace_out)
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("--max-errors must be at least 1")
+    if args.git_index and args.paranoid:
+        parser.error("--git-index cannot be combined with --paranoid")
 
     selected = set(args.skills) if args.skills else None
-    skills = discover_source_skills(selected)
+    if args.since or args.staged:
+        try:
+            skills = changed_source_skills(args.since, args.staged, selected)
+        except GitError as exc:
+            sys.exit(f"Error: {exc}")
+        if not skills:
+            print(f"No skill changes {'staged' if args.staged else f'since {args.since}'}.")
+            return 0
+    else:
+        skills = discover_source_skills(selected)
     if not skills:
-        print("No source skills found. Expected skill roots with SKILL.md at repo root.")
+        print("No source skills found. Expected skill roots with SKILL.md under the repo root.")
         return 1
 
     if args.validate:
-        return run_validate(skills)
+        return run_validate(
+            skills,
+            paranoid=args.paranoid,
+            max_plugin_size=args.max_plugin_size,
+            max_errors=args.max_errors,
+            git_index=args.git_index,
+        )
 
-    run_sync(skills)
+    run_sync(skills, full=args.full, link_mode=args.link_mode)
+    if args.bundle:
+        run_bundle(skills)
     return 0
 
 
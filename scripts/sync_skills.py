@@ -7,251 +7,95 @@ Usage:
   python scripts/sync_skills.py --targets claude
   python scripts/sync_skills.py --targets codex
   python scripts/sync_skills.py --validate
+  python scripts/sync_skills.py --full
+  python scripts/sync_skills.py --link-mode auto
+  python scripts/sync_skills.py --link-mode store
+  python scripts/sync_skills.py --stats
+  python scripts/sync_skills.py --validate --jobs 8
+  python scripts/sync_skills.py --validate --paranoid
+  python scripts/sync_skills.py --validate --max-plugin-size 2M
+  python scripts/sync_skills.py --validate --max-errors 20
+  python scripts/sync_skills.py --validate --git-index
+  python scripts/sync_skills.py --watch
+  python scripts/sync_skills.py --validate --since origin/main
+  python scripts/sync_skills.py --staged
+  python scripts/sync_skills.py --timings --trace-out trace.json
 """
 
 from __future__ import annotations
 
 import argparse
-import hashlib
-import json
 import os
-import shutil
 import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
+
+from skillsync.core import (
+    EXCLUDED_SOURCE_DIRS,
+    EXCLUDED_TREE_NAMES,
+    FINGERPRINT_CACHE,
+    MARKETPLACE_REGISTRY,
+    OBJECT_STORE,
+    PLUGINS_DIR,
+    PROJECT_ROOT,
+    SYNC_STATE_DIR,
+    SkillMeta,
+    budget_errors,
+    changed_source_skills,
+    copy_skill_tree,
+    discover_source_skills,
+    enclosing_skill_roots,
+    ensure_plugin_metadata,
+    file_hash,
+    indexed_skill_meta,
+    open_skill_index,
+    ordered_map,
+    resolve_jobs,
+    sync_registry,
+    tree_errors,
+)
+from skillsync import timing
+from skillsync.fingerprint import FingerprintCache
+from skillsync.gitblobs import GitBlobs
+from skillsync.gitdiff import GitError
+from skillsync.ignore import IGNORE_FILE, load_rules
+from skillsync.linking import LINK_MODES
+from skillsync.manifest import SyncResult, manifest_path
+from skillsync.publish import remove_published
+from skillsync.store import ObjectStore, tree_usage
+from skillsync.treediff import ErrorLimit
+from skillsync.units import format_size, parse_size
+from skillsync.watch import create_watcher, debounced_batches
 
-
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
-MARKETPLACE_ROOT = PROJECT_ROOT / "my-marketplace"
-MARKETPLACE_REGISTRY = MARKETPLACE_ROOT / ".claude-plugin" / "marketplace.json"
-PLUGINS_DIR = MARKETPLACE_ROOT / "plugins"
 DEFAULT_CODEX_HOME = Path.home() / ".codex"
 
-EXCLUDED_SOURCE_DIRS = {
-    ".git",
-    ".cursor",
-    "my-marketplace",
-}
-EXCLUDED_TREE_NAMES = {
-    "__pycache__",
-    ".DS_Store",
-}
-
 
 @dataclass
-class SkillMeta:
-    dir_name: str
-    name: str
-    description: str
-    source_dir: Path
-
-
-def read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8")
-
-
-def write_json(path: Path, data: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-
-
-def parse_skill_frontmatter(skill_md: Path) -> tuple[str, str]:
-    text = read_text(skill_md)
-    if not text.startswith("---"):
-        raise ValueError(f"{skill_md} is missing YAML frontmatter")
-
-    parts = text.split("---", 2)
-    if len(parts) < 3:
-        raise ValueError(f"{skill_md} has malformed YAML frontmatter")
-
-    frontmatter = parts[1].splitlines()
-    name = ""
-    description = ""
-
-    idx = 0
-    while idx < len(frontmatter):
-        line = frontmatter[idx]
-        stripped = line.strip()
-
-        if stripped.startswith("name:"):
-            name = stripped.split(":", 1)[1].strip()
-            idx += 1
-            continue
-
-        if stripped.startswith("description:"):
-            raw = stripped.split(":", 1)[1].strip()
-            if raw in (">", "|"):
-                idx += 1
-                desc_lines: list[str] = []
-                while idx < len(frontmatter):
-                    block_line = frontmatter[idx]
-                    if not block_line.startswith("  "):
-                        break
-                    desc_lines.append(block_line.strip())
-                    idx += 1
-                description = " ".join(line for line in desc_lines if line).strip()
-                continue
-
-            description = raw.strip()
-            idx += 1
-            continue
-
-        idx += 1
-
-    if not name:
-        raise ValueError(f"{skill_md} frontmatter must include `name`")
-
-    return name, description
-
-
-def discover_source_skills(selected: set[str] | None) -> list[SkillMeta]:
-    skills: list[SkillMeta] = []
-    for child in PROJECT_ROOT.iterdir():
-        if not child.is_dir():
-            continue
-        if child.name in EXCLUDED_SOURCE_DIRS:
-            continue
-
-        skill_md = child / "SKILL.md"
-        if not skill_md.exists():
-            continue
-
-        name, description = parse_skill_frontmatter(skill_md)
-        if selected and name not in selected and child.name not in selected:
-            continue
-
-        skills.append(
-            SkillMeta(
-                dir_name=child.name,
-                name=name,
-                description=description,
-                source_dir=child,
-            )
-        )
-
-    skills.sort(key=lambda item: item.name)
-    return skills
-
-
-def copy_skill_tree(source_dir: Path, dest_dir: Path) -> None:
-    if dest_dir.exists():
-        shutil.rmtree(dest_dir)
-    dest_dir.mkdir(parents=True, exist_ok=True)
-
-    for item in source_dir.iterdir():
-        if item.name in EXCLUDED_TREE_NAMES:
-            continue
-        dest_path = dest_dir / item.name
-        if item.is_dir():
-            shutil.copytree(
-                item,
-                dest_path,
-                ignore=shutil.ignore_patterns(*EXCLUDED_TREE_NAMES),
-            )
-        else:
-            shutil.copy2(item, dest_path)
-
-
-def ensure_plugin_metadata(plugin_dir: Path, meta: SkillMeta) -> None:
-    plugin_meta_dir = plugin_dir / ".claude-plugin"
-    plugin_meta_dir.mkdir(parents=True, exist_ok=True)
-
-    plugin_json_path = plugin_meta_dir / "plugin.json"
-    version = "1.0.0"
-    if plugin_json_path.exists():
-        try:
-            existing = json.loads(read_text(plugin_json_path))
-            version = str(existing.get("version", version))
-        except json.JSONDecodeError:
-            pass
-
-    plugin_json = {
-        "name": meta.name,
-        "version": version,
-        "description": (meta.description or f"{meta.name} skill")[:200],
-        "author": {"name": "Hideki"},
-        "keywords": [meta.name],
-        "license": "MIT",
-        "skills": "./skills",
-    }
-    write_json(plugin_json_path, plugin_json)
-
-    plugin_marketplace = {
-        "name": "hideki-plugins",
-        "owner": {"name": "Hideki"},
-        "metadata": {"description": "Custom Claude Code plugins by Hideki"},
-        "plugins": [
-            {
-                "name": meta.name,
-                "source": {"type": "local", "path": "."},
-                "description": plugin_json["description"],
-                "version": version,
-            }
-        ],
-    }
-    write_json(plugin_meta_dir / "marketplace.json", plugin_marketplace)
-
-
-def sync_registry(synced: list[SkillMeta]) -> None:
-    if MARKETPLACE_REGISTRY.exists():
-        registry = json.loads(read_text(MARKETPLACE_REGISTRY))
-    else:
-        registry = {"name": "hideki-plugins", "owner": {"name": "Hideki"}, "plugins": []}
-
-    existing_plugins = registry.get("plugins", [])
-    existing_by_name = {plugin.get("name"): plugin for plugin in existing_plugins}
-
-    for meta in synced:
-        existing_by_name[meta.name] = {
-            "name": meta.name,
-            "source": f"./plugins/{meta.name}",
-            "description": (meta.description or f"{meta.name} skill")[:200],
-        }
-
-    registry["plugins"] = sorted(existing_by_name.values(), key=lambda item: item["name"])
-    write_json(MARKETPLACE_REGISTRY, registry)
-
-
-def file_hash(path: Path) -> str:
-    h = hashlib.sha256()
-    h.update(path.read_bytes())
-    return h.hexdigest()
-
-
-def collect_files(base: Path) -> dict[str, str]:
-    files: dict[str, str] = {}
-    for file_path in base.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if any(part in EXCLUDED_TREE_NAMES for part in file_path.parts):
-            continue
-        rel = str(file_path.relative_to(base)).replace("\\", "/")
-        files[rel] = file_hash(file_path)
-    return files
-
-
-def validate_tree(meta: SkillMeta, destination: Path, label: str) -> list[str]:
-    errors: list[str] = []
+class Destination:
+    target: str
+    label: str
+    path: Path
+
+
+def validate_tree(
+    meta: SkillMeta,
+    destination: Path,
+    label: str,
+    hasher: Callable[[Path], str] = file_hash,
+    limit: ErrorLimit | None = None,
+    trust_mtime: bool = True,
+    blobs: GitBlobs | None = None,
+) -> list[str]:
     if not destination.exists():
+        if limit is not None and not limit.take():
+            return []
         return [f"[{meta.name}] missing generated directory ({label}): {destination}"]
-
-    source_files = collect_files(meta.source_dir)
-    generated_files = collect_files(destination)
-
-    missing = sorted(set(source_files) - set(generated_files))
-    extra = sorted(set(generated_files) - set(source_files))
-    changed = sorted(
-        rel for rel in source_files.keys() & generated_files.keys() if source_files[rel] != generated_files[rel]
-    )
-
-    if missing:
-        errors.append(f"[{meta.name}] missing files in {label}: {', '.join(missing)}")
-    if extra:
-        errors.append(f"[{meta.name}] extra files in {label}: {', '.join(extra)}")
-    if changed:
-        errors.append(f"[{meta.name}] changed file content in {label}: {', '.join(changed)}")
-
-    return errors
+    same = None
+    if blobs is not None:
+        same = blobs.comparer(meta.source_dir, destination, manifest_path(SYNC_STATE_DIR, destination), hasher)
+    return tree_errors(meta, destination, label, hasher, limit, trust_mtime, same)
 
 
 def resolve_codex_home(override: str | None) -> Path:
@@ -265,57 +109,110 @@ def resolve_codex_home(override: str | None) -> Path:
     return DEFAULT_CODEX_HOME.resolve()
 
 
-def codex_skills_dir(codex_home: Path) -> Path:
-    return codex_home / "skills"
+def resolve_codex_homes(overrides: list[str] | None) -> list[Path]:
+    if not overrides:
+        return [resolve_codex_home(None)]
+    return list(dict.fromkeys(resolve_codex_home(override) for override in overrides))
 
 
-def run_claude_sync(skills: list[SkillMeta]) -> None:
-    synced: list[SkillMeta] = []
-    for meta in skills:
-        plugin_dir = PLUGINS_DIR / meta.name
-        plugin_skill_dir = plugin_dir / "skills" / meta.name
-        copy_skill_tree(meta.source_dir, plugin_skill_dir)
-        ensure_plugin_metadata(plugin_dir, meta)
-        synced.append(meta)
-        print(f"[claude] Synced {meta.name}: {meta.source_dir} -> {plugin_skill_dir}")
-
-    if synced:
-        sync_registry(synced)
-        print(f"[claude] Updated registry: {MARKETPLACE_REGISTRY}")
-    else:
-        print("[claude] No skills matched selection; nothing synced.")
-
+def codex_skills_dir(codex_home: Path) -> Path:
+    return codex_home / "skills"
 
-def run_codex_sync(skills: list[SkillMeta], codex_home: Path) -> None:
-    skills_dir = codex_skills_dir(codex_home)
-    skills_dir.mkdir(parents=True, exist_ok=True)
 
-    if not skills:
-        print("[codex] No skills matched selection; nothing synced.")
-        return
+def skill_destinations(meta: SkillMeta, targets: set[str], codex_homes: list[Path]) -> list[Destination]:
+    destinations: list[Destination] = []
+    if "claude" in targets:
+        destinations.append(
+            Destination("claude", "claude marketplace plugin", PLUGINS_DIR / meta.name / "skills" / meta.name)
+        )
+    if "codex" in targets:
+        for codex_home in codex_homes:
+            label = "codex skills dir" if len(codex_homes) == 1 else f"codex skills dir ({codex_home})"
+            destinations.append(Destination("codex", label, codex_skills_dir(codex_home) / meta.name))
+    return destinations
+
+
+def run_sync(
+    skills: list[SkillMeta],
+    targets: set[str],
+    codex_homes: list[Path],
+    full: bool = False,
+    jobs: int = 1,
+    link_mode: str = "copy",
+) -> None:
+    def sync_skill(meta: SkillMeta) -> list[tuple[Destination, SyncResult]]:
+        destinations = skill_destinations(meta, targets, codex_homes)
+        with timing.skill(meta.name):
+            results = copy_skill_tree(
+                meta.source_dir, [dest.path for dest in destinations], full=full, link_mode=link_mode
+            )
+            if "claude" in targets:
+                ensure_plugin_metadata(PLUGINS_DIR / meta.name, meta)
+        return list(zip(destinations, results))
 
-    for meta in skills:
-        destination = skills_dir / meta.name
-        copy_skill_tree(meta.source_dir, destination)
-        print(f"[codex] Synced {meta.name}: {meta.source_dir} -> {destination}")
+    outcomes = ordered_map(sync_skill, skills, jobs)
 
+    for target in ("claude", "codex"):
+        if target not in targets:
+            continue
+        for meta, outcome in zip(skills, outcomes):
+            for dest, result in outcome:
+                if dest.target != target:
+                    continue
+                if result.changed:
+                    print(f"[{target}] Synced {meta.name}: {meta.source_dir} -> {dest.path} ({result.summary()})")
+                else:
+                    print(f"[{target}] Up to date {meta.name}: {dest.path}")
+        if target == "claude":
+            sync_registry(skills)
+            print(f"[claude] Updated registry: {MARKETPLACE_REGISTRY}")
+
+
+def run_validate(
+    skills: list[SkillMeta],
+    targets: set[str],
+    codex_homes: list[Path],
+    jobs: int = 1,
+    paranoid: bool = False,
+    max_plugin_size: int | None = None,
+    max_errors: int | None = None,
+    git_index: bool = False,
+) -> int:
+    fingerprints = FingerprintCache(FINGERPRINT_CACHE, paranoid=paranoid)
+    limit = ErrorLimit(max_errors)
+    blobs = None
+    if git_index:
+        try:
+            blobs = GitBlobs(PROJECT_ROOT, [meta.source_dir for meta in skills])
+        except GitError as exc:
+            sys.exit(f"Error: {exc}")
+
+    def validate_skill(meta: SkillMeta) -> list[str]:
+        errors: list[str] = []
+        with timing.skill(meta.name):
+            if max_plugin_size is not None and not limit.reached:
+                errors.extend(error for error in budget_errors(meta, max_plugin_size) if limit.take())
+            for dest in skill_destinations(meta, targets, codex_homes):
+                if limit.reached:
+                    break
+                errors.extend(
+                    validate_tree(
+                        meta, dest.path, dest.label, fingerprints.sha256, limit, trust_mtime=not paranoid, blobs=blobs
+                    )
+                )
+        return errors
 
-def run_validate(skills: list[SkillMeta], targets: set[str], codex_home: Path) -> int:
     all_errors: list[str] = []
-
-    for meta in skills:
-        if "claude" in targets:
-            plugin_skill_dir = PLUGINS_DIR / meta.name / "skills" / meta.name
-            all_errors.extend(validate_tree(meta, plugin_skill_dir, "claude marketplace plugin"))
-
-        if "codex" in targets:
-            codex_skill_dir = codex_skills_dir(codex_home) / meta.name
-            all_errors.extend(validate_tree(meta, codex_skill_dir, "codex skills dir"))
+    for errors in ordered_map(validate_skill, skills, jobs):
+        all_errors.extend(errors)
+    fingerprints.save()
 
     if all_errors:
         print("Validation failed:")
         for err in all_errors:
             print(f"  - {err}")
+        if limit.reached:
+            print(f"Stopped after the first {limit.limit} difference(s); rerun without --max-errors for all.")
         return 1
 
     target_summary = ", ".join(sorted(targets))
@@ -323,6 +220,104 @@ def run_validate(skills: list[SkillMeta], targets: set[str], codex_home: Path) -
     return 0
 
 
+def run_stats(targets: set[str], codex_homes: list[Path]) -> int:
+    """Report logical vs physical bytes of the generated trees and the object store."""
+    roots = {"claude": [PLUGINS_DIR]} if "claude" in targets else {}
+    if "codex" in targets:
+        roots["codex"] = [codex_skills_dir(home) for home in codex_homes]
+    for target, paths in roots.items():
+        files, logical, physical = tree_usage(paths)
+        print(
+            f"[{target}] {files} files, logical {format_size(logical)}, "
+            f"physical {format_size(physical)} (saved {format_size(logical - physical)})"
+        )
+    objects, object_bytes = ObjectStore(OBJECT_STORE).usage()
+    print(f"[store] {objects} objects, {format_size(object_bytes)}: {OBJECT_STORE}")
+    return 0
+
+
+def remove_generated(skills: list[SkillMeta], targets: set[str], codex_homes: list[Path]) -> None:
+    """Delete generated artifacts for skills whose source root disappeared or was renamed."""
+    for meta in skills:
+        for dest in skill_destinations(meta, targets, codex_homes):
+            # The whole plugin dir belongs to the skill, not just its skills/<name> subtree.
+            path = PLUGINS_DIR / meta.name if dest.target == "claude" else dest.path
+            remove_published(path)
+            manifest_path(SYNC_STATE_DIR, dest.path).unlink(missing_ok=True)
+            print(f"[{dest.target}] Removed {meta.name}: {path}")
+    if "claude" in targets:
+        sync_registry([], removed=[meta.name for meta in skills])
+        print(f"[claude] Updated registry: {MARKETPLACE_REGISTRY}")
+
+
+def run_watch(
+    selected: set[str] | None,
+    targets: set[str],
+    codex_homes: list[Path],
+    jobs: int = 1,
+    link_mode: str = "copy",
+    debounce: float = 0.1,
+    force_poll: bool = False,
+) -> int:
+    index = open_skill_index()
+    skills = discover_source_skills(selected, index)
+    if skills:
+        run_sync(skills, targets, codex_homes, jobs=jobs, link_mode=link_mode)
+    known = {meta.dir_name: meta for meta in skills}
+
+    watcher = create_watcher(PROJECT_ROOT, EXCLUDED_SOURCE_DIRS, EXCLUDED_TREE_NAMES, force_poll=force_poll)
+    print(f"[watch] Watching {PROJECT_ROOT} ({watcher.kind}); press Ctrl+C to stop.")
+    try:
+        for changed, started in debounced_batches(watcher, debounce):
+            if PROJECT_ROOT in changed or PROJECT_ROOT / IGNORE_FILE in changed:
+                # Watcher overflow or new repo-level ignore rules: recheck every root.
+                index.ignore = load_rules(PROJECT_ROOT)
+                try:
+                    index.rescan()
+                except ValueError as exc:
+                    print(f"[watch] Rescan incomplete: {exc}")
+                roots = set(index.roots()) | set(known)
+            else:
+                roots = enclosing_skill_roots(changed, set(known))
+
+            updated: list[SkillMeta] = []
+            removed: list[SkillMeta] = []
+            for rel in sorted(roots):
+                previous = known.pop(rel, None)
+                try:
+                    entry = index.refresh(rel)
+                except ValueError as exc:
+                    # Mid-edit frontmatter; keep the last good state until it parses again.
+                    print(f"[watch] Skipping {rel}: {exc}")
+                    if previous is not None:
+                        known[rel] = previous
+                    continue
+                meta = None
+                if entry is not None and (not selected or index.matches(rel, entry, selected)):
+                    meta = indexed_skill_meta(rel, entry)
+                if previous is not None and (meta is None or meta.name != previous.name):
+                    removed.append(previous)
+                if meta is not None:
+                    known[rel] = meta
+                    updated.append(meta)
+
+            index.save()
+            if removed:
+                remove_generated(removed, targets, codex_homes)
+            if updated:
+                updated.sort(key=lambda item: item.name)
+                run_sync(updated, targets, codex_homes, jobs=jobs, link_mode=link_mode)
+            if updated or removed:
+                elapsed_ms = (time.monotonic() - started) * 1000
+                names = ", ".join(meta.name for meta in removed + updated)
+                print(f"[watch] Resynced {names} in {elapsed_ms:.0f} ms")
+    except KeyboardInterrupt:
+        print("[watch] Stopped.")
+    finally:
+        watcher.close()
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Sync source skills to Claude marketplace and Codex skills")
     parser.add_argument("--validate", action="store_true", help="Validate generated targets match source skills")
@@ -341,27 +336,142 @@ def main() -> int:
     )
     parser.add_argument(
         "--codex-home",
+        nargs="+",
         default=None,
-        help="Codex home directory (default: $CODEX_HOME or ~/.codex)",
+        help="One or more Codex home directories (default: $CODEX_HOME or ~/.codex)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild generated trees from scratch instead of syncing incrementally",
+    )
+    parser.add_argument(
+        "--link-mode",
+        choices=LINK_MODES,
+        default="copy",
+        help=(
+            "How generated files are materialized (store: hardlinks into the content-addressed store;"
+            " auto: reflink, then hardlink, then copy; default: copy)"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Skills synced or validated in parallel (0 = CPU count, default: 0)",
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and resync skills as their sources change",
+    )
+    parser.add_argument(
+        "--debounce-ms",
+        type=int,
+        default=100,
+        help="With --watch, quiet period before a burst of edits is synced (default: 100)",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch, use stat polling instead of inotify",
+    )
+    parser.add_argument(
+        "--paranoid",
+        action="store_true",
+        help="With --validate, ignore the fingerprint cache and rehash every file",
+    )
+    parser.add_argument(
+        "--max-plugin-size",
+        type=parse_size,
+        default=None,
+        metavar="SIZE",
+        help="With --validate, fail when a skill ships more than SIZE bytes (e.g. 2M) after .skillignore",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=None,
+        metavar="N",
+        help="With --validate, stop after the first N differences (default: report all)",
+    )
+    parser.add_argument(
+        "--git-index",
+        action="store_true",
+        help="With --validate, use git index blob ids for clean tracked sources instead of reading them",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Report logical vs physical bytes of the generated trees and the object store, then exit",
+    )
+    changes = parser.add_mutually_exclusive_group()
+    changes.add_argument(
+        "--since",
+        metavar="REV",
+        default=None,
+        help="Only process skills with paths changed since REV (any `git diff` revision or A..B range)",
+    )
+    changes.add_argument(
+        "--staged",
+        action="store_true",
+        help="Only process skills with changes staged in the git index",
+    )
+    timing.add_arguments(parser)
     args = parser.parse_args()
+    timing.enable(args.timings, args.trace_out)
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("--max-errors must be at least 1")
+    if args.git_index and args.paranoid:
+        parser.error("--git-index cannot be combined with --paranoid")
 
     selected = set(args.skills) if args.skills else None
-    skills = discover_source_skills(selected)
+    targets = set(args.targets)
+    codex_homes = resolve_codex_homes(args.codex_home)
+    jobs = resolve_jobs(args.jobs)
+
+    if args.stats:
+        return run_stats(targets, codex_homes)
+    if args.watch and (args.since or args.staged):
+        parser.error("--watch cannot be combined with --since/--staged")
+    if args.watch:
+        return run_watch(
+            selected,
+            targets,
+            codex_homes,
+            jobs=jobs,
+            link_mode=args.link_mode,
+            debounce=args.debounce_ms / 1000,
+            force_poll=args.poll,
+        )
+
+    if args.since or args.staged:
+        try:
+            skills = changed_source_skills(args.since, args.staged, selected)
+        except GitError as exc:
+            sys.exit(f"Error: {exc}")
+        if not skills:
+            print(f"No skill changes {'staged' if args.staged else f'since {args.since}'}.")
+            return 0
+    else:
+        skills = discover_source_skills(selected)
     if not skills:
-        print("No source skills found. Expected skill roots with SKILL.md at repo root.")
+        print("No source skills found. Expected skill roots with SKILL.md under the repo root.")
         return 1
 
-    targets = set(args.targets)
-    codex_home = resolve_codex_home(args.codex_home)
-
     if args.validate:
-        return run_validate(skills, targets, codex_home)
+        return run_validate(
+            skills,
+            targets,
+            codex_homes,
+            jobs,
+            paranoid=args.paranoid,
+            max_plugin_size=args.max_plugin_size,
+            max_errors=args.max_errors,
+            git_index=args.git_index,
+        )
 
-    if "claude" in targets:
-        run_claude_sync(skills)
-    if "codex" in targets:
-        run_codex_sync(skills, codex_home)
+    run_sync(skills, targets, codex_homes, full=args.full, jobs=jobs, link_mode=args.link_mode)
 
     return 0
 
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import zipfile
+
+import pytest
+
+from skillsync.bundle import BUNDLE_INDEX, BundleError, extract_changed, read_index, write_bundle
+
+
+def make_plugin(root, files: dict[str, str]):
+    plugin = root / "plugin"
+    (plugin / ".claude-plugin").mkdir(parents=True)
+    (plugin / ".claude-plugin" / "plugin.json").write_text(
+        json.dumps({"name": "demo", "version": "1.2.0", "description": "Demo"}), encoding="utf-8"
+    )
+    for rel, text in files.items():
+        (plugin / rel).parent.mkdir(parents=True, exist_ok=True)
+        (plugin / rel).write_text(text, encoding="utf-8")
+    return plugin
+
+
+def hostile_bundle(path, members: dict[str, bytes], **overrides):
+    index = {
+        "version": 1,
+        "name": "demo",
+        "plugin_version": "1.0.0",
+        "description": "",
+        "digest": "0" * 64,
+        "files": {rel: {"size": len(data), "sha256": hashlib.sha256(data).hexdigest()} for rel, data in members.items()},
+    }
+    index.update(overrides)
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(BUNDLE_INDEX, json.dumps(index))
+        for rel, data in members.items():
+            archive.writestr(rel, data)
+    return path
+
+
+def test_round_trip_extracts_only_changed_members(tmp_path) -> None:
+    plugin = make_plugin(tmp_path, {"skills/demo/SKILL.md": "one", "skills/demo/references/a.md": "a"})
+    bundle = tmp_path / "demo.zip"
+    assert write_bundle(plugin, bundle)
+    assert not write_bundle(plugin, bundle)
+    index = read_index(bundle)
+    assert (index["name"], index["plugin_version"]) == ("demo", "1.2.0")
+
+    dest = tmp_path / "dest"
+    extracted, removed, unchanged = extract_changed(bundle, index, dest, {})
+    assert len(extracted) == 3 and not removed and unchanged == 0
+    assert (dest / "skills" / "demo" / "SKILL.md").read_text(encoding="utf-8") == "one"
+
+    current = {rel: entry["sha256"] for rel, entry in index["files"].items()}
+    (dest / "stale.md").write_text("stale", encoding="utf-8")
+    current["stale.md"] = "0" * 64
+    (plugin / "skills" / "demo" / "SKILL.md").write_text("two", encoding="utf-8")
+    assert write_bundle(plugin, bundle)
+    extracted, removed, unchanged = extract_changed(bundle, read_index(bundle), dest, current)
+    assert (extracted, removed, unchanged) == (["skills/demo/SKILL.md"], ["stale.md"], 2)
+    assert not (dest / "stale.md").exists()
+
+
+@pytest.mark.parametrize(
+    "rel",
+    [
+        "../../../../../escaped.txt",
+        "skills/../../escaped.txt",
+        "/tmp/escaped.txt",
+        "skills\\..\\..\\escaped.txt",
+        "C:/escaped.txt",
+        "skills//escaped.txt",
+        "./escaped.txt",
+    ],
+)
+def test_unsafe_member_paths_are_rejected(tmp_path, rel: str) -> None:
+    bundle = hostile_bundle(tmp_path / "evil.zip", {rel: b"pwned"})
+    with pytest.raises(BundleError, match="unsafe member path"):
+        read_index(bundle)
+
+
+@pytest.mark.parametrize(
+    ("key", "value"),
+    [("name", "../../escaped"), ("name", "a/b"), ("name", ".."), ("name", ""), ("plugin_version", "1.0/../../x"),
+     ("plugin_version", "..\\x"), ("plugin_version", 1)],
+)
+def test_unsafe_name_and_version_are_rejected(tmp_path, key: str, value) -> None:
+    bundle = hostile_bundle(tmp_path / "evil.zip", {"skills/demo/SKILL.md": b"x"}, **{key: value})
+    with pytest.raises(BundleError, match=f"invalid {key}"):
+        read_index(bundle)
+
+
+def test_extract_refuses_to_follow_symlinked_dirs_out_of_dest(tmp_path) -> None:
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    (dest / "skills").symlink_to(outside, target_is_directory=True)
+    bundle = hostile_bundle(tmp_path / "evil.zip", {"skills/escaped.txt": b"pwned"})
+    with pytest.raises(BundleError, match="outside"):
+        extract_changed(bundle, read_index(bundle), dest, {})
+    assert not (outside / "escaped.txt").exists()
+
+
+def test_tampered_member_is_rejected(tmp_path) -> None:
+    bundle = hostile_bundle(tmp_path / "bad.zip", {"skills/demo/SKILL.md": b"x"})
+    index = read_index(bundle)
+    index["files"]["skills/demo/SKILL.md"]["sha256"] = "0" * 64
+    with pytest.raises(BundleError, match="does not match"):
+        extract_changed(bundle, index, tmp_path / "dest", {})
+
+
+def test_not_a_bundle(tmp_path) -> None:
+    path = tmp_path / "plain.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("README.md", "hi")
+    with pytest.raises(BundleError, match="does not start with"):
+        read_index(path)
+    path.write_text("not a zip", encoding="utf-8")
+    with pytest.raises(BundleError, match="not a plugin bundle"):
+        read_index(path)
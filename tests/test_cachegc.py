@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import os
+
+from skillsync.cachegc import collect_garbage, digest_path
+from skillsync.publish import new_staging, publish
+
+
+def publish_version(dest, files: dict[str, str]) -> None:
+    staging = new_staging(dest, clone=False)
+    for rel, text in files.items():
+        (staging / rel).write_text(text, encoding="utf-8")
+    publish(staging, dest)
+
+
+def cache_version(cache_root, name: str, version: str, size: int, last_used: int) -> None:
+    dest = cache_root / name / version
+    publish_version(dest, {"data.bin": "x" * size})
+    digest_path(dest).write_text("digest\n", encoding="utf-8")
+    os.utime(digest_path(dest), (last_used, last_used))
+    os.utime(dest, (last_used, last_used), follow_symlinks=False)
+
+
+def test_gc_evicts_unreachable_versions_least_recently_used_first(tmp_path) -> None:
+    cache = tmp_path / "cache"
+    cache_version(cache, "demo", "1.0.0", 1000, last_used=1_000)
+    cache_version(cache, "demo", "1.1.0", 1000, last_used=2_000)
+    cache_version(cache, "demo", "2.0.0", 1000, last_used=500)
+    reachable = {("demo", "2.0.0")}
+
+    evicted, before, after = collect_garbage(cache, reachable, max_size=2500, dry_run=True)
+    assert [entry.version for entry in evicted] == ["1.0.0"]
+    assert (cache / "demo" / "1.0.0").exists() and after < before
+
+    evicted, _, after = collect_garbage(cache, reachable, max_size=0)
+    assert [entry.version for entry in evicted] == ["1.0.0", "1.1.0"]
+    assert sorted(path.name for path in (cache / "demo").iterdir()) == [".2.0.0.digest", ".2.0.0.generations", "2.0.0"]
+    assert (cache / "demo" / "2.0.0" / "data.bin").exists()
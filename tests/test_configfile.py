@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from skillsync.configfile import ConfigError, FileLock, locked_json, read_jsonc, strip_jsonc, update_json
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('{"a": 1, // note\n "b": 2}', {"a": 1, "b": 2}),
+        ('{"a": /* inline */ 1}', {"a": 1}),
+        ('{"url": "https://example.com//path"}', {"url": "https://example.com//path"}),
+        ('{"glob": "/* not a comment */"}', {"glob": "/* not a comment */"}),
+        ('{"path": "C:\\\\Users\\\\me"}', {"path": "C:\\Users\\me"}),
+        ('{"quote": "say \\"hi\\" // still text"}', {"quote": 'say "hi" // still text'}),
+        ('{"a": [1, 2,], "b": {"c": 3,},}', {"a": [1, 2], "b": {"c": 3}}),
+        ('{"a": [1, /* x */ ], }', {"a": [1]}),
+        ('{"a": ",]", "b": [",}",]}', {"a": ",]", "b": [",}"]}),
+        ('{"a": 1 /* one */, /* two */ "b": 2}', {"a": 1, "b": 2}),
+    ],
+)
+def test_strip_jsonc(text: str, expected: dict) -> None:
+    assert json.loads(strip_jsonc(text)) == expected
+
+
+def test_strip_jsonc_keeps_line_numbers() -> None:
+    text = '{\n/* a\nb */\n"x": }'
+    with pytest.raises(json.JSONDecodeError) as info:
+        json.loads(strip_jsonc(text))
+    assert info.value.lineno == 4
+
+
+def test_read_jsonc_errors(tmp_path) -> None:
+    with pytest.raises(ConfigError, match="does not exist"):
+        read_jsonc(tmp_path / "missing.json")
+    bad = tmp_path / "bad.json"
+    bad.write_text("{nope", encoding="utf-8")
+    with pytest.raises(ConfigError, match="bad.json"):
+        read_jsonc(bad)
+
+
+def test_read_jsonc_accepts_a_bom(tmp_path) -> None:
+    path = tmp_path / "settings.json"
+    path.write_bytes('\ufeff{"a": 1}'.encode("utf-8"))
+    assert read_jsonc(path) == {"a": 1}
+
+
+def test_update_json_creates_from_default_and_skips_no_op_writes(tmp_path) -> None:
+    path = tmp_path / "registry.json"
+    update_json(path, lambda data: data.setdefault("plugins", []).append("a"), default=dict)
+    assert json.loads(path.read_text(encoding="utf-8")) == {"plugins": ["a"]}
+    mtime = path.stat().st_mtime_ns
+    time.sleep(0.01)
+    update_json(path, lambda data: None)
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_update_json_without_default_requires_the_file(tmp_path) -> None:
+    with pytest.raises(ConfigError):
+        update_json(tmp_path / "missing.json", lambda data: None)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs symlinks")
+def test_update_json_writes_through_a_symlinked_file(tmp_path) -> None:
+    dotfiles = tmp_path / "dotfiles"
+    dotfiles.mkdir()
+    target = dotfiles / "settings.json"
+    target.write_text('{"theme": "dark"}', encoding="utf-8")
+    path = tmp_path / "settings.json"
+    path.symlink_to(target)
+    update_json(path, lambda data: data.__setitem__("enabledPlugins", {"demo": True}))
+    assert path.is_symlink()
+    assert read_jsonc(target) == {"theme": "dark", "enabledPlugins": {"demo": True}}
+    assert sorted(entry.name for entry in dotfiles.iterdir()) == ["settings.json"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs POSIX modes")
+def test_update_json_keeps_the_file_mode(tmp_path) -> None:
+    path = tmp_path / "settings.json"
+    path.write_text("{}", encoding="utf-8")
+    path.chmod(0o600)
+    update_json(path, lambda data: data.__setitem__("a", 1))
+    assert read_jsonc(path) == {"a": 1}
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+def test_locked_json_writes_nothing_when_the_block_raises(tmp_path) -> None:
+    path = tmp_path / "state.json"
+    path.write_text('{"a": 1}', encoding="utf-8")
+    with pytest.raises(RuntimeError), locked_json(path) as data:
+        data["a"] = 2
+        raise RuntimeError("boom")
+    assert read_jsonc(path) == {"a": 1}
+
+
+def test_file_lock_times_out_while_held(tmp_path) -> None:
+    lock_file = tmp_path / ".x.lock"
+    with FileLock(lock_file):
+        started = time.monotonic()
+        with pytest.raises(ConfigError, match="timed out"):
+            with FileLock(lock_file, timeout=0.2):
+                pass
+        assert time.monotonic() - started >= 0.2
+    # Released: the lock can be taken again, and the lock file stays.
+    with FileLock(lock_file, timeout=0):
+        pass
+    assert lock_file.exists()
+
+
+def test_file_lock_serializes_threads(tmp_path) -> None:
+    lock_file = tmp_path / ".x.lock"
+    inside = 0
+    overlaps = []
+
+    def worker() -> None:
+        nonlocal inside
+        for _ in range(20):
+            with FileLock(lock_file):
+                inside += 1
+                overlaps.append(inside)
+                time.sleep(0.001)
+                inside -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(overlaps) == 1
+
+
+def _add_keys(path: str, prefix: str, count: int) -> None:
+    from pathlib import Path
+
+    for index in range(count):
+        update_json(Path(path), lambda data: data.__setitem__(f"{prefix}{index}", index), default=dict)
+
+
+def test_update_json_loses_no_updates_across_processes(tmp_path) -> None:
+    path = tmp_path / "installed.json"
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_add_keys, args=(str(path), f"p{n}-", 15)) for n in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+    assert len(read_jsonc(path)) == 60
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+
+from skillsync.discovery import SkillIndex
+
+
+def write_skill(root, rel: str, name: str, description: str = "Demo") -> None:
+    skill_md = root / rel / "SKILL.md"
+    skill_md.parent.mkdir(parents=True, exist_ok=True)
+    skill_md.write_text(f"---\nname: {name}\ndescription: {description}\n---\n", encoding="utf-8")
+    # Outside the racy window, so the stamp is stored and reused.
+    os.utime(skill_md, (1_000_000_000, 1_000_000_000))
+
+
+def open_index(tmp_path) -> SkillIndex:
+    return SkillIndex(tmp_path / "repo", tmp_path / "index.json", {"scripts"}, {"__pycache__"})
+
+
+def test_rescan_finds_roots_and_skips_excluded(tmp_path) -> None:
+    repo = tmp_path / "repo"
+    write_skill(repo, "alpha", "alpha")
+    write_skill(repo, "group/nested", "nested-skill")
+    write_skill(repo, "scripts/tool", "tool")
+    write_skill(repo, ".hidden", "hidden")
+    index = open_index(tmp_path)
+    assert index.is_stale()
+    assert sorted(index.resolve(None)) == ["alpha", "group/nested"]
+    assert index.parsed == 2
+
+
+def test_saved_index_is_reused_until_a_root_is_added(tmp_path) -> None:
+    repo = tmp_path / "repo"
+    write_skill(repo, "alpha", "alpha")
+    write_skill(repo, "beta", "beta")
+    index = open_index(tmp_path)
+    index.resolve(None)
+    index.save()
+
+    reloaded = open_index(tmp_path)
+    assert not reloaded.is_stale()
+    assert sorted(reloaded.resolve(None)) == ["alpha", "beta"]
+    assert reloaded.parsed == 0
+
+    write_skill(repo, "group/gamma", "gamma")
+    reloaded = open_index(tmp_path)
+    assert reloaded.is_stale()
+    assert sorted(reloaded.resolve(None)) == ["alpha", "beta", "group/gamma"]
+    assert reloaded.parsed == 1
+
+
+def test_selection_resolves_by_name_path_or_basename(tmp_path) -> None:
+    repo = tmp_path / "repo"
+    write_skill(repo, "alpha", "alpha-skill")
+    write_skill(repo, "group/nested", "nested-skill")
+    write_skill(repo, "other", "other")
+    index = open_index(tmp_path)
+    index.resolve(None)
+    index.save()
+
+    for selected in ({"alpha-skill"}, {"alpha"}):
+        assert list(open_index(tmp_path).resolve(selected)) == ["alpha"]
+    assert list(open_index(tmp_path).resolve({"group/nested"})) == ["group/nested"]
+    assert list(open_index(tmp_path).resolve({"nested"})) == ["group/nested"]
+
+
+def test_changed_skill_md_is_reparsed(tmp_path) -> None:
+    repo = tmp_path / "repo"
+    write_skill(repo, "alpha", "alpha")
+    index = open_index(tmp_path)
+    index.resolve(None)
+    index.save()
+
+    write_skill(repo, "alpha", "alpha", description="A longer description")
+    reloaded = open_index(tmp_path)
+    assert reloaded.resolve({"alpha"})["alpha"]["description"] == "A longer description"
+    assert reloaded.parsed == 1
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from pathlib import Path
+
+from skillsync.fingerprint import FingerprintCache
+from skillsync.manifest import file_sha256
+
+
+def write_old(path: Path, text: str) -> None:
+    """Write a file with an mtime outside the racy window, so its hash is cached."""
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (1_000_000_000, 1_000_000_000))
+
+
+def test_hashes_are_cached_by_stat(tmp_path) -> None:
+    source = tmp_path / "a.txt"
+    write_old(source, "one")
+    cache = FingerprintCache(tmp_path / "fingerprints.json")
+    assert cache.sha256(source) == file_sha256(source)
+    cache.save()
+
+    reloaded = FingerprintCache(tmp_path / "fingerprints.json")
+    assert reloaded.sha256(source) == file_sha256(source)
+    assert (reloaded.hits, reloaded.misses) == (1, 0)
+    write_old(source, "two!")
+    assert reloaded.sha256(source) == file_sha256(source)
+    assert reloaded.misses == 1
+
+
+def _save_repeatedly(cache_path: Path, source: Path, rounds: int) -> None:
+    for _ in range(rounds):
+        cache = FingerprintCache(cache_path, paranoid=True)
+        cache.sha256(source)
+        cache.save()
+
+
+def test_concurrent_saves_do_not_collide(tmp_path) -> None:
+    cache_path = tmp_path / "state" / "fingerprints.json"
+    sources = []
+    for index in range(4):
+        sources.append(tmp_path / f"{index}.txt")
+        write_old(sources[-1], str(index))
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_save_repeatedly, args=(cache_path, source, 200)) for source in sources]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert [worker.exitcode for worker in workers] == [0, 0, 0, 0]
+    assert FingerprintCache(cache_path)._entries
+    assert [path.name for path in cache_path.parent.iterdir()] == ["fingerprints.json"]
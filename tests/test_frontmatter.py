@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pytest
+
+from skillsync.frontmatter import FrontmatterError, parse_frontmatter, parse_skill_frontmatter
+
+
+def parse(body: str) -> dict[str, str]:
+    return parse_frontmatter(f"---\n{body}---\n# Title\n")
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("plain text", "plain text"),
+        ('"hello: world"', "hello: world"),
+        ('"tab\\there \\"quoted\\" \\u00e9"', 'tab\there "quoted" é'),
+        ("'it''s: fine'", "it's: fine"),
+        ("'single \"double\" inside'", 'single "double" inside'),
+        ('"unterminated \\q escape"', "unterminated \\q escape"),
+        ('""', ""),
+    ],
+)
+def test_scalar_values(value: str, expected: str) -> None:
+    assert parse(f"name: x\ndescription: {value}\n") == {"name": "x", "description": expected}
+
+
+def test_quoted_value_from_review() -> None:
+    assert parse_frontmatter('---\nname: x\ndescription: "hello: world"\n---\n')["description"] == "hello: world"
+
+
+def test_quoted_value_continued_on_indented_lines() -> None:
+    assert parse('description: "first line\n  second: line"\n')["description"] == "first line second: line"
+
+
+def test_plain_value_continued_on_indented_lines() -> None:
+    assert parse("description: first\n  second\n\n  third\n")["description"] == "first second third"
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (">", "one two\nthree\n"),
+        (">-", "one two\nthree"),
+        ("|", "one\ntwo\n\nthree\n"),
+        ("|+", "one\ntwo\n\nthree\n\n"),
+        ("|2", "one\ntwo\n\nthree\n"),
+    ],
+)
+def test_block_scalars(header: str, expected: str) -> None:
+    body = f"description: {header}\n  one\n  two\n\n  three\n\nname: x\n"
+    assert parse(body) == {"description": expected, "name": "x"}
+
+
+def test_folded_keeps_more_indented_lines() -> None:
+    assert parse("description: >\n  intro\n    code\n  outro\n")["description"] == "intro\n  code\noutro\n"
+
+
+def test_nested_mappings_and_sequences_are_skipped() -> None:
+    values = parse("name: x\nmetadata:\n  owner: me\ntags:\n  - a\n  - b\n")
+    assert values == {"name": "x"}
+
+
+@pytest.mark.parametrize("text", ["# no frontmatter\n", "---\nname: x\n", ""])
+def test_missing_or_unterminated_frontmatter(text: str) -> None:
+    with pytest.raises(FrontmatterError):
+        parse_frontmatter(text)
+
+
+def test_skill_frontmatter_requires_name(tmp_path) -> None:
+    skill_md = tmp_path / "SKILL.md"
+    skill_md.write_text('---\nname: demo\ndescription: "Use when: testing"\n---\n', encoding="utf-8")
+    assert parse_skill_frontmatter(skill_md) == ("demo", "Use when: testing")
+    skill_md.write_text("---\ndescription: nameless\n---\n", encoding="utf-8")
+    with pytest.raises(FrontmatterError, match="must include `name`"):
+        parse_skill_frontmatter(skill_md)
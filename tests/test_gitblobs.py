@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from skillsync.gitblobs import GitBlobs, file_blob_id
+from skillsync.manifest import blob_sha1, file_sha256, sync_tree
+from skillsync.treediff import CHANGED, diff_trees
+
+
+def git(repo: Path, *args: str) -> str:
+    proc = subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return proc.stdout
+
+
+@pytest.fixture
+def synced(tmp_path):
+    repo = tmp_path / "repo"
+    source = repo / "skill"
+    (source / "references").mkdir(parents=True)
+    (source / "SKILL.md").write_text("---\nname: skill\n---\n", encoding="utf-8")
+    (source / "references" / "guide.md").write_text("guide", encoding="utf-8")
+    git(repo, "init", "-q")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "initial")
+    dest, manifest = tmp_path / "dest", tmp_path / "manifest.json"
+    sync_tree(source, dest, manifest, set())
+    # Touch the sources so only ids, not metadata, can prove them equal.
+    for path in (source / "SKILL.md", source / "references" / "guide.md"):
+        os.utime(path, (2_000_000_000, 2_000_000_000))
+    return repo, source, dest, manifest
+
+
+def test_blob_ids_match_git(tmp_path) -> None:
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"hello\n")
+    assert file_blob_id(str(path)) == blob_sha1(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+
+def test_clean_files_compare_by_id_without_hashing(synced) -> None:
+    repo, source, dest, manifest = synced
+    blobs = GitBlobs(repo, [source])
+    assert set(blobs.ids) == {"skill/SKILL.md", "skill/references/guide.md"}
+    hashed: list[str] = []
+
+    def hasher(path: Path) -> str:
+        hashed.append(path.name)
+        return file_sha256(path)
+
+    assert list(diff_trees(source, dest, set(), blobs.comparer(source, dest, manifest, hasher))) == []
+    assert hashed == []
+
+
+def test_modified_sources_and_edited_outputs_are_changes(synced) -> None:
+    repo, source, dest, manifest = synced
+    (source / "SKILL.md").write_text("---\nname: skilL\n---\n", encoding="utf-8")
+    (dest / "references" / "guide.md").write_text("guidE", encoding="utf-8")
+    blobs = GitBlobs(repo, [source])
+    assert set(blobs.ids) == {"skill/references/guide.md"}
+    same = blobs.comparer(source, dest, manifest, file_sha256)
+    assert list(diff_trees(source, dest, set(), same)) == [(CHANGED, "SKILL.md"), (CHANGED, "references/guide.md")]
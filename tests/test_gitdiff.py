@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import subprocess
+
+import pytest
+
+from skillsync import core
+from skillsync.gitdiff import GitError, changed_paths
+
+
+def git(repo, *args: str) -> None:
+    subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+def write(path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    write(tmp_path / "alpha" / "SKILL.md", "---\nname: alpha\n---\n")
+    write(tmp_path / "group" / "beta" / "SKILL.md", "---\nname: beta\n---\n")
+    write(tmp_path / "group" / "beta" / "references" / "guide.md", "guide")
+    write(tmp_path / ".gitmodules", '[submodule "vendor"]\n\tpath = vendor\n\turl = https://example.com/vendor\n')
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
+
+
+def test_since_and_staged_report_only_their_changes(repo) -> None:
+    write(repo / "group" / "beta" / "references" / "guide.md", "changed")
+    write(repo / "alpha" / "SKILL.md", "---\nname: alpha\ndescription: staged\n---\n")
+    git(repo, "add", "alpha/SKILL.md")
+    assert changed_paths(repo, staged=True) == ["alpha/SKILL.md"]
+    assert sorted(changed_paths(repo, since="HEAD")) == ["alpha/SKILL.md", "group/beta/references/guide.md"]
+
+    git(repo, "commit", "-q", "-am", "second")
+    assert sorted(changed_paths(repo, since="HEAD~1..HEAD")) == ["alpha/SKILL.md", "group/beta/references/guide.md"]
+    assert changed_paths(repo, since="HEAD") == []
+
+
+def test_submodule_paths_are_skipped(repo) -> None:
+    write(repo / "vendor" / "file.txt", "x")
+    git(repo, "add", "vendor/file.txt")
+    assert changed_paths(repo, staged=True) == []
+
+
+def test_bad_revision_raises(repo) -> None:
+    with pytest.raises(GitError):
+        changed_paths(repo, since="no-such-rev")
+
+
+def test_changed_paths_map_to_enclosing_skill_roots(repo, monkeypatch) -> None:
+    monkeypatch.setattr(core, "PROJECT_ROOT", repo)
+    paths = [repo / "group" / "beta" / "references" / "guide.md", repo / "alpha" / "SKILL.md", repo / "README.md"]
+    assert core.enclosing_skill_roots(paths) == {"alpha", "group/beta"}
+    assert core.enclosing_skill_roots([repo / "gone" / "SKILL.md"], known={"gone"}) == {"gone"}
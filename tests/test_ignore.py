@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import pytest
+
+from skillsync.ignore import EMPTY_RULES, IGNORE_FILE, IgnoreRules, SkillIgnore, load_rules
+
+
+def rules(text: str) -> IgnoreRules:
+    return IgnoreRules.parse(text)
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, expected",
+    [
+        ("*.png", "shot.png", False, True),
+        ("*.png", "deep/dir/shot.png", False, True),
+        ("*.png", "shot.png.txt", False, None),
+        ("e2e-evidence/", "e2e-evidence", True, True),
+        ("e2e-evidence/", "e2e-evidence", False, None),
+        ("/top.txt", "top.txt", False, True),
+        ("/top.txt", "sub/top.txt", False, None),
+        ("docs/*.md", "docs/a.md", False, True),
+        ("docs/*.md", "docs/sub/a.md", False, None),
+        ("docs/**/a.md", "docs/x/y/a.md", False, True),
+        ("docs/**/a.md", "docs/a.md", False, True),
+        ("**/cache", "a/b/cache", True, True),
+        ("logs/**", "logs/x/y.txt", False, True),
+        ("file?.txt", "file1.txt", False, True),
+        ("file?.txt", "file10.txt", False, None),
+        ("[ab].txt", "b.txt", False, True),
+        ("[!ab].txt", "b.txt", False, None),
+        ("\\#hash", "#hash", False, True),
+        ("# comment", "# comment", False, None),
+    ],
+)
+def test_pattern_matching(pattern: str, path: str, is_dir: bool, expected: bool | None) -> None:
+    assert rules(pattern).match(path, is_dir) is expected
+
+
+def test_last_matching_pattern_wins() -> None:
+    compiled = rules("*.log\n!keep.log\n")
+    assert compiled.match("drop.log", False) is True
+    assert compiled.match("keep.log", False) is False
+    assert rules("!keep.log\n*.log\n").match("keep.log", False) is True
+
+
+def test_blank_rules_have_no_digest() -> None:
+    assert rules("\n# only a comment\n").digest == ""
+    assert rules("*.png\n").digest != rules("*.jpg\n").digest
+
+
+def test_skill_rules_win_over_repo_rules() -> None:
+    ignore = SkillIgnore(rules("e2e-test/*.png\n"), "e2e-test", rules("!keep.png\n"))
+    assert ignore.match("drop.png", False)
+    assert not ignore.match("keep.png", False)
+
+
+def test_repo_rules_are_relative_to_the_repo_root() -> None:
+    ignore = SkillIgnore(rules("e2e-test/evidence/\n"), "e2e-test", EMPTY_RULES)
+    assert ignore.match("evidence", True)
+    assert not SkillIgnore(rules("e2e-test/evidence/\n"), "other", EMPTY_RULES).match("evidence", True)
+
+
+def test_repo_rules_do_not_apply_outside_the_repo() -> None:
+    assert not SkillIgnore(rules("*.png\n"), None, EMPTY_RULES).match("shot.png", False)
+
+
+def test_files_in_ignored_dirs_stay_ignored() -> None:
+    ignore = SkillIgnore(EMPTY_RULES, "skill", rules("build/\n!build/keep.txt\n"))
+    assert ignore.ignored("build/keep.txt")
+    assert not ignore.ignored("src/keep.txt")
+
+
+def test_the_skillignore_file_itself_is_never_shipped() -> None:
+    assert SkillIgnore(EMPTY_RULES, "skill", EMPTY_RULES).match(IGNORE_FILE, False)
+
+
+def test_load_rules_reads_the_directory_file(tmp_path) -> None:
+    assert load_rules(tmp_path) is EMPTY_RULES
+    (tmp_path / IGNORE_FILE).write_text("*.tmp\n", encoding="utf-8")
+    assert load_rules(tmp_path).match("x.tmp", False) is True
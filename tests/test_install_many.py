@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+INSTALL_SKILL = Path(__file__).resolve().parents[1] / "my-skill-factory" / "scripts" / "install_skill.py"
+
+
+@pytest.fixture
+def install_skill(tmp_path, monkeypatch):
+    # The Claude paths are derived from the home dir at import time.
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path / "home"))
+    spec = importlib.util.spec_from_file_location("install_skill", INSTALL_SKILL)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.INSTALLED_JSON.parent.mkdir(parents=True)
+    module.INSTALLED_JSON.write_text('{"version": 2, "plugins": {}}\n', encoding="utf-8")
+    module.SETTINGS_JSON.write_text('{\n  // user settings\n  "theme": "dark"\n}\n', encoding="utf-8")
+    return module
+
+
+def make_skill(root: Path, name: str) -> Path:
+    skill = root / name
+    (skill / "references").mkdir(parents=True)
+    (skill / "SKILL.md").write_text(f"---\nname: {name}\ndescription: {name} skill\n---\n", encoding="utf-8")
+    (skill / "references" / "guide.md").write_text("guide", encoding="utf-8")
+    return skill
+
+
+def test_batch_install_writes_each_registry_once(install_skill, tmp_path, monkeypatch) -> None:
+    skills = [make_skill(tmp_path / "src", name) for name in ("alpha", "beta", "gamma")]
+    replaced: list[str] = []
+    real_replace = os.replace
+
+    def counting_replace(src, dst, *args, **kwargs):
+        replaced.append(os.path.basename(dst))
+        return real_replace(src, dst, *args, **kwargs)
+
+    monkeypatch.setattr(os, "replace", counting_replace)
+    install_skill.install_many(skills, "1.0.0", cache_only=True, jobs=2)
+
+    assert replaced.count("installed_plugins.json") == 1
+    assert replaced.count("settings.json") == 1
+    installed = json.loads(install_skill.INSTALLED_JSON.read_text(encoding="utf-8"))
+    assert sorted(installed["plugins"]) == ["alpha@hideki-plugins", "beta@hideki-plugins", "gamma@hideki-plugins"]
+    settings = json.loads(install_skill.SETTINGS_JSON.read_text(encoding="utf-8"))
+    assert settings["theme"] == "dark" and all(settings["enabledPlugins"].values())
+    for name in ("alpha", "beta", "gamma"):
+        cached = install_skill.CACHE_DIR / name / "1.0.0" / "skills" / name / "references" / "guide.md"
+        assert cached.read_text(encoding="utf-8") == "guide"
+
+
+def test_duplicate_skill_names_are_rejected_before_building(install_skill, tmp_path) -> None:
+    first = make_skill(tmp_path / "one", "alpha")
+    second = make_skill(tmp_path / "two", "alpha")
+    with pytest.raises(SystemExit, match="more than once"):
+        install_skill.install_many([first, second], "1.0.0", cache_only=True)
+    assert not install_skill.CACHE_DIR.exists()
+
+
+def test_standalone_copy_uses_a_vendored_skillsync(tmp_path) -> None:
+    copy = tmp_path / "plugin" / "scripts" / "install_skill.py"
+    copy.parent.mkdir(parents=True)
+    shutil.copy2(INSTALL_SKILL, copy)
+    missing = subprocess.run([sys.executable, str(copy), "--help"], capture_output=True, text=True, cwd=tmp_path)
+    assert missing.returncode != 0 and "cannot import the shared sync helpers" in missing.stderr
+
+    skillsync = INSTALL_SKILL.parents[2] / "scripts" / "skillsync"
+    shutil.copytree(skillsync, copy.parent / "skillsync", ignore=shutil.ignore_patterns("__pycache__"))
+    vendored = subprocess.run([sys.executable, str(copy), "--help"], capture_output=True, text=True, cwd=tmp_path)
+    assert vendored.returncode == 0, vendored.stderr
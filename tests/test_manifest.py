@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from skillsync.manifest import load_manifest, sync_tree
+from skillsync.store import ObjectStore
+
+
+def write(path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    source = tmp_path / "source"
+    write(source / "SKILL.md", "---\nname: demo\n---\n")
+    write(source / "references" / "guide.md", "guide")
+    write(source / "__pycache__" / "x.pyc", "bytecode")
+    return source, tmp_path / "dest", tmp_path / "manifest.json"
+
+
+def sync(tree, **kwargs):
+    source, dest, manifest = tree
+    return sync_tree(source, dest, manifest, {"__pycache__"}, **kwargs)
+
+
+def test_first_sync_copies_everything_and_records_digests(tree) -> None:
+    source, dest, manifest = tree
+    result = sync(tree)
+    assert sorted(result.copied) == ["SKILL.md", "references/guide.md"]
+    assert (dest / "references" / "guide.md").read_text(encoding="utf-8") == "guide"
+    assert not (dest / "__pycache__").exists()
+    entries = load_manifest(manifest, dest)
+    assert set(entries) == {"SKILL.md", "references/guide.md"}
+    assert all(len(entry["sha256"]) == 64 and len(entry["blob_sha1"]) == 40 for entry in entries.values())
+
+
+def test_unchanged_sync_touches_nothing(tree) -> None:
+    source, dest, _ = tree
+    sync(tree)
+    mtime = (dest / "SKILL.md").stat().st_mtime_ns
+    result = sync(tree)
+    assert not result.changed and result.unchanged == 2
+    assert (dest / "SKILL.md").stat().st_mtime_ns == mtime
+
+
+def test_changed_and_removed_files_are_synced(tree) -> None:
+    source, dest, _ = tree
+    sync(tree)
+    write(source / "SKILL.md", "---\nname: demo\ndescription: new\n---\n")
+    (source / "references" / "guide.md").unlink()
+    result = sync(tree)
+    assert result.copied == ["SKILL.md"]
+    assert result.removed == ["references/guide.md"]
+    assert "description: new" in (dest / "SKILL.md").read_text(encoding="utf-8")
+    assert not (dest / "references").exists()
+
+
+def test_sync_publishes_generations(tree) -> None:
+    source, dest, _ = tree
+    sync(tree)
+    first = os.path.realpath(dest)
+    write(source / "new.md", "new")
+    sync(tree)
+    assert os.path.realpath(dest) != first
+    assert (dest / "new.md").exists()
+
+
+def test_store_mode_links_identical_files_once(tree, tmp_path) -> None:
+    source, dest, _ = tree
+    write(source / "copy.md", "guide")
+    store = ObjectStore(tmp_path / "objects")
+    sync(tree, link_mode="store", store=store)
+    guide, copy = (dest / "references" / "guide.md").stat(), (dest / "copy.md").stat()
+    assert (guide.st_dev, guide.st_ino) == (copy.st_dev, copy.st_ino)
+    assert len(list(store.objects())) == 2
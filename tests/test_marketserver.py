@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from skillsync.httpcache import ResponseCache
+from skillsync.marketserver import make_server, parse_range
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=10-", (10, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=-500", (0, 99)),
+        ("bytes=90-500", (90, 99)),
+        ("bytes=0-4,10-14", None),
+        ("items=0-9", None),
+        ("bytes=-", None),
+    ],
+)
+def test_parse_range(header: str, expected) -> None:
+    assert parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=20-10", "bytes=-0"])
+def test_unsatisfiable_range(header: str) -> None:
+    with pytest.raises(ValueError):
+        parse_range(header, 100)
+
+
+@pytest.fixture
+def server(tmp_path):
+    root = tmp_path / "market"
+    (root / ".claude-plugin").mkdir(parents=True)
+    (root / ".claude-plugin" / "marketplace.json").write_text('{"plugins": []}\n', encoding="utf-8")
+    (root / "plugins" / "demo").mkdir(parents=True)
+    (root / "plugins" / "demo" / "SKILL.md").write_text("x" * 1000, encoding="utf-8")
+    (tmp_path / "secret.txt").write_text("secret", encoding="utf-8")
+    httpd = make_server(root, quiet=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(url: str, **headers: str):
+    try:
+        return urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=5)
+    except urllib.error.HTTPError as exc:
+        return exc
+
+
+def test_conditional_and_range_requests(server: str) -> None:
+    url = f"{server}/plugins/demo/SKILL.md"
+    response = get(url)
+    etag = response.headers["ETag"]
+    assert response.status == 200 and len(response.read()) == 1000
+    assert get(url, **{"If-None-Match": etag}).status == 304
+    partial = get(url, Range="bytes=990-")
+    assert partial.status == 206 and partial.read() == b"x" * 10
+    assert get(url, Range="bytes=5000-").status == 416
+
+
+def test_paths_outside_the_root_are_not_served(server: str) -> None:
+    assert get(f"{server}/plugins/../../secret.txt").status == 404
+    assert get(f"{server}/plugins/%2e%2e/%2e%2e/secret.txt").status == 404
+
+
+def test_symlinked_files_are_served(server: str, tmp_path) -> None:
+    # As synced with --link-mode symlink: the tree's files point at the skill sources.
+    source = tmp_path / "source" / "guide.md"
+    source.parent.mkdir()
+    source.write_text("guide", encoding="utf-8")
+    (tmp_path / "market" / "plugins" / "demo" / "guide.md").symlink_to(source)
+    response = get(f"{server}/plugins/demo/guide.md")
+    assert response.status == 200 and response.read() == b"guide"
+
+
+def test_response_cache_revalidates(server: str, tmp_path) -> None:
+    cache = ResponseCache(tmp_path / "http")
+    assert cache.fetch_json(f"{server}/marketplace.json") == {"plugins": []}
+    path = cache.fetch(f"{server}/plugins/demo/SKILL.md")
+    assert path.read_bytes() == b"x" * 1000
+    assert cache.cached(f"{server}/plugins/demo/SKILL.md") == path
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from skillsync.publish import KEEP_GENERATIONS, current_generation, generations_dir, new_staging, publish
+
+
+def publish_version(dest, files: dict[str, str], clone: bool = True):
+    staging = new_staging(dest, clone=clone)
+    for rel, text in files.items():
+        target = staging / rel
+        target.unlink(missing_ok=True)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text, encoding="utf-8")
+    return publish(staging, dest)
+
+
+def test_publish_swaps_generations_and_keeps_the_last_few(tmp_path) -> None:
+    dest = tmp_path / "plugin"
+    publish_version(dest, {"a.txt": "1"}, clone=False)
+    first = current_generation(dest)
+    for number in range(2, 6):
+        publish_version(dest, {"a.txt": str(number)})
+    assert (dest / "a.txt").read_text(encoding="utf-8") == "5"
+    assert current_generation(dest) != first
+    assert len([entry for entry in generations_dir(dest).iterdir() if entry.name.isdigit()]) == KEEP_GENERATIONS
+
+
+def test_clone_shares_unchanged_files_with_the_published_tree(tmp_path) -> None:
+    dest = tmp_path / "plugin"
+    publish_version(dest, {"keep.txt": "keep", "edit.txt": "old"}, clone=False)
+    before = (dest / "keep.txt").stat().st_ino
+    old_generation = current_generation(dest)
+    publish_version(dest, {"edit.txt": "new"})
+    assert (dest / "keep.txt").stat().st_ino == before
+    assert (old_generation / "edit.txt").read_text(encoding="utf-8") == "old"
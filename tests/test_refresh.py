@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+import refresh_skills
+from skillsync.configfile import FileLock
+
+
+class ExitedWorker:
+    def poll(self) -> int:
+        return 0
+
+
+@pytest.fixture
+def installs(tmp_path, monkeypatch):
+    refresh_dir = tmp_path / ".refresh"
+    monkeypatch.setattr(refresh_skills, "REFRESH_DIR", refresh_dir)
+    monkeypatch.setattr(refresh_skills, "QUEUE_JSON", refresh_dir / "queue.json")
+    monkeypatch.setattr(refresh_skills, "WORKER_LOCK", refresh_dir / "worker.lock")
+    monkeypatch.setattr(refresh_skills, "LOG_FILE", refresh_dir / "refresh.log")
+    calls: list[list[str]] = []
+    broken: set[str] = set()
+
+    def fake_install(dirs: list[str], jobs: int) -> bool:
+        calls.append(sorted(dirs))
+        return not broken & set(dirs)
+
+    monkeypatch.setattr(refresh_skills, "install", fake_install)
+    return calls, broken
+
+
+def read_queue() -> dict:
+    return json.loads(refresh_skills.QUEUE_JSON.read_text(encoding="utf-8"))
+
+
+def test_worker_installs_queued_skills_in_one_batch(installs, tmp_path) -> None:
+    calls, _ = installs
+    refresh_skills.enqueue({"alpha": tmp_path / "alpha", "group/beta": tmp_path / "group" / "beta"})
+    refresh_skills.enqueue({"alpha": tmp_path / "alpha"})
+    assert refresh_skills.run_worker(2) == 0
+    assert calls == [[str(tmp_path / "alpha"), str(tmp_path / "group" / "beta")]]
+    queue = read_queue()
+    assert (queue["pending"], queue["running"]) == ({}, {})
+    assert all(result["ok"] for result in queue["results"].values())
+    assert refresh_skills.report({"alpha", "group/beta"}, set()) == 0
+
+
+def test_failed_batch_is_retried_one_skill_at_a_time(installs, tmp_path, capsys) -> None:
+    calls, broken = installs
+    broken.add(str(tmp_path / "bad"))
+    refresh_skills.enqueue({"bad": tmp_path / "bad", "good": tmp_path / "good"})
+    refresh_skills.run_worker(1)
+    assert calls[0] == [str(tmp_path / "bad"), str(tmp_path / "good")] and len(calls) == 3
+    results = read_queue()["results"]
+    assert (results["bad"]["ok"], results["good"]["ok"]) == (False, True)
+    assert refresh_skills.report({"bad", "good"}, set()) == 1
+    assert "failed to install bad" in capsys.readouterr().err
+
+
+def test_skills_left_running_by_a_crashed_worker_are_requeued(installs, tmp_path) -> None:
+    calls, _ = installs
+    refresh_skills.QUEUE_JSON.parent.mkdir(parents=True)
+    refresh_skills.QUEUE_JSON.write_text(
+        json.dumps({"pending": {}, "running": {"alpha": {"dir": str(tmp_path / "alpha")}}, "results": {}}),
+        encoding="utf-8",
+    )
+    refresh_skills.run_worker(1)
+    assert calls == [[str(tmp_path / "alpha")]]
+    assert read_queue()["results"]["alpha"]["ok"]
+
+
+def test_only_one_worker_drains_the_queue(installs, tmp_path) -> None:
+    calls, _ = installs
+    refresh_skills.enqueue({"alpha": tmp_path / "alpha"})
+    with FileLock(refresh_skills.WORKER_LOCK):
+        assert refresh_skills.run_worker(1) == 0
+    assert calls == []
+    assert refresh_skills.wait_for({"alpha"}, ExitedWorker(), budget=0) == {"alpha"}
+    assert refresh_skills.wait_for({"other"}, ExitedWorker(), budget=None) == set()
+
+
+def test_wait_returns_as_soon_as_the_worker_exits(installs, tmp_path) -> None:
+    # E.g. the worker found another one holding the lock and exited cleanly.
+    refresh_skills.enqueue({"alpha": tmp_path / "alpha"})
+    started = time.monotonic()
+    assert refresh_skills.wait_for({"alpha"}, ExitedWorker(), budget=5) == {"alpha"}
+    assert time.monotonic() - started < 1
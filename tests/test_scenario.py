@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from scenariolint.parser import ACTIONS, parse_scenario
+from scenariolint.plan import PlanCache, plan_findings
+from skillsync.manifest import file_sha256
+
+VALID = '''# config
+url,https://example.com
+viewport,1024x768
+
+# steps
+step,action,target,input,expected_result
+1,navigate,https://example.com,,Page loads
+2,type,Email input field,"a,b@example.com","Field shows ""a,b@example.com"""
+3,click,Submit button,,Form submits
+'''
+
+
+def messages(text: str) -> list[tuple[int, str, str]]:
+    return [(f.line, f.severity, f.message) for f in parse_scenario(text.splitlines(keepends=True)).findings]
+
+
+def test_valid_scenario() -> None:
+    scenario = parse_scenario(VALID.splitlines(keepends=True))
+    assert scenario.findings == []
+    assert scenario.config == {"url": "https://example.com", "viewport": {"width": 1024, "height": 768}, "timeout": 10.0}
+    assert [step["tool"] for step in scenario.steps] == ["browser_navigate", "browser_type", "browser_click"]
+    assert scenario.steps[1]["input"] == "a,b@example.com"
+    assert scenario.steps[2]["line"] == 9
+
+
+def test_unknown_action_is_reported_with_its_line() -> None:
+    text = VALID + "4,wigle,Logo,,Wiggles\n"
+    [(line, severity, message)] = messages(text)
+    assert (line, severity) == (10, "error")
+    assert "unknown action 'wigle'" in message
+
+
+def test_suggests_close_actions_and_keys() -> None:
+    text = VALID.replace("viewport,", "viewprt,") + "4,clik,Logo,,Clicked\n"
+    found = " ".join(message for _, _, message in messages(text))
+    assert "did you mean 'viewport'" in found
+    assert "did you mean 'click'" in found
+
+
+def test_step_numbering_and_field_counts() -> None:
+    text = VALID + "5,click,Logo,,Clicked\n6,click,Logo,,x,extra\n"
+    found = messages(text)
+    assert (10, "error", "step 5 is out of sequence (expected 4)") in found
+    assert any(line == 11 and "needs 5 fields" in message for line, _, message in found)
+
+
+def test_missing_sections_and_url() -> None:
+    assert any("missing '# steps'" in message for _, _, message in messages("# config\nurl,https://x.dev\n"))
+    no_url = VALID.replace("url,https://example.com\n", "")
+    assert any("no url" in message for _, _, message in messages(no_url))
+
+
+def test_quoted_fields_spanning_lines_keep_later_line_numbers() -> None:
+    text = VALID + '4,verify,Page,,"first\nsecond"\n5,bogus,Page,,x\n'
+    assert [line for line, _, _ in messages(text)] == [12]
+
+
+def test_comment_rows_are_skipped_in_and_before_sections() -> None:
+    text = "# TODO\n" + VALID.replace("# steps\n", "# steps\n# Login flow, happy path\n") + "# done\n"
+    scenario = parse_scenario(text.splitlines(keepends=True))
+    assert scenario.findings == []
+    assert len(scenario.steps) == 3 and scenario.steps[0]["line"] == 9
+
+
+def test_misspelt_section_header_is_reported() -> None:
+    found = messages(VALID.replace("# steps", "# step"))
+    assert (5, "error", "unknown section '# step' (did you mean 'steps'?)") in found
+
+
+def test_selector_targets_are_warnings() -> None:
+    [(_, severity, message)] = messages(VALID + "4,click,#submit-btn,,Submitted\n")
+    assert severity == "warning" and "CSS selector" in message
+
+
+def test_every_action_has_a_tool() -> None:
+    assert all(tool.startswith("browser_") for tool in ACTIONS.values())
+
+
+def test_plans_are_cached_by_content(tmp_path) -> None:
+    csv = tmp_path / "scenario.csv"
+    csv.write_text(VALID + "4,wiggle,Logo,,x\n", encoding="utf-8")
+    cache = PlanCache(tmp_path / "plans", file_sha256)
+    plan, cached = cache.load(csv)
+    assert not cached and len(plan["steps"]) == 4
+    assert [finding.line for finding in plan_findings(plan)] == [10]
+    again, cached = cache.load(csv)
+    assert cached and again == plan
+    copy = tmp_path / "copy.csv"
+    copy.write_bytes(csv.read_bytes())
+    assert cache.load(copy)[1]
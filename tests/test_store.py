@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from skillsync.store import ObjectStore
+
+
+def test_object_store_links_and_prunes(tmp_path) -> None:
+    store = ObjectStore(tmp_path / "objects")
+    source = tmp_path / "src.txt"
+    source.write_text("shared", encoding="utf-8")
+    (tmp_path / "tree").mkdir()
+    store.link(source, tmp_path / "tree" / "a.txt")
+    store.link(source, tmp_path / "tree" / "b.txt")
+    assert store.usage() == (1, 6)
+    assert store.prune() == (0, 0)
+    (tmp_path / "tree" / "a.txt").unlink()
+    (tmp_path / "tree" / "b.txt").unlink()
+    assert store.prune() == (1, 6)
+    assert store.usage() == (0, 0)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from skillsync.manifest import file_sha256
+from skillsync.treediff import (
+    CHANGED,
+    EXTRA,
+    MISSING,
+    ErrorLimit,
+    diff_trees,
+    largest_files,
+    same_content,
+    walk_files,
+)
+
+
+def write(path: Path, text: str, mtime: int = 1_000_000_000) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def trees(tmp_path):
+    source, dest = tmp_path / "source", tmp_path / "dest"
+    for root in (source, dest):
+        write(root / "SKILL.md", "skill")
+        write(root / "a" / "b.md", "same")
+        write(root / "__pycache__" / "x.pyc", "ignored")
+    write(source / "a" / "missing.md", "missing")
+    write(dest / "a-extra.md", "extra")
+    write(source / "z" / "changed.md", "one")
+    write(dest / "z" / "changed.md", "two!")
+    return source, dest
+
+
+def test_walk_files_is_ordered_by_path_components_and_prunes_excluded(trees) -> None:
+    source, _ = trees
+    assert [file.rel for file in walk_files(source, {"__pycache__"})] == [
+        "SKILL.md",
+        "a/b.md",
+        "a/missing.md",
+        "z/changed.md",
+    ]
+
+
+def test_diff_reports_missing_extra_and_changed_in_order(trees) -> None:
+    source, dest = trees
+    assert list(diff_trees(source, dest, {"__pycache__"}, lambda a, b: same_content(a, b, file_sha256))) == [
+        (MISSING, "a/missing.md"),
+        (EXTRA, "a-extra.md"),
+        (CHANGED, "z/changed.md"),
+    ]
+
+
+def test_equal_size_and_mtime_skips_hashing_unless_paranoid(trees) -> None:
+    source, dest = trees
+    write(source / "a" / "b.md", "left")
+    write(dest / "a" / "b.md", "rite")
+    hashed: list[str] = []
+
+    def hasher(path: Path) -> str:
+        hashed.append(path.name)
+        return file_sha256(path)
+
+    def changed(trust_mtime: bool) -> list[str]:
+        def same(left, right) -> bool:
+            return same_content(left, right, hasher, trust_mtime)
+
+        return [rel for kind, rel in diff_trees(source, dest, {"__pycache__"}, same) if kind == CHANGED]
+
+    assert changed(True) == ["z/changed.md"] and hashed == []
+    assert changed(False) == ["a/b.md", "z/changed.md"] and hashed.count("SKILL.md") == 2
+
+
+def test_largest_files_keeps_the_top_entries(trees) -> None:
+    source, _ = trees
+    total, top = largest_files(walk_files(source, {"__pycache__"}), 2)
+    assert total == sum(len(text) for text in ("skill", "same", "missing", "one"))
+    assert top == [(7, "a/missing.md"), (5, "SKILL.md")]
+
+
+def test_error_limit_drops_differences_past_the_limit() -> None:
+    limit = ErrorLimit(2)
+    assert [limit.take() for _ in range(3)] == [True, True, False]
+    assert limit.reached and limit.count == 2
+    unlimited = ErrorLimit()
+    assert all(unlimited.take() for _ in range(100)) and not unlimited.reached
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import pytest
+
+from skillsync.units import format_size, parse_size
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [("0", 0), ("512", 512), ("500M", 500 << 20), ("2g", 2 << 30), ("1.5GiB", 3 << 29), (" 10 KB ", 10 << 10)],
+)
+def test_parse_size(text: str, expected: int) -> None:
+    assert parse_size(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "M", "-1", "10X", "1.5.0G"])
+def test_parse_size_rejects(text: str) -> None:
+    with pytest.raises(ValueError):
+        parse_size(text)
+
+
+@pytest.mark.parametrize(
+    ("size", "expected"),
+    [(0, "0 B"), (1023, "1023 B"), (1024, "1.0 KiB"), (5 << 20, "5.0 MiB"), (3 << 30, "3.0 GiB"), (2 << 40, "2048.0 GiB")],
+)
+def test_format_size(size: int, expected: str) -> None:
+    assert format_size(size) == expected
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from skillsync.watch import InotifyWatcher, PollingWatcher, create_watcher, debounced_batches
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / "skill" / "references").mkdir(parents=True)
+    (tmp_path / "skill" / "SKILL.md").write_text("one", encoding="utf-8")
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "skill" / "__pycache__").mkdir()
+    return tmp_path
+
+
+def watchers(repo):
+    yield PollingWatcher(repo, {"scripts"}, {"__pycache__"})
+    try:
+        yield InotifyWatcher(repo, {"scripts"}, {"__pycache__"})
+    except OSError:
+        pass
+
+
+def test_watchers_report_changes_and_skip_excluded_paths(repo) -> None:
+    for watcher in watchers(repo):
+        try:
+            assert watcher.wait(0.05) == set()
+            (repo / "scripts" / "tool.py").write_text("x", encoding="utf-8")
+            (repo / "skill" / "__pycache__" / "x.pyc").write_text("x", encoding="utf-8")
+            assert watcher.wait(0.3) == set(), watcher.kind
+            (repo / "skill" / "references" / "guide.md").write_text("guide", encoding="utf-8")
+            assert repo / "skill" / "references" / "guide.md" in watcher.wait(1), watcher.kind
+        finally:
+            watcher.close()
+            (repo / "scripts" / "tool.py").unlink(missing_ok=True)
+            (repo / "skill" / "__pycache__" / "x.pyc").unlink(missing_ok=True)
+            (repo / "skill" / "references" / "guide.md").unlink(missing_ok=True)
+
+
+def test_force_poll_selects_the_polling_watcher(repo) -> None:
+    watcher = create_watcher(repo, set(), set(), force_poll=True)
+    assert watcher.kind == "polling"
+    watcher.close()
+
+
+def test_debounced_batches_merge_a_burst(repo) -> None:
+    watcher = create_watcher(repo, set(), set())
+
+    def burst() -> None:
+        for index in range(3):
+            (repo / "skill" / f"{index}.md").write_text(str(index), encoding="utf-8")
+            time.sleep(0.05)
+
+    writer = threading.Timer(0.1, burst)
+    writer.start()
+    try:
+        changed, started = next(debounced_batches(watcher, debounce=0.5))
+    finally:
+        writer.join()
+        watcher.close()
+    assert {repo / "skill" / f"{index}.md" for index in range(3)} <= changed
+    assert started <= time.monotonic()